@@ -17,12 +17,15 @@ Architecture: Perception → Reasoning → Action
 import json
 import logging
 import os
+import re
 import signal
 import sys
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # ── Ensure BronzeTier/ is in path regardless of working directory ──────────────
 _BRONZE_DIR = Path(__file__).resolve().parent
@@ -32,20 +35,36 @@ if str(_BRONZE_DIR) not in sys.path:
 from dotenv import load_dotenv
 # Load .env from BronzeTier/ directory explicitly
 load_dotenv(dotenv_path=_BRONZE_DIR / ".env")
-from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from dashboard import DashboardRenderer
+from done_archive import get_done_archive
 from error_recovery import (
     ErrorCategory,
     ErrorRecovery,
     QuarantineManager,
-    with_error_recovery,
 )
+from llm_cache import get_llm_cache
+from llm_gateway import get_gateway
+from metrics import HITL_BUCKETS, MetricsExporter, get_metrics
+from plan_writer import get_plan_writer
+from profiling import get_profiler, start_profiler
+from prompt_prefix import PromptPrefix
+from rate_limiter import LANE_TRIAGE
+from reasoning_executor import then
+from seen_store import get_seen_store
+from triage_batcher import TriageBatcher
+from vault_events import NoteEventCoalescer
+from vault_frontmatter import read_frontmatter, update_frontmatter_field
+from vault_index import VaultIndex
+from vault_io import atomic_write_text, flush_pending
+from vault_trace import get_trace_recorder, start_trace_recorder
 from watchers.base_watcher import BaseWatcher
 from watchers.filesystem_watcher import DropFolderHandler
 from watchers.finance_watcher import FinanceWatcher
 from watchers.gmail_watcher import GmailWatcher
 from watchers.whatsapp_watcher import WhatsAppWatcher
+from worker_pool import PriorityWorkerPool, priority_rank
 
 # ── Logging Setup ──────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -67,37 +86,66 @@ WHATSAPP_SESSION = os.getenv("WHATSAPP_SESSION_PATH", "./whatsapp_session")
 FINANCE_DROP = os.getenv("FINANCE_DROP_PATH", str(VAULT_PATH / "Finance_Drop"))
 POLL_INTERVAL = int(os.getenv("WATCHER_POLL_INTERVAL", "60"))
 APPROVAL_THRESHOLD = float(os.getenv("APPROVAL_THRESHOLD_AMOUNT", "500"))
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", "4"))            # max in-flight items
+WORKER_QUEUE_MAX = int(os.getenv("WORKER_QUEUE_MAX", "500"))          # queued items before backpressure
+_submit_timeout = os.getenv("WORKER_SUBMIT_TIMEOUT", "")              # empty = block until space
+WORKER_SUBMIT_TIMEOUT = float(_submit_timeout) if _submit_timeout else None
+WORKER_MAX_PENDING = int(os.getenv("WORKER_MAX_PENDING", "200"))      # items awaiting Groq at once
+WATCHER_JOIN_TIMEOUT = float(os.getenv("WATCHER_JOIN_TIMEOUT", "10"))  # shutdown wait for watcher threads
+BACKLOG_DRAIN_RATE = float(os.getenv("BACKLOG_DRAIN_RATE", "2"))      # items/sec at startup, 0 = unthrottled
+TRIAGE_BATCH_SIZE = int(os.getenv("TRIAGE_BATCH_SIZE", "4"))          # notes per Groq request, 1 = no batching
+TRIAGE_BATCH_WAIT = float(os.getenv("TRIAGE_BATCH_WAIT", "0.5"))      # seconds to wait for a batch to fill
+TRIAGE_RETRIES = int(os.getenv("TRIAGE_RETRIES", "3"))                # re-submits after a failed triage
+TRIAGE_RETRY_BACKOFF = float(os.getenv("TRIAGE_RETRY_BACKOFF", "2.0"))  # s, doubled per attempt
+TRIAGE_MAX_TOKENS = 1024                                              # output budget per triaged note
+
+TRIAGE_PLAN_SCHEMA = """{
+  "summary": "one-line summary of the item",
+  "category": "email|whatsapp|finance|file|other",
+  "urgency": "high|medium|low",
+  "requires_approval": true/false,
+  "approval_reason": "why approval is needed (if applicable)",
+  "amount": 0.0,
+  "actions": [
+    {"action": "reply_email|send_whatsapp|log_transaction|move_to_done|other",
+      "description": "what to do",
+      "mcp_server": "email|whatsapp|browser|filesystem"}
+  ],
+  "plan_entry": "markdown checkbox entry for Plan.md"
+}"""
+
+# Stamped on a Needs_Action note once its approval request is written; the
+# note stays put until the human decides, but is never triaged again
+AWAITING_APPROVAL = "awaiting_approval"
+
+_ITEMS_PROCESSED = get_metrics().counter(
+    "ai_employee_items_processed_total", "Needs_Action items finished, by note type and route", ("source", "outcome"))
+_HITL_WAIT = get_metrics().histogram(
+    "ai_employee_hitl_wait_seconds", "Time from approval request to human decision", ("decision",),
+    buckets=HITL_BUCKETS)
 
 
-class NeedsActionHandler(FileSystemEventHandler):
+class NeedsActionHandler(NoteEventCoalescer):
     """
-    Watches /Needs_Action folder. When a new .md file appears,
-    triggers the reasoning loop to generate Plan.md.
+    Watches /Needs_Action folder. When a note is ready — created, moved in
+    (vault_io rename, claim fail-back, Obsidian drag) or rewritten by a git
+    pull — queues it once on the Orchestrator's priority worker pool.
+
+    Edits to notes that were already triaged and are waiting for approval
+    (a human touching them, the `status:` stamp itself) are ignored; set the
+    status back to pending to have a note triaged again.
     """
 
     def __init__(self, orchestrator: "Orchestrator"):
+        super().__init__(self._ready, folders=[orchestrator.needs_action], name="needs-action-events")
         self.orchestrator = orchestrator
-        self._processing: set = set()
 
-    def on_created(self, event):
-        if event.is_directory:
+    def _ready(self, path: Path):
+        if self.orchestrator.awaiting_approval(path):
+            log.debug("Ignoring edit to %s — awaiting approval", path.name)
             return
-        path = Path(event.src_path)
-        if path.suffix == ".md" and path not in self._processing:
-            self._processing.add(path)
-            log.info("New Needs_Action file detected: %s", path.name)
-            threading.Thread(
-                target=self._handle,
-                args=(path,),
-                daemon=True,
-                name=f"handle-{path.stem}",
-            ).start()
-
-    def _handle(self, path: Path):
-        try:
-            self.orchestrator.process_needs_action_file(path)
-        finally:
-            self._processing.discard(path)
+        log.info("Needs_Action note ready: %s", path.name)
+        self.orchestrator.submit(path)
 
 
 class Orchestrator:
@@ -129,36 +177,62 @@ class Orchestrator:
 
         self.recovery = ErrorRecovery()
         self.quarantine = QuarantineManager(self.vault / "Quarantine")
+        # Folder counts / latest-N for dashboard + health checks (no per-refresh globbing)
+        self.index = VaultIndex(self.vault)
+        self.index.ensure_reconciled()
         self._shutdown = threading.Event()
         self._watcher_threads: list[threading.Thread] = []
+        self._watchers: list[BaseWatcher] = []
         self._observers: list[Observer] = []
-
-        # Groq client (lazy import to allow running without groq installed)
-        self._groq = None
-
-    # ── Groq Client ────────────────────────────────────────────────────────────
-    @property
-    def groq(self):
-        if self._groq is None:
-            from groq import Groq
-            self._groq = Groq(api_key=GROQ_API_KEY)
-        return self._groq
+        self._event_handlers: list[NoteEventCoalescer] = []
+        # Bounded priority pool for Needs_Action items (replaces thread-per-file)
+        # Workers only read notes and start triage; Groq runs on the async
+        # reasoning executor and the finisher threads apply the plans.
+        self.pool = PriorityWorkerPool(
+            self._handle_needs_action,
+            workers=WORKER_POOL_SIZE,
+            max_queue=WORKER_QUEUE_MAX,
+            name="needs-action",
+            max_pending=WORKER_MAX_PENDING,
+        )
+        self.reasoner = get_gateway()
+        self._finisher = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE, thread_name_prefix="needs-action-finish")
+        self._triage_failures: dict[Path, int] = {}
+        self._triage_failures_lock = threading.Lock()
+        self._drain_stats: dict = {"state": "not_started"}
+        self.llm_cache = get_llm_cache(self.vault)
+        self.dashboard = DashboardRenderer(self.vault, self.index, self._dashboard_health)
+        self.plan_writer = get_plan_writer(self.vault)
+        self.done_archive = get_done_archive(self.vault)
+        self.prompt_prefix = PromptPrefix(self.vault / "Company_Handbook.md", self._render_triage_prefix)
+        self._prompt_stats = {"builds": 0, "items": 0, "total_ms": 0.0, "max_ms": 0.0}
+        self._prompt_stats_lock = threading.Lock()
+        self.triager = TriageBatcher(
+            self._triage_batch,
+            self._triage_single,
+            batch_size=TRIAGE_BATCH_SIZE,
+            max_wait=TRIAGE_BATCH_WAIT,
+        )
+        self.metrics = get_metrics()
+        self.metrics.register_collector(self._collect_metrics)
+        self._metrics_exporter: Optional[MetricsExporter] = None
 
     # ── Watcher Management ─────────────────────────────────────────────────────
     def _start_watcher_thread(self, watcher: BaseWatcher, name: str):
         """Start a watcher in a daemon thread with auto-restart on crash."""
         def _run():
-            while not self._shutdown.is_set():
+            while not self._shutdown.is_set() and not watcher.stopped:
                 try:
                     log.info("Starting watcher: %s", name)
                     watcher.run()
                 except Exception as exc:
-                    self.recovery.record_error(ErrorCategory.SYSTEM, str(exc), name)
+                    self.recovery.record_error(ErrorCategory.SYSTEM, str(exc), f"watcher:{name}")
                     log.error("Watcher %s crashed: %s — restarting in 30s", name, exc)
-                    time.sleep(30)
+                    self._shutdown.wait(30)
 
         t = threading.Thread(target=_run, daemon=True, name=name)
         t.start()
+        self._watchers.append(watcher)
         self._watcher_threads.append(t)
         return t
 
@@ -194,129 +268,414 @@ class Orchestrator:
         drop_path = self.vault / "Drop"
         drop_path.mkdir(parents=True, exist_ok=True)
         observer.schedule(drop_handler, str(drop_path), recursive=False)
+        self._event_handlers.append(drop_handler)
         observer.start()
         self._observers.append(observer)
         log.info("FilesystemWatcher active on: %s", drop_path)
 
+    def submit(self, path: Path, timeout: Optional[float] = WORKER_SUBMIT_TIMEOUT) -> bool:
+        """
+        Queue a Needs_Action note for processing, ranked by its `priority:`
+        frontmatter. Blocks while the queue is full (backpressure), for at
+        most *timeout* s — 0 rejects at once, for callers that can't wait.
+        """
+        priority = priority_rank(read_frontmatter(path).priority)
+        queued = self.pool.submit(path, priority=priority, timeout=timeout)
+        if not queued and not self.pool.is_pending(path):
+            log.warning("Not queued (pool full): %s — stays in Needs_Action", path.name)
+        return queued
+
     def start_needs_action_monitor(self):
         """Watch /Needs_Action folder for new .md files."""
+        self.pool.start()
         handler = NeedsActionHandler(self)
+        self._event_handlers.append(handler)
         observer = Observer()
         observer.schedule(handler, str(self.needs_action), recursive=False)
         observer.start()
         self._observers.append(observer)
         log.info("NeedsAction monitor active on: %s", self.needs_action)
 
+    def start_vault_index(self):
+        """Catch up on changes made while we were down, then follow watchdog events."""
+        self.index.reconcile()
+        self.dashboard.reload()
+        self._observers.append(self.index.start())
+        self.dashboard.request_update()
+
+    def _dashboard_health(self) -> dict:
+        return {
+            "watcher_threads": sum(1 for t in self._watcher_threads if t.is_alive()),
+            "gmail_ready": Path(GMAIL_CREDENTIALS).exists(),
+            "model": GROQ_MODEL,
+        }
+
+    def start_done_compactor(self):
+        """Migrate pre-sharding files from flat /Done into Done/YYYY/MM/ in the background."""
+        self.done_archive.start_compactor(on_moved=self.index.move)
+
+    def start_backlog_drain(self):
+        """
+        Feed notes already sitting in /Needs_Action (e.g. written while we were
+        down) through the worker pool once, highest priority first, at
+        BACKLOG_DRAIN_RATE items/sec. Notes already waiting for approval are
+        left alone.
+        """
+        t = threading.Thread(target=self._drain_backlog, daemon=True, name="BacklogDrain")
+        t.start()
+        self._watcher_threads.append(t)
+
+    def _drain_backlog(self):
+        notes = self.index.notes("Needs_Action")
+        pending_approvals = {n["name"] for n in self.index.notes("Pending_Approval")}
+        backlog = sorted(
+            (n for n in notes if not self.awaiting_approval(n["path"], n["status"], pending_approvals)),
+            key=lambda n: (priority_rank(n["priority"]), n["mtime"]),
+        )
+        started = time.monotonic()
+        stats = self._drain_stats = {
+            "state": "draining",
+            "total": len(backlog),
+            "submitted": 0,
+            "skipped": 0,
+            "awaiting_approval": len(notes) - len(backlog),
+            "rate_limit_per_s": BACKLOG_DRAIN_RATE,
+            "started": datetime.now().isoformat(),
+        }
+        if not backlog:
+            stats.update(state="done", elapsed_s=0.0, throughput_per_s=0.0)
+            return
+        log.info("Draining Needs_Action backlog: %d item(s) at %s/s", len(backlog), BACKLOG_DRAIN_RATE or "∞")
+
+        interval = 1.0 / BACKLOG_DRAIN_RATE if BACKLOG_DRAIN_RATE > 0 else 0.0
+        submitted: list[Path] = []
+        for note in backlog:
+            if self._shutdown.is_set():
+                return
+            path = note["path"]
+            if not path.exists() or self.pool.is_pending(path):
+                stats["skipped"] += 1
+                continue
+            if self.submit(path):
+                submitted.append(path)
+                stats["submitted"] += 1
+            else:
+                stats["skipped"] += 1
+            if interval:
+                self._shutdown.wait(timeout=interval)
+
+        # Wait for the drained items to finish so catch-up throughput is measurable
+        while any(self.pool.is_pending(p) for p in submitted) and not self._shutdown.is_set():
+            self._shutdown.wait(timeout=0.25)
+        elapsed = time.monotonic() - started
+        stats.update(
+            state="done",
+            elapsed_s=round(elapsed, 2),
+            throughput_per_s=round(len(submitted) / elapsed, 2) if elapsed else 0.0,
+        )
+        log.info(
+            "Backlog drained: %d processed, %d skipped in %.1fs (%.2f items/s)",
+            len(submitted), stats["skipped"], elapsed, stats["throughput_per_s"],
+        )
+
+    def awaiting_approval(self, path: Path, status: Optional[str] = None,
+                          pending_approvals: Optional[set[str]] = None) -> bool:
+        """
+        True if *path* was already routed to HITL: stamped `status:
+        awaiting_approval`, or (notes without a status field) an approval
+        request for it is still in /Pending_Approval.
+        """
+        if status is None:
+            status = read_frontmatter(path).status
+        if status == AWAITING_APPROVAL:
+            return True
+        if pending_approvals is None:
+            pending_approvals = {f.name for f in self.pending_approval.glob("APPROVAL_REQUIRED_*.md")}
+        request = re.compile(rf"APPROVAL_REQUIRED_{re.escape(self._approval_stem(path))}_\d{{8}}_\d{{6}}\.md")
+        return any(request.fullmatch(name) for name in pending_approvals)
+
+    @staticmethod
+    def _approval_stem(source_path: Path) -> str:
+        return source_path.stem.replace(" ", "_")
+
     def start_hitl_monitor(self):
         """Poll /Approved and /Rejected folders every 10s for human decisions."""
         def _poll():
             while not self._shutdown.is_set():
                 self._process_approved()
                 self._process_rejected()
-                time.sleep(10)
+                self._shutdown.wait(10)
 
         t = threading.Thread(target=_poll, daemon=True, name="HITLMonitor")
         t.start()
         self._watcher_threads.append(t)
 
     # ── Reasoning Loop ─────────────────────────────────────────────────────────
-    @with_error_recovery(retries=3, backoff=2.0, category=ErrorCategory.TRANSIENT)
-    def process_needs_action_file(self, path: Path):
+    def _handle_needs_action(self, path: Path) -> Optional[Future]:
         """
-        Read a Needs_Action .md file, send to Groq, write Plan.md,
-        and route sensitive actions to HITL.
+        Worker-pool handler. Cheap checks and cache hits finish inline;
+        otherwise triage is started and a Future is returned, so the worker
+        thread is free again while Groq works.
         """
+        if not path.exists():
+            log.info("Skipping %s — already moved or processed", path.name)
+            return None
         content = path.read_text(encoding="utf-8")
         log.info("Processing: %s (%d chars)", path.name, len(content))
 
         # Check for data integrity
         if not content.strip():
+            _ITEMS_PROCESSED.inc(source=self._item_source(path), outcome="quarantined")
             self.quarantine.quarantine(path, "Empty file")
-            return
+            self.index.remove(path)
+            return None
 
-        # Build context from handbook (Rules of Engagement)
-        handbook_path = self.vault / "Company_Handbook.md"
-        handbook = handbook_path.read_text(encoding="utf-8") if handbook_path.exists() else ""
+        # Duplicates (re-sent messages, same email via API + IMAP) reuse the cached plan
+        cache_key = self.llm_cache.key(
+            "triage", GROQ_MODEL, self.prompt_prefix.version, note=content,
+        )
+        plan = self.llm_cache.get_json(cache_key)
+        if plan is not None:
+            log.info("Triage cache hit: %s", path.name)
+            try:
+                self._apply_plan(path, plan)
+            except Exception as exc:
+                self._triage_failed(path, exc)
+                raise
+            self._triage_succeeded(path)
+            return None
+
+        done: Future = Future()
+        self.triager.submit(path.name, (path, content)).add_done_callback(
+            lambda triaged: self._finisher.submit(self._finish_triage, path, cache_key, triaged, done)
+        )
+        return done
 
-        prompt = f"""You are an autonomous AI executive assistant.
+    def _finish_triage(self, path: Path, cache_key: str, triaged: Future, done: Future):
+        """Runs on a finisher thread once Groq has answered for *path*."""
+        try:
+            try:
+                plan = triaged.result()
+            except ValueError as exc:
+                _ITEMS_PROCESSED.inc(source=self._item_source(path), outcome="quarantined")
+                self.quarantine.quarantine(path, str(exc))
+                self.index.remove(path)
+                self.recovery.record_error(ErrorCategory.LOGIC, "Non-JSON Groq response", "triage",
+                                           subject=path.name)
+                done.set_result(None)
+                return
+            self.llm_cache.put_json(cache_key, plan)
+            self._apply_plan(path, plan)
+            self._triage_succeeded(path)
+            done.set_result(None)
+        except Exception as exc:
+            self._triage_failed(path, exc)
+            done.set_exception(exc)
+
+    def _triage_succeeded(self, path: Path):
+        with self._triage_failures_lock:
+            self._triage_failures.pop(path, None)
+
+    def _triage_failed(self, path: Path, exc: Exception):
+        """
+        Record the failure and re-submit the note (Groq / network error) after
+        TRIAGE_RETRY_BACKOFF × 2^(attempt-1) s, up to TRIAGE_RETRIES times.
+        After that it stays in Needs_Action for the next backlog drain.
+        """
+        _ITEMS_PROCESSED.inc(source=self._item_source(path), outcome="failed")
+        self.recovery.record_error(ErrorCategory.TRANSIENT, str(exc), "triage", subject=path.name)
+        with self._triage_failures_lock:
+            attempt = self._triage_failures.get(path, 0) + 1
+            if attempt > TRIAGE_RETRIES:
+                self._triage_failures.pop(path, None)
+                log.error("Triage of %s failed %d times — left in Needs_Action: %s", path.name, attempt - 1, exc)
+                return
+            self._triage_failures[path] = attempt
+        delay = TRIAGE_RETRY_BACKOFF * 2 ** (attempt - 1)
+        log.warning("Triage of %s failed (%s) — retry %d/%d in %.1fs", path.name, exc, attempt, TRIAGE_RETRIES, delay)
+
+        def _retry():
+            if not self._shutdown.is_set() and path.exists():
+                self.submit(path)
+
+        timer = threading.Timer(delay, _retry)
+        timer.daemon = True
+        timer.start()
+
+    def _apply_plan(self, path: Path, plan: dict):
+        source = self._item_source(path)
+        # Write to Plan.md
+        self._update_plan(plan, path)
+
+        # Route: HITL or auto-process
+        if plan.get("requires_approval"):
+            self._create_approval_request(path, plan)
+            _ITEMS_PROCESSED.inc(source=source, outcome="approval")
+        else:
+            self._auto_process(path, plan)
+            _ITEMS_PROCESSED.inc(source=source, outcome="auto")
+
+        # Refresh dashboard (debounced — bursts coalesce into one write)
+        self.dashboard.request_update()
+
+    @staticmethod
+    def _item_source(path: Path) -> str:
+        """Metrics label: frontmatter `type:` (email, whatsapp, file_drop…), else the filename prefix."""
+        try:
+            note_type = read_frontmatter(path).type
+        except OSError:
+            note_type = ""
+        return note_type or path.name.split("_", 1)[0].lower() or "unknown"
+
+    # ── Triage (Groq) ──────────────────────────────────────────────────────────
+    @staticmethod
+    def _render_triage_prefix(handbook: str) -> str:
+        """
+        Stable part of every triage prompt (single and batched). Nothing
+        per-item or time-dependent goes here so provider-side prompt caching
+        can reuse it.
+        """
+        return f"""You are an autonomous AI executive assistant.
 
 RULES OF ENGAGEMENT (from Company Handbook):
 {handbook[:2000]}
 
+Flag requires_approval=true if: payment > {APPROVAL_THRESHOLD}, sending external comms, or irreversible action.
+
+Every triaged item gets a plan, a JSON object with these fields:
+{TRIAGE_PLAN_SCHEMA}
+"""
+
+    def _record_prompt_build(self, started: float, items: int):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._prompt_stats_lock:
+            stats = self._prompt_stats
+            stats["builds"] += 1
+            stats["items"] += items
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def prompt_build_stats(self) -> dict:
+        with self._prompt_stats_lock:
+            stats = dict(self._prompt_stats)
+        return {
+            "builds": stats["builds"],
+            "avg_ms_per_item": round(stats["total_ms"] / stats["items"], 3) if stats["items"] else 0.0,
+            "max_ms": round(stats["max_ms"], 3),
+            "prefix_version": self.prompt_prefix.version,
+            "prefix_rebuilds": self.prompt_prefix.rebuilds,
+        }
+
+    def _triage_single(self, name: str, item: tuple) -> Future:
+        """One note → one Groq request. The Future raises ValueError on a non-JSON reply."""
+        path, content = item
+        started = time.perf_counter()
+        prompt = f"""{self.prompt_prefix.get()}
+Today: {datetime.now().strftime('%Y-%m-%d %A %H:%M')}
+
 NEW ITEM REQUIRING ATTENTION:
 File: {path.name}
 ---
 {content}
 ---
 
-Today: {datetime.now().strftime('%Y-%m-%d %A %H:%M')}
-
-Your response MUST be a JSON object with these fields:
-{{
-  "summary": "one-line summary of the item",
-  "category": "email|whatsapp|finance|file|other",
-  "urgency": "high|medium|low",
-  "requires_approval": true/false,
-  "approval_reason": "why approval is needed (if applicable)",
-  "amount": 0.0,
-  "actions": [
-    {{"action": "reply_email|send_whatsapp|log_transaction|move_to_done|other",
-      "description": "what to do",
-      "mcp_server": "email|whatsapp|browser|filesystem"}}
-  ],
-  "plan_entry": "markdown checkbox entry for Plan.md"
-}}
-
-Flag requires_approval=true if: payment > {APPROVAL_THRESHOLD}, sending external comms, or irreversible action.
+Your response MUST be the plan JSON object for this item.
 """
-
-        response = self.groq.chat.completions.create(
+        self._record_prompt_build(started, 1)
+        response = self.reasoner.submit(
+            lane=LANE_TRIAGE,
+            component="triage",
             model=GROQ_MODEL,
             messages=[{"role": "user", "content": prompt}],
-            max_tokens=1024,
+            max_tokens=TRIAGE_MAX_TOKENS,
             response_format={"type": "json_object"},
         )
+        return then(response, self._parse_single_plan)
 
+    @staticmethod
+    def _parse_single_plan(response) -> dict:
         raw = response.choices[0].message.content
         try:
             plan = json.loads(raw)
         except json.JSONDecodeError:
-            self.quarantine.quarantine(path, f"Groq returned non-JSON: {raw[:200]}")
-            self.recovery.record_error(ErrorCategory.LOGIC, "Non-JSON Groq response", path.name)
-            return
+            raise ValueError(f"Groq returned non-JSON: {raw[:200]}")
+        if not isinstance(plan, dict):
+            raise ValueError(f"Groq returned non-object JSON: {raw[:200]}")
+        return plan
 
-        # Write to Plan.md
-        self._update_plan(plan, path)
+    def _triage_batch(self, items: list[tuple]) -> Future:
+        """
+        Several notes → one Groq request. Resolves to {file name: plan}; items
+        whose plan is missing or malformed are left out so they get a single call.
+        """
+        started = time.perf_counter()
+        blocks = "\n".join(
+            f"### File: {path.name}\n---\n{content}\n---\n" for _, (path, content) in items
+        )
+        prompt = f"""{self.prompt_prefix.get()}
+Today: {datetime.now().strftime('%Y-%m-%d %A %H:%M')}
 
-        # Route: HITL or auto-process
-        if plan.get("requires_approval"):
-            self._create_approval_request(path, plan)
-        else:
-            self._auto_process(path, plan)
+{len(items)} NEW ITEMS REQUIRING ATTENTION:
+
+{blocks}
+Triage every item independently. Your response MUST be a JSON object of the form
+{{"items": [ ... ]}} with exactly one plan per item, each plan also containing
+"file": "<the item's file name>".
+"""
+        self._record_prompt_build(started, len(items))
+        response = self.reasoner.submit(
+            lane=LANE_TRIAGE,
+            component="triage",
+            model=GROQ_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=min(TRIAGE_MAX_TOKENS * len(items), 8192),
+            response_format={"type": "json_object"},
+        )
+        return then(response, lambda resp: self._parse_batch_plans(resp, items))
 
-        # Always refresh dashboard after any processing
-        self._update_dashboard()
+    def _parse_batch_plans(self, response, items: list[tuple]) -> dict:
+        raw = response.choices[0].message.content
+        try:
+            entries = json.loads(raw).get("items", [])
+        except (json.JSONDecodeError, AttributeError):
+            log.warning("Batch triage returned malformed JSON — falling back: %s", raw[:200])
+            return {}
+
+        wanted = {name for name, _ in items}
+        plans = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            name = entry.pop("file", None)
+            if name in wanted and self._valid_plan(entry):
+                plans[name] = entry
+        if len(plans) < len(items):
+            log.warning("Batch triage: %d/%d plans usable — rest fall back to single calls",
+                        len(plans), len(items))
+        return plans
+
+    @staticmethod
+    def _valid_plan(plan: dict) -> bool:
+        return (
+            isinstance(plan.get("summary"), str)
+            and isinstance(plan.get("actions", []), list)
+            and isinstance(plan.get("requires_approval", False), bool)
+        )
 
     def _update_plan(self, plan: dict, source_path: Path):
-        """Append a checkbox entry to Plan.md."""
-        plan_path = self.vault / "Plan.md"
+        """Queue a checkbox entry for Plan.md (written by the single PlanWriter thread)."""
         entry = plan.get("plan_entry", f"- [ ] Process {source_path.name}")
         urgency = plan.get("urgency", "low")
         emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(urgency, "⚪")
 
-        today = datetime.now().strftime("%Y-%m-%d")
-        header = f"\n## {emoji} {today} — {plan.get('summary', source_path.name)}\n"
-
-        with plan_path.open("a", encoding="utf-8") as f:
-            f.write(header)
-            f.write(entry + "\n")
-
-        log.info("Plan.md updated with: %s", plan.get("summary", ""))
+        now = datetime.now()
+        header = f"## {emoji} {now.strftime('%Y-%m-%d')} — {plan.get('summary', source_path.name)}"
+        self.plan_writer.append(f"{header}\n{entry}", when=now)
 
     def _create_approval_request(self, source_path: Path, plan: dict):
         """Write an approval request file to /Pending_Approval."""
         now = datetime.now()
-        safe_name = source_path.stem.replace(" ", "_")
+        safe_name = self._approval_stem(source_path)
         approval_path = self.pending_approval / f"APPROVAL_REQUIRED_{safe_name}_{now.strftime('%Y%m%d_%H%M%S')}.md"
 
         content = f"""---
@@ -351,7 +710,12 @@ Move this file to `/Approved` folder.
 ## ❌ To Reject
 Move this file to `/Rejected` folder.
 """
-        approval_path.write_text(content, encoding="utf-8")
+        atomic_write_text(approval_path, content, encoding="utf-8")
+        self.index.upsert(approval_path)
+        # The source stays in /Needs_Action until the decision; mark it routed
+        # so restarts (backlog drain) don't triage it again
+        if update_frontmatter_field(source_path, "status", AWAITING_APPROVAL):
+            self.index.upsert(source_path)
         log.info("Approval request created: %s", approval_path.name)
 
     def _auto_process(self, source_path: Path, plan: dict):
@@ -365,41 +729,45 @@ Move this file to `/Rejected` folder.
             log.info("  → [%s] %s", action.get("mcp_server", "?"), action.get("description", ""))
             # MCP server calls would be dispatched here in Silver/Gold/Platinum tiers
 
-        # Move processed file to /Done
-        done_path = self.done / source_path.name
-        source_path.rename(done_path)
+        # Move processed file to this month's /Done shard
+        done_path = self.done_archive.archive(source_path, outcome="auto")
+        self.index.move(source_path, done_path)
         log.info("Moved to Done: %s", done_path.name)
 
     # ── HITL Processing ────────────────────────────────────────────────────────
     def _update_file_status(self, filepath: Path, new_status: str) -> Path:
         """Rewrite the status: field in frontmatter before archiving."""
         try:
-            content = filepath.read_text(encoding="utf-8")
-            import re
-            content = re.sub(
-                r'^(status:\s*).*$', f'\\g<1>{new_status}',
-                content, count=1, flags=re.MULTILINE
-            )
-            filepath.write_text(content, encoding="utf-8")
+            update_frontmatter_field(filepath, "status", new_status)
         except Exception as e:
             log.warning("Could not update status in %s: %s", filepath.name, e)
         return filepath
 
+    @staticmethod
+    def _observe_hitl_wait(filepath: Path, decision: str):
+        """Approval request `created:` → now, for the HITL wait histogram."""
+        try:
+            created = datetime.fromisoformat(str(read_frontmatter(filepath).get("created", "")))
+        except (OSError, ValueError):
+            return
+        _HITL_WAIT.observe(max(0.0, (datetime.now() - created).total_seconds()), decision=decision)
+
     def _process_approved(self):
         for f in self.approved.glob("*.md"):
             if f.name == ".gitkeep":
                 continue
             log.info("APPROVED: %s — executing actions via MCP", f.name)
+            self._observe_hitl_wait(f, "approved")
             self._update_file_status(f, "approved")
             # Dispatch to Silver/Gold MCP email server if available
             try:
                 self._dispatch_mcp_email(f)
             except Exception as e:
                 log.warning("MCP dispatch skipped: %s", e)
-            done_path = self.done / f"APPROVED_{f.name}"
-            f.rename(done_path)
+            done_path = self.done_archive.archive(f, f"APPROVED_{f.name}")
+            self.index.move(f, done_path)
             log.info("✅ Moved to Done: %s", done_path.name)
-            self._update_dashboard()
+            self.dashboard.request_update()
 
     def _process_rejected(self):
         for f in self.rejected.glob("*.md"):
@@ -407,121 +775,19 @@ Move this file to `/Rejected` folder.
                 continue
             if not (f.name.startswith("REJECTED_") or f.name.startswith("FAILED_")):
                 log.info("REJECTED: %s — archiving", f.name)
+                self._observe_hitl_wait(f, "rejected")
                 self._update_file_status(f, "rejected")
-                done_path = self.done / f"REJECTED_{f.name}"
-                f.rename(done_path)
+                done_path = self.done_archive.archive(f, f"REJECTED_{f.name}")
+                self.index.move(f, done_path)
                 log.info("❌ Archived rejected: %s", done_path.name)
-                self._update_dashboard()
-
-    def _update_dashboard(self):
-        """Rewrite Dashboard.md with current live stats from vault folders."""
-        import re
-        dashboard_path = self.vault / "Dashboard.md"
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Count items in each folder
-        needs_action_files  = [f for f in self.needs_action.glob("*.md")    if f.name != ".gitkeep"]
-        pending_files       = [f for f in self.pending_approval.glob("*.md") if f.name != ".gitkeep"]
-        done_files          = [f for f in self.done.glob("*.md")             if f.name != ".gitkeep"]
-
-        # Build Needs Action table rows
-        na_rows = "\n".join(
-            f"| {f.stem[:50]} | 🔴 | {datetime.fromtimestamp(f.stat().st_mtime).strftime('%Y-%m-%d %H:%M')} |"
-            for f in sorted(needs_action_files, key=lambda x: x.stat().st_mtime, reverse=True)[:5]
-        ) or "| — | — | — |"
-
-        # Build Pending Approval table rows
-        pa_rows = "\n".join(
-            f"| {f.stem[:50]} | — | pending |"
-            for f in sorted(pending_files, key=lambda x: x.stat().st_mtime, reverse=True)[:5]
-        ) or "| — | — | — |"
-
-        # Build recent Done rows
-        done_rows = "\n".join(
-            f"| {f.stem[:50]} | {'✅ approved' if f.name.startswith('APPROVED') else '❌ rejected' if f.name.startswith('REJECTED') else '✔ processed'} |"
-            for f in sorted(done_files, key=lambda x: x.stat().st_mtime, reverse=True)[:5]
-        ) or "| — | — |"
-
-        # Read latest bank balance from Accounting
-        balance_line = "—"
-        acct_dir = self.vault / "Accounting"
-        acct_files = sorted(acct_dir.glob("*.md"), reverse=True)
-        if acct_files:
-            acct_text = acct_files[0].read_text(encoding="utf-8")
-            match = re.search(r"\|\s*Current Balance.*?\|\s*([₨$€£\d,.\s]+)\|", acct_text)
-            if match:
-                balance_line = match.group(1).strip()
-
-        # System health
-        thread_count = sum(1 for t in self._watcher_threads if t.is_alive())
-        health_emoji = "🟢" if thread_count > 0 else "🔴"
-
-        dashboard = f"""# 🤖 AI Employee Dashboard
-> **Last updated:** {now} (auto-updated by Orchestrator)
-
----
-
-## 💰 Bank Balance
-| Account | Balance | Source |
-|---------|---------|--------|
-| Business Checking | {balance_line} | Accounting/Current_Month |
-
----
-
-## 📬 Inbox Summary
-| Folder | Count |
-|--------|-------|
-| 🔴 Needs Action | {len(needs_action_files)} |
-| ⏳ Pending Approval | {len(pending_files)} |
-| ✅ Done (total) | {len(done_files)} |
-
----
-
-## 🔴 Needs Action (latest 5)
-| File | Urgency | Detected |
-|------|---------|----------|
-{na_rows}
-
----
-
-## ⏳ Pending Your Approval (latest 5)
-| File | Amount | Status |
-|------|--------|--------|
-{pa_rows}
-
----
-
-## ✅ Recently Completed (latest 5)
-| File | Outcome |
-|------|---------|
-{done_rows}
-
----
-
-## 🏥 System Health
-| Component | Status |
-|-----------|--------|
-| Orchestrator | {health_emoji} Running ({thread_count} watcher threads) |
-| Gmail Watcher | {'🟢 Active' if Path(GMAIL_CREDENTIALS).exists() else '🟡 No credentials'} |
-| WhatsApp Webhook | 🟢 Meta Cloud API (port 3000) |
-| Finance Watcher | 🟢 Active |
-| Groq API | 🟢 {GROQ_MODEL} |
-
----
-*Single writer: Local Orchestrator | Vault: {self.vault.resolve()}*
-"""
-        dashboard_path.write_text(dashboard, encoding="utf-8")
-        log.info("Dashboard.md updated at %s", now)
+                self.dashboard.request_update()
 
     def _dispatch_mcp_email(self, approval_file: Path):
         """Try to dispatch approved email action to Silver Tier MCP server."""
-        import json, re
-        content = approval_file.read_text(encoding="utf-8")
         # Extract actions JSON from frontmatter
-        match = re.search(r'^actions:\s*(\[.*?\])\s*$', content, re.MULTILINE | re.DOTALL)
-        if not match:
+        actions = read_frontmatter(approval_file).json("actions")
+        if not actions:
             return
-        actions = json.loads(match.group(1))
         for action in actions:
             if action.get("mcp_server") == "email":
                 mcp_url = os.getenv("EMAIL_MCP_URL", "http://localhost:8001")
@@ -541,20 +807,105 @@ Move this file to `/Rejected` folder.
         return {
             "timestamp": datetime.now().isoformat(),
             "vault_exists": self.vault.exists(),
-            "needs_action_count": len(list(self.needs_action.glob("*.md"))),
-            "pending_approval_count": len(list(self.pending_approval.glob("*.md"))),
+            "needs_action_count": self.index.count("Needs_Action"),
+            "pending_approval_count": self.index.count("Pending_Approval"),
             "watcher_threads": sum(1 for t in self._watcher_threads if t.is_alive()),
+            "watchers": {w.name: w.stats() for w in self._watchers},
+            "seen_store": get_seen_store(self.vault).stats(),
             "observers": sum(1 for o in self._observers if o.is_alive()),
+            "worker_pool": self.pool.stats(),
+            "backlog_drain": dict(self._drain_stats),
+            "triage": self.triager.stats(),
+            "llm_cache": self.llm_cache.stats(),
+            "reasoning": self.reasoner.stats(),
+            "rate_limiter": self.reasoner.limiter.stats(),
+            "prompt_build": self.prompt_build_stats(),
+            "dashboard": self.dashboard.stats(),
+            "vault_events": {h.name: h.stats() for h in self._event_handlers},
+            "plan_writer": self.plan_writer.stats(),
+            "done_archive": self.done_archive.stats(),
+            "profiler": get_profiler().stats() if get_profiler() else None,
+            "trace": get_trace_recorder().stats() if get_trace_recorder() else None,
             "recent_errors": self.recovery.recent_errors(limit=5),
         }
 
+    # ── Metrics ────────────────────────────────────────────────────────────────
+    def start_metrics(self):
+        """Serve /metrics (METRICS_PORT) and/or write METRICS_TEXTFILE."""
+        self._metrics_exporter = MetricsExporter(self.metrics).start()
+
+    def _collect_metrics(self) -> list:
+        """Scrape-time view of the counters components already keep in stats()."""
+        pool = self.pool.stats()
+        dashboard = self.dashboard.stats()
+        plans = self.plan_writer.stats()
+        cache = self.llm_cache.stats()
+        triage = self.triager.stats()
+        limiter = self.reasoner.limiter.stats()
+        events = {h.name: h.stats() for h in self._event_handlers}
+        return [
+            ("ai_employee_queue_depth", "gauge", "Needs_Action items queued for a worker",
+             [({}, pool["queue_depth"])]),
+            ("ai_employee_in_flight", "gauge", "Needs_Action items being triaged",
+             [({}, pool["in_flight"])]),
+            ("ai_employee_worker_pool_total", "counter", "Worker pool submissions by result",
+             [({"result": k}, pool[k]) for k in ("submitted", "completed", "failed", "rejected", "duplicates")]),
+            ("ai_employee_vault_notes", "gauge", "Notes per indexed vault folder",
+             [({"folder": folder}, n) for folder, n in self.index.counts().items()]),
+            ("ai_employee_dashboard_writes_total", "counter", "Dashboard.md renders and actual writes",
+             [({"kind": k}, dashboard[k]) for k in ("requests", "renders", "writes", "skipped_unchanged")]),
+            ("ai_employee_plan_writes_total", "counter", "Plan entries appended and batched file flushes",
+             [({"kind": k}, plans[k]) for k in ("appended", "flushes", "written", "errors")]),
+            ("ai_employee_plan_queue_depth", "gauge", "Plan entries waiting for the writer",
+             [({}, plans["queued"])]),
+            ("ai_employee_llm_cache_total", "counter", "Triage cache lookups and stores",
+             [({"result": k}, cache[k]) for k in ("hits", "misses", "expired", "evicted", "stores")]),
+            ("ai_employee_triage_total", "counter", "Triage requests by kind",
+             [({"kind": k}, triage[k]) for k in ("batches", "batched_items", "single_calls", "fallbacks")]),
+            ("ai_employee_rate_limiter_total", "counter", "Rate limiter throttles, 429s and budget rejections",
+             [({"kind": k}, limiter.get(k, 0)) for k in ("throttled", "rate_limited", "budget_rejections")]),
+            ("ai_employee_rate_limiter_tokens_available", "gauge", "Tokens left in the per-minute bucket",
+             [({}, limiter["tokens_available"])]),
+            ("ai_employee_vault_events_total", "counter", "Coalesced vault folder events",
+             [({"handler": name, "kind": k}, st[k]) for name, st in events.items()
+              for k in ("events", "ready", "coalesced", "unchanged", "vanished", "gone")]),
+            ("ai_employee_errors_total", "counter", "Errors recorded by ErrorRecovery",
+             [({"category": cat, "component": comp}, n)
+              for (cat, comp), n in self.recovery.error_totals().items()]),
+            ("ai_employee_quarantined_total", "counter", "Files moved to /Quarantine",
+             [({}, self.quarantine.count)]),
+        ]
+
     # ── Shutdown ───────────────────────────────────────────────────────────────
     def shutdown(self):
         log.info("Orchestrator shutting down gracefully...")
         self._shutdown.set()
+        for watcher in self._watchers:
+            watcher.stop()
         for observer in self._observers:
             observer.stop()
             observer.join(timeout=5)
+        for handler in self._event_handlers:
+            handler.close()
+        self.pool.shutdown(timeout=10)
+        # Watchers return at their next wait; one stuck in a poll is abandoned (daemon thread)
+        deadline = time.monotonic() + WATCHER_JOIN_TIMEOUT
+        for t in self._watcher_threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+            if t.is_alive():
+                log.warning("Thread %s still busy after %.0fs — abandoning it", t.name, WATCHER_JOIN_TIMEOUT)
+        self.done_archive.stop()
+        self.dashboard.flush()
+        self._finisher.shutdown(wait=False, cancel_futures=True)
+        self.reasoner.shutdown(timeout=5)
+        self.plan_writer.close()
+        if self._metrics_exporter is not None:
+            self._metrics_exporter.stop()
+        if get_profiler() is not None:
+            get_profiler().stop()
+        if get_trace_recorder() is not None:
+            get_trace_recorder().close()
+        flush_pending()
         log.info("Shutdown complete.")
 
     # ── Main Run ───────────────────────────────────────────────────────────────
@@ -569,8 +920,14 @@ Move this file to `/Rejected` folder.
         signal.signal(signal.SIGINT, lambda s, f: self.shutdown())
         signal.signal(signal.SIGTERM, lambda s, f: self.shutdown())
 
+        start_profiler("orchestrator")
+        start_trace_recorder("orchestrator", self.vault)
+        self.start_metrics()
+        self.start_vault_index()
+        self.start_done_compactor()
         self.start_watchers()
         self.start_needs_action_monitor()
+        self.start_backlog_drain()
         self.start_hitl_monitor()
 
         log.info("All systems active. Watching for changes...")
@@ -579,10 +936,13 @@ Move this file to `/Rejected` folder.
         while not self._shutdown.is_set():
             health = self.health_check()
             log.info(
-                "Health: needs_action=%d pending_approval=%d threads=%d",
+                "Health: needs_action=%d pending_approval=%d threads=%d queue=%d in_flight=%d wait_p95=%.0fms",
                 health["needs_action_count"],
                 health["pending_approval_count"],
                 health["watcher_threads"],
+                health["worker_pool"]["queue_depth"],
+                health["worker_pool"]["in_flight"],
+                health["worker_pool"]["wait_p95_ms"],
             )
             self._shutdown.wait(timeout=300)  # Log health every 5 minutes
 
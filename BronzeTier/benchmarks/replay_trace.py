@@ -0,0 +1,333 @@
+"""
+replay_trace.py – Replay a recorded production trace against the Bronze pipeline
+
+Takes one or more traces recorded with TRACE_RECORD=true (vault_trace.py) and
+re-enacts them on a scratch vault with the real Orchestrator:
+
+  - notes are written to Needs_Action at their recorded time ÷ --speed
+    (gaps longer than --max-gap trace seconds are cut to --max-gap first)
+  - human decisions move the matching Pending_Approval request (same
+    source_file) to Approved / Rejected; if the pipeline hasn't produced it
+    within --decision-wait s the recorded note is written there instead
+  - the HITL pass runs every --hitl-poll s like Orchestrator.start_hitl_monitor,
+    dispatching approved emails to a stub MCP server
+  - LLM_PROVIDER=replay answers with the recorded responses after the
+    recorded latency × --latency-scale (no Groq, Gmail or WhatsApp needed)
+
+Reports throughput and p50/p95/p99 latency like run_benchmark.py, plus a
+per-window latency timeline on the trace's own clock, so a spike seen in
+production can be found, sliced out with --start/--end and replayed again
+under different settings (WORKER_POOL_SIZE, TRIAGE_BATCH_SIZE, ...):
+
+    cd BronzeTier
+    python -m benchmarks.replay_trace logs/traces/orchestrator_20261016_*.jsonl --speed 60
+    WORKER_POOL_SIZE=8 python -m benchmarks.replay_trace trace.jsonl --speed 60 \\
+        --compare benchmarks/results/<previous replay>.json
+    python -m benchmarks.replay_trace trace.jsonl --start 32400 --end 36000 --speed 10
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from benchmarks.run_benchmark import (
+    _BENCH_ENV, RESULTS_DIR, _delta, _git_info, compare, peak_rss_mb, percentile,
+    process_counters, start_stub_mcp, timed_orchestrator,
+)
+from vault_io import atomic_write_text
+from vault_trace import load_llm_index, read_trace
+
+
+# ── Timeline ───────────────────────────────────────────────────────────────────
+def schedule(events: list[dict], speed: float, max_gap: float) -> list[tuple[float, dict]]:
+    """(seconds after replay start, event) for each event, gaps capped then divided by speed."""
+    out = []
+    offset = 0.0
+    previous = events[0]["t"] if events else 0.0
+    for event in events:
+        gap = event["t"] - previous
+        if max_gap > 0:
+            gap = min(gap, max_gap)
+        offset += gap / speed
+        previous = event["t"]
+        out.append((offset, event))
+    return out
+
+
+def latency_timeline(samples: list[tuple[float, float]], window: float) -> list[dict]:
+    """(trace t, latency ms) samples → per-window note count and latency percentiles."""
+    buckets: dict[int, list[float]] = {}
+    for t, ms in samples:
+        buckets.setdefault(int(t // window), []).append(ms)
+    rows = []
+    for bucket in sorted(buckets):
+        values = sorted(buckets[bucket])
+        rows.append({
+            "t_start": bucket * window,
+            "notes": len(values),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "max_ms": round(values[-1], 1),
+        })
+    return rows
+
+
+# ── Replay driver ──────────────────────────────────────────────────────────────
+class _Decisions:
+    """Re-enacts human moves into Approved / Rejected and runs the HITL pass."""
+
+    def __init__(self, orch, wait: float, poll: float):
+        self.orch = orch
+        self.wait = wait
+        self.poll = poll
+        self.deferred: list[tuple[dict, float]] = []
+        self.stats = {"decisions": 0, "matched": 0, "unmatched": 0, "hitl_passes": 0}
+        self._next_poll = time.monotonic() + poll
+
+    def apply(self, event: dict):
+        self.stats["decisions"] += 1
+        if not self._move(event):
+            self.deferred.append((event, time.monotonic()))
+
+    def _move(self, event: dict) -> bool:
+        target = self.orch.approved if event["decision"] == "approved" else self.orch.rejected
+        stem = Path(event.get("source_file") or "").stem.replace(" ", "_")
+        if stem:
+            pattern = f"APPROVAL_REQUIRED_{glob.escape(stem)}_*.md"
+            for request in sorted(self.orch.pending_approval.glob(pattern)):
+                try:
+                    request.rename(target / request.name)
+                except OSError:
+                    continue
+                self.orch.index.move(request, target / request.name)
+                self.stats["matched"] += 1
+                return True
+        return False
+
+    def tick(self, force: bool = False):
+        """Retry deferred decisions, give up on stale ones, run the HITL pass when due."""
+        now = time.monotonic()
+        still = []
+        for event, since in self.deferred:
+            if self._move(event):
+                continue
+            if force or now - since >= self.wait:
+                # The pipeline never asked (different plan) — replay the human's file as recorded
+                target = self.orch.approved if event["decision"] == "approved" else self.orch.rejected
+                atomic_write_text(target / event["name"], event["content"], encoding="utf-8")
+                self.stats["unmatched"] += 1
+            else:
+                still.append((event, since))
+        self.deferred = still
+        if force or now >= self._next_poll:
+            self.orch._process_approved()
+            self.orch._process_rejected()
+            self.stats["hitl_passes"] += 1
+            self._next_poll = now + self.poll
+
+    def idle_until(self, deadline: float):
+        while True:
+            self.tick()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.05))
+
+
+def replay(args) -> dict:
+    paths = [str(Path(p).resolve()) for p in args.traces]
+    events = [e for e in read_trace(paths)
+              if e["type"] in ("note", "decision") and args.start <= e["t"] <= (args.end or float("inf"))]
+    notes = [e for e in events if e["type"] == "note"]
+    if not notes:
+        raise SystemExit("No notes in the trace (window) — nothing to replay")
+    planned = schedule(events, args.speed, args.max_gap)
+
+    workdir = Path(tempfile.mkdtemp(prefix="ai_employee_replay_"))
+    vault = workdir / "Vault"
+    mcp = start_stub_mcp()
+    os.environ.update(VAULT_PATH=str(vault), LLM_PROVIDER="replay", TRACE_REPLAY=os.pathsep.join(paths),
+                      LLM_REPLAY_LATENCY_SCALE=str(args.latency_scale), TRACE_RECORD="false",
+                      EMAIL_MCP_URL=f"http://127.0.0.1:{mcp.server_address[1]}",
+                      ERROR_LOG_PATH=str(workdir / "logs" / "errors.jsonl"))
+    for key, value in _BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        # Imported late: module-level config reads the environment set above
+        import Orchestrator as orchestrator_module
+        logging.getLogger().setLevel(getattr(logging, args.log_level.upper()))
+
+        finished: dict[str, float] = {}
+        finished_lock = threading.Lock()
+        counters_before = process_counters()
+        startup_started = time.monotonic()
+        orch = timed_orchestrator(orchestrator_module, finished, finished_lock)()
+        orch.start_vault_index()
+        orch.start_needs_action_monitor()
+        startup_s = time.monotonic() - startup_started
+
+        decisions = _Decisions(orch, args.decision_wait, args.hitl_poll)
+        written: dict[str, tuple[float, float]] = {}          # name → (wall written, trace t)
+        started = time.monotonic()
+        for offset, event in planned:
+            decisions.idle_until(started + offset)
+            if event["type"] == "note":
+                written[event["name"]] = (time.monotonic(), event["t"])
+                atomic_write_text(orch.needs_action / event["name"], event["content"], encoding="utf-8")
+            else:
+                decisions.apply(event)
+        replay_s = time.monotonic() - started
+
+        # Let the pipeline catch up with the last notes, then settle outstanding decisions
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            with finished_lock:
+                done = sum(1 for name in written if name in finished)
+            if done + orch.quarantine.count >= len(written) and not decisions.deferred:
+                break
+            decisions.idle_until(time.monotonic() + 0.05)
+        elapsed = time.monotonic() - started
+        decisions.tick(force=True)
+        health = orch.health_check()
+        counters_after = process_counters()
+
+        with finished_lock:
+            samples = [(t, (finished[name] - wall) * 1000) for name, (wall, t) in written.items()
+                       if name in finished]
+        orch.shutdown()
+        mcp.shutdown()
+
+        latencies = sorted(ms for _, ms in samples)
+        completed = len(latencies)
+        trace_span = events[-1]["t"] - events[0]["t"]
+        timeline = latency_timeline(samples, args.window)
+        return {
+            "benchmark": "trace_replay",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            **_git_info(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "traces": paths, "notes": len(written), "mode": "replay", "speed": args.speed,
+                "max_gap": args.max_gap, "start": args.start, "end": args.end,
+                "latency_scale": args.latency_scale,
+                "env": {k: os.environ.get(k) for k in (*_BENCH_ENV, "WORKER_POOL_SIZE", "WORKER_MAX_PENDING",
+                                                       "TRIAGE_BATCH_SIZE", "TRIAGE_BATCH_WAIT",
+                                                       "LLM_MAX_CONCURRENCY", "LLM_CACHE_ENABLED")},
+            },
+            "trace": {"span_s": round(trace_span, 1), "notes": len(notes), "replayed_in_s": round(replay_s, 3)},
+            "startup_s": round(startup_s, 3),
+            "throughput": {
+                "completed": completed,
+                "quarantined": orch.quarantine.count,
+                "timed_out": completed + orch.quarantine.count < len(written),
+                "elapsed_s": round(elapsed, 3),
+                "items_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+            },
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 1),
+                "p95": round(percentile(latencies, 95), 1),
+                "p99": round(percentile(latencies, 99), 1),
+                "max": round(latencies[-1], 1) if latencies else 0.0,
+                "mean": round(sum(latencies) / completed, 1) if completed else 0.0,
+            },
+            "timeline": {"window_s": args.window, "rows": timeline},
+            "llm_replay": load_llm_index(paths).stats(),
+            "hitl": {
+                **decisions.stats,
+                "archived": {outcome: sum(1 for r in orch.done_archive.month_index() if r["outcome"] == outcome)
+                             for outcome in ("approved", "rejected")},
+                "mcp_requests": mcp.RequestHandlerClass.requests_seen,
+            },
+            "resources": {
+                "peak_rss_mb": peak_rss_mb(),
+                "threads": threading.active_count(),
+                **_delta(counters_after, counters_before),
+            },
+            "components": {k: health[k] for k in ("worker_pool", "triage", "llm_cache", "reasoning",
+                                                  "plan_writer", "dashboard", "prompt_build")},
+        }
+    finally:
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"Scratch vault kept at {workdir}")
+
+
+# ── Reporting ──────────────────────────────────────────────────────────────────
+def summary(result: dict, slowest: int = 3) -> str:
+    p, t, lat, llm, h = (result["params"], result["throughput"], result["latency_ms"],
+                         result["llm_replay"], result["hitl"])
+    lines = [
+        f"{p['notes']} notes from {result['trace']['span_s']}s of trace at {p['speed']}x "
+        f"(replayed in {result['trace']['replayed_in_s']}s) @ {result['commit']}"
+        f"{' (dirty)' if result['dirty'] else ''}",
+        f"  throughput : {t['items_per_s']} items/s ({t['completed']} done, {t['quarantined']} quarantined"
+        f"{', TIMED OUT' if t['timed_out'] else ''}) in {t['elapsed_s']}s",
+        f"  latency    : p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms",
+        f"  llm replay : {llm['exact']} exact, {llm['composed']} composed, {llm['missed']} missed (stub)",
+        f"  hitl       : {h['decisions']} decision(s), {h['matched']} matched, {h['unmatched']} unmatched, "
+        f"{h['mcp_requests']} MCP request(s)",
+    ]
+    rows = sorted(result["timeline"]["rows"], key=lambda r: -r["p95_ms"])[:slowest]
+    for row in rows:
+        lines.append(f"  slow window: trace t={row['t_start']:.0f}s  {row['notes']} notes  "
+                     f"p95 {row['p95_ms']}ms  max {row['max_ms']}ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded vault/LLM traces against the Bronze pipeline")
+    parser.add_argument("traces", nargs="+", help="trace .jsonl file(s) written with TRACE_RECORD=true")
+    parser.add_argument("--speed", type=float, default=1.0, help="timeline compression (60 = 1h in 1min)")
+    parser.add_argument("--max-gap", type=float, default=0.0,
+                        help="cap idle gaps to this many trace seconds before --speed (0 = keep)")
+    parser.add_argument("--start", type=float, default=0.0, help="replay from this trace second")
+    parser.add_argument("--end", type=float, default=0.0, help="replay up to this trace second (0 = end)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiplier for recorded LLM latency (0 = instant)")
+    parser.add_argument("--decision-wait", type=float, default=30.0,
+                        help="seconds a decision waits for its approval request before replaying as recorded")
+    parser.add_argument("--hitl-poll", type=float, default=10.0, help="seconds between HITL passes")
+    parser.add_argument("--window", type=float, default=300.0, help="latency timeline window (trace seconds)")
+    parser.add_argument("--timeout", type=float, default=900.0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--out", default="", help="result file (default benchmarks/results/<ts>_<commit>_replay.json)")
+    parser.add_argument("--compare", default="", help="baseline result JSON to diff against")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch vault")
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be > 0")
+
+    result = replay(args)
+    out = Path(args.out) if args.out else RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{result['commit']}_replay_{result['params']['notes']}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, default=str), encoding="utf-8")
+
+    print(summary(result))
+    print(f"Results: {out}")
+    if args.compare:
+        print()
+        print(compare(result, json.loads(Path(args.compare).read_text(encoding="utf-8"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+run_benchmark.py – End-to-end throughput benchmark for the Bronze pipeline
+
+Builds a synthetic vault (synthetic_vault.py) in a scratch directory, runs
+the real Orchestrator against it with the stub LLM provider and a stub
+email MCP server, and reports:
+
+  - items/sec        Needs_Action note → plan applied (Done / Pending_Approval)
+  - latency          p50 / p95 / p99 end-to-end per note
+  - hitl             approving every Pending_Approval note → Done, MCP calls
+  - resources        peak RSS, read/write syscalls and context switches
+                     (Linux /proc/self/io + /proc/self/status), threads
+  - component stats  worker pool, triage batching, LLM cache, Plan/Dashboard writes
+
+Modes:
+  backlog  all notes exist before startup — measures the startup drain;
+           latency is counted from the moment the pipeline starts
+  stream   notes are written while running, at --rate notes/s (0 = as fast
+           as possible) — latency is counted from each note's write
+
+Results are written as JSON (default benchmarks/results/) tagged with the git
+commit, so runs can be compared across commits:
+
+    cd BronzeTier
+    python -m benchmarks.run_benchmark --notes 10000
+    python -m benchmarks.run_benchmark --notes 1000 --mode stream --rate 200 --llm-latency 0.3
+    python -m benchmarks.run_benchmark --notes 10000 --compare benchmarks/results/<baseline>.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from benchmarks.synthetic_vault import SyntheticNotes, parse_mix, populate, write_note
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Knobs the benchmark pins unless the caller's environment already sets them
+_BENCH_ENV = {
+    "LLM_TPM": "100000000",           # the stub is free — don't let the limiter be the bottleneck
+    "LLM_RPM": "1000000",
+    "BACKLOG_DRAIN_RATE": "0",
+    "METRICS_PORT": "0",
+    "VAULT_FSYNC": "off",
+}
+
+# Headline numbers for --compare: (path in results, higher is better)
+_COMPARE_KEYS = (
+    ("throughput.items_per_s", True),
+    ("latency_ms.p50", False),
+    ("latency_ms.p95", False),
+    ("latency_ms.p99", False),
+    ("resources.peak_rss_mb", False),
+    ("resources.syscalls_read", False),
+    ("resources.syscalls_write", False),
+    ("startup_s", False),
+)
+
+
+# ── Stub MCP server ────────────────────────────────────────────────────────────
+class _StubMCPHandler(BaseHTTPRequestHandler):
+    """Accepts any POST (e.g. /send) like the email MCP server, and counts it."""
+    requests_seen = 0
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        with self._lock:
+            type(self).requests_seen += 1
+        body = b'{"status": "sent", "stub": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_mcp() -> ThreadingHTTPServer:
+    handler = type("StubMCPHandler", (_StubMCPHandler,), {"requests_seen": 0, "_lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="stub-mcp").start()
+    return server
+
+
+# ── Process counters ───────────────────────────────────────────────────────────
+def _read_proc(path: Path) -> dict[str, int]:
+    """/proc 'key: value' lines as ints; {} where unavailable."""
+    values = {}
+    try:
+        for line in path.read_text().splitlines():
+            key, _, value = line.partition(":")
+            first = value.split()
+            if first and first[0].isdigit():
+                values[key.strip()] = int(first[0])
+    except OSError:
+        pass
+    return values
+
+
+def process_counters() -> dict[str, Optional[int]]:
+    io = _read_proc(Path("/proc/self/io"))                  # whole process
+    status: dict[str, int] = {}                             # per thread — summed
+    for task in Path("/proc/self/task").glob("*"):
+        for key, value in _read_proc(task / "status").items():
+            status[key] = status.get(key, 0) + value
+    return {
+        "syscalls_read": io.get("syscr"),
+        "syscalls_write": io.get("syscw"),
+        "bytes_read": io.get("rchar"),
+        "bytes_written": io.get("wchar"),
+        "ctx_switches_voluntary": status.get("voluntary_ctxt_switches"),
+        "ctx_switches_involuntary": status.get("nonvoluntary_ctxt_switches"),
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _delta(after: dict, before: dict) -> dict:
+    return {k: (after[k] - before[k]) if after.get(k) is not None and before.get(k) is not None else None
+            for k in after}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _git_info() -> dict:
+    def git(*args) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=_BRONZE_DIR, capture_output=True,
+                                  text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def timed_orchestrator(orchestrator_module, finished: dict[str, float], lock: threading.Lock) -> type:
+    """Orchestrator subclass that records when each note's plan was applied."""
+    class BenchOrchestrator(orchestrator_module.Orchestrator):
+        def _apply_plan(self, path: Path, plan: dict):
+            super()._apply_plan(path, plan)
+            with lock:
+                finished[path.name] = time.monotonic()
+
+    return BenchOrchestrator
+
+
+# ── Benchmark ──────────────────────────────────────────────────────────────────
+def run(args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="ai_employee_bench_"))
+    vault = workdir / "Vault"
+    mix = parse_mix(args.mix) or None
+    mcp = start_stub_mcp()
+
+    os.environ.update(VAULT_PATH=str(vault), LLM_PROVIDER="stub",
+                      LLM_STUB_LATENCY=str(args.llm_latency),
+                      EMAIL_MCP_URL=f"http://127.0.0.1:{mcp.server_address[1]}",
+                      ERROR_LOG_PATH=str(workdir / "logs" / "errors.jsonl"))
+    for key, value in _BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    cwd = os.getcwd()
+    os.chdir(workdir)                  # orchestrator.log and friends stay in the scratch dir
+    try:
+        gen_started = time.monotonic()
+        per_kind: dict[str, int] = {}
+        if args.mode == "backlog":
+            per_kind = populate(vault, args.notes, mix, args.seed, args.dup_rate)
+        generate_s = time.monotonic() - gen_started
+
+        # Imported late: module-level config reads the environment set above
+        import Orchestrator as orchestrator_module
+        logging.getLogger().setLevel(getattr(logging, args.log_level.upper()))
+
+        finished: dict[str, float] = {}
+        finished_lock = threading.Lock()
+        BenchOrchestrator = timed_orchestrator(orchestrator_module, finished, finished_lock)
+
+        counters_before = process_counters()
+        startup_started = time.monotonic()
+        orch = BenchOrchestrator()
+        orch.start_vault_index()
+        orch.start_needs_action_monitor()
+        startup_s = time.monotonic() - startup_started
+
+        written: dict[str, float] = {}
+        started = time.monotonic()
+        if args.mode == "backlog":
+            orch.start_backlog_drain()
+        else:
+            per_kind = _stream_notes(orch.needs_action, args, mix, written)
+
+        # Wait until every note has been planned (or quarantined)
+        deadline = started + args.timeout
+        while time.monotonic() < deadline:
+            with finished_lock:
+                done = len(finished)
+            if done + orch.quarantine.count >= args.notes:
+                break
+            time.sleep(0.02)
+        elapsed = time.monotonic() - started
+        health = orch.health_check()
+
+        # HITL: approve everything that went to Pending_Approval
+        hitl = _approve_all(orch, mcp) if args.approve else {}
+        counters_after = process_counters()
+
+        with finished_lock:
+            latencies = sorted((t - written.get(name, started)) * 1000 for name, t in finished.items())
+        orch.shutdown()
+        mcp.shutdown()
+
+        completed = len(latencies)
+        return {
+            "benchmark": "bronze_pipeline",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            **_git_info(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                "notes": args.notes, "mode": args.mode, "rate": args.rate, "mix": mix or "default",
+                "dup_rate": args.dup_rate, "seed": args.seed, "llm_latency_s": args.llm_latency,
+                "env": {k: os.environ.get(k) for k in (*_BENCH_ENV, "WORKER_POOL_SIZE", "WORKER_MAX_PENDING",
+                                                       "TRIAGE_BATCH_SIZE", "TRIAGE_BATCH_WAIT",
+                                                       "LLM_MAX_CONCURRENCY", "LLM_CACHE_ENABLED")},
+            },
+            "notes_per_kind": per_kind,
+            "generate_s": round(generate_s, 3),
+            "startup_s": round(startup_s, 3),
+            "throughput": {
+                "completed": completed,
+                "quarantined": orch.quarantine.count,
+                "timed_out": completed + orch.quarantine.count < args.notes,
+                "elapsed_s": round(elapsed, 3),
+                "items_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+            },
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 1),
+                "p95": round(percentile(latencies, 95), 1),
+                "p99": round(percentile(latencies, 99), 1),
+                "max": round(latencies[-1], 1) if latencies else 0.0,
+                "mean": round(sum(latencies) / completed, 1) if completed else 0.0,
+            },
+            "hitl": hitl,
+            "resources": {
+                "peak_rss_mb": peak_rss_mb(),
+                "threads": threading.active_count(),
+                **_delta(counters_after, counters_before),
+            },
+            "components": {k: health[k] for k in ("worker_pool", "triage", "llm_cache", "reasoning",
+                                                  "plan_writer", "dashboard", "prompt_build")},
+        }
+    finally:
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"Scratch vault kept at {workdir}")
+
+
+def _stream_notes(needs_action: Path, args, mix: Optional[dict], written: dict[str, float]) -> dict[str, int]:
+    """Write notes while the Orchestrator runs, paced at args.rate notes/s."""
+    notes = SyntheticNotes(mix, args.seed, args.dup_rate)
+    per_kind: dict[str, int] = {}
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    next_at = time.monotonic()
+    for i in range(args.notes):
+        name, content, kind = notes.note(i)
+        written[name] = time.monotonic()
+        write_note(needs_action, name, content, kind)
+        per_kind[kind] = per_kind.get(kind, 0) + 1
+        if interval:
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+    return per_kind
+
+
+def _approve_all(orch, mcp: ThreadingHTTPServer) -> dict:
+    """Move every approval request to /Approved and time the HITL pass (MCP dispatch → Done)."""
+    pending = list(orch.pending_approval.glob("*.md"))
+    started = time.monotonic()
+    for note in pending:
+        note.rename(orch.approved / note.name)
+    orch._process_approved()
+    elapsed = time.monotonic() - started
+    return {
+        "approved": len(pending),
+        "archived": sum(1 for r in orch.done_archive.month_index() if r["outcome"] == "approved"),
+        "elapsed_s": round(elapsed, 3),
+        "items_per_s": round(len(pending) / elapsed, 2) if elapsed and pending else 0.0,
+        "mcp_requests": mcp.RequestHandlerClass.requests_seen,
+    }
+
+
+# ── Reporting ──────────────────────────────────────────────────────────────────
+def _lookup(result: dict, dotted: str):
+    value = result
+    for key in dotted.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(current: dict, baseline: dict) -> str:
+    lines = []
+    for key in ("notes", "mode", "rate", "llm_latency_s"):
+        if baseline.get("params", {}).get(key) != current["params"].get(key):
+            lines.append(f"note: {key} differs ({baseline.get('params', {}).get(key)} → "
+                         f"{current['params'].get(key)}) — numbers are not directly comparable")
+    lines += [f"{'metric':<28} {'baseline':>12} {'current':>12} {'change':>9}",
+             f"{'':<28} {baseline.get('commit', '?'):>12} {current.get('commit', '?'):>12}"]
+    for key, higher_is_better in _COMPARE_KEYS:
+        old, new = _lookup(baseline, key), _lookup(current, key)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        worse = change < 0 if higher_is_better else change > 0
+        flag = " ⚠" if worse and abs(change) >= 10 else ""
+        lines.append(f"{key:<28} {old:>12} {new:>12} {change:>+8.1f}%{flag}")
+    return "\n".join(lines)
+
+
+def summary(result: dict) -> str:
+    t, lat, res = result["throughput"], result["latency_ms"], result["resources"]
+    lines = [
+        f"{result['params']['notes']} notes ({result['params']['mode']}) @ {result['commit']}"
+        f"{' (dirty)' if result['dirty'] else ''}",
+        f"  throughput : {t['items_per_s']} items/s ({t['completed']} done, {t['quarantined']} quarantined"
+        f"{', TIMED OUT' if t['timed_out'] else ''}) in {t['elapsed_s']}s; startup {result['startup_s']}s",
+        f"  latency    : p50 {lat['p50']}ms  p95 {lat['p95']}ms  p99 {lat['p99']}ms  max {lat['max']}ms",
+        f"  resources  : peak RSS {res['peak_rss_mb']} MB, syscalls r/w {res['syscalls_read']}/"
+        f"{res['syscalls_write']}, threads {res['threads']}",
+    ]
+    if result["hitl"]:
+        h = result["hitl"]
+        lines.append(f"  hitl       : {h['approved']} approved in {h['elapsed_s']}s, "
+                     f"{h['mcp_requests']} MCP request(s)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end Bronze pipeline benchmark (stub LLM)")
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--mode", choices=("backlog", "stream"), default="backlog")
+    parser.add_argument("--rate", type=float, default=0.0, help="stream mode: notes/s (0 = unpaced)")
+    parser.add_argument("--mix", default="", help="e.g. email=0.4,whatsapp=0.3,finance=0.1,file_drop=0.2")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="fraction of re-sent duplicate notes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per LLM call")
+    parser.add_argument("--no-approve", dest="approve", action="store_false",
+                        help="skip the HITL approval pass")
+    parser.add_argument("--timeout", type=float, default=900.0)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--out", default="", help="result file (default benchmarks/results/<ts>_<commit>.json)")
+    parser.add_argument("--compare", default="", help="baseline result JSON to diff against")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch vault")
+    args = parser.parse_args()
+
+    result = run(args)
+    out = Path(args.out) if args.out else RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{result['commit']}_{args.mode}_{args.notes}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, default=str), encoding="utf-8")
+
+    print(summary(result))
+    print(f"Results: {out}")
+    if args.compare:
+        print()
+        print(compare(result, json.loads(Path(args.compare).read_text(encoding="utf-8"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+synthetic_vault.py – Realistic synthetic Needs_Action notes for benchmarks
+
+Generates email, WhatsApp, finance and file_drop notes with exactly the
+frontmatter and body layout the watchers write (GmailWatcher,
+WhatsAppWatcher, FinanceWatcher._flag_large_transaction, DropFolderHandler),
+so the Orchestrator sees the same note sizes, priorities and approval mix
+as in production.
+
+  - deterministic for a given seed
+  - a fraction of emails mention invoices/payments (→ approval path);
+    flagged finance notes always need approval
+  - dup_rate re-sends an earlier note's content under a new name, like a
+    re-delivered message (→ LLM cache hits)
+
+    python -m benchmarks.synthetic_vault --notes 10000 --out ./BenchVault
+"""
+
+import argparse
+import random
+import string
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from vault_io import atomic_write_bytes, atomic_write_text
+
+NOTE_KINDS = ("email", "whatsapp", "finance", "file_drop")
+DEFAULT_MIX = {"email": 0.4, "whatsapp": 0.3, "finance": 0.1, "file_drop": 0.2}
+
+_SENDERS = ("Alice Chen <alice@acme.io>", "Bob Okafor <bob@northwind.com>", "Billing <billing@vendor.net>",
+            "Priya Shah <priya@clientco.com>", "noreply@github.com", "Marco Rossi <marco@studio.it>")
+_SUBJECTS = ("Project update", "Meeting next week?", "Quick question about the proposal",
+             "Re: deliverables", "Weekly report", "Feedback on the draft", "Introduction")
+_APPROVAL_SUBJECTS = ("Invoice #{n} due", "Payment reminder", "Refund request #{n}", "Contract renewal")
+_CONTACTS = ("Ahmed Khan", "Sara Lopez", "Mom", "Team Lead", "Client - Zeta", "Landlord")
+_PAYEES = ("AWS EMEA", "Office Rent", "Contractor Payout", "Google Workspace", "Equipment Lease")
+_FILES = ("report.pdf", "scan.png", "notes.txt", "contract.docx", "statement.csv", "photo.jpg")
+_WORDS = ("please", "review", "the", "attached", "schedule", "budget", "client", "update", "thanks",
+          "tomorrow", "deadline", "call", "draft", "numbers", "team", "shipping", "follow", "up")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(6, 16)) for _ in range(sentences))
+
+
+def _uid(rng: random.Random, n: int = 16) -> str:
+    return "".join(rng.choice(string.hexdigits.lower()) for _ in range(n))
+
+
+# ── Note templates (mirror the watchers' create_action_file output) ────────────
+def email_note(i: int, rng: random.Random, now: datetime) -> tuple[str, str]:
+    message_id = _uid(rng)
+    if rng.random() < 0.15:
+        subject = rng.choice(_APPROVAL_SUBJECTS).format(n=1000 + i)
+    else:
+        subject = rng.choice(_SUBJECTS)
+    sender = rng.choice(_SENDERS)
+    received = now - timedelta(minutes=rng.randint(0, 600))
+    content = f"""---
+type: email
+from: {sender}
+subject: {subject}
+received: {received.isoformat()}
+priority: high
+status: pending
+message_id: {message_id}
+---
+
+# 📧 Email: {subject}
+
+**From:** {sender}
+**Subject:** {subject}
+**Received:** {received.strftime('%a, %d %b %Y %H:%M:%S +0000')}
+
+## Email Content
+{_paragraph(rng, rng.randint(1, 4))}
+
+## Suggested Actions
+- [ ] Reply to sender
+- [ ] Forward to relevant party
+- [ ] Archive after processing
+"""
+    return f"EMAIL_{message_id}.md", content
+
+
+def whatsapp_note(i: int, rng: random.Random, now: datetime) -> tuple[str, str]:
+    contact = rng.choice(_CONTACTS)
+    safe_name = contact.replace(" ", "_").replace("/", "-")
+    received = now - timedelta(seconds=i)
+    content = f"""---
+type: whatsapp
+contact: {contact}
+received: {received.isoformat()}
+priority: high
+status: pending
+source: whatsapp_web_readonly
+---
+
+## Message Preview
+{_sentence(rng, rng.randint(4, 30))}
+
+## ⚠️ Read-Only Mode
+This agent does NOT auto-reply to WhatsApp messages.
+Review Plan.md for suggested reply, then send manually.
+
+## Suggested Actions
+- [ ] Review message from {contact}
+- [ ] Check Plan.md for suggested reply
+- [ ] Reply manually in WhatsApp
+"""
+    # The watcher's timestamp is per second; the index keeps synthetic names unique
+    return f"WHATSAPP_{safe_name}_{received.strftime('%Y%m%d_%H%M%S')}_{i}.md", content
+
+
+def finance_note(i: int, rng: random.Random, now: datetime) -> tuple[str, str]:
+    description = rng.choice(_PAYEES)
+    amount = -round(rng.uniform(500, 20000), 2)
+    day = (now - timedelta(days=rng.randint(0, 27))).strftime("%Y-%m-%d")
+    balance = round(rng.uniform(1000, 90000), 2)
+    safe_desc = "".join(c if c.isalnum() else "_" for c in description)[:40]
+    content = f"""---
+type: payment
+action: payment
+amount: {amount}
+recipient: {description}
+date: {day}
+status: pending
+priority: high
+---
+
+# ⚠️ Large Transaction Flagged
+
+**Amount:** {amount}
+**Description:** {description}
+**Date:** {day}
+**Balance After:** {balance}
+
+> This transaction exceeds the approval threshold of $500.00.
+
+## Actions Required
+- [ ] Verify this transaction is expected
+- [ ] Move to `/Approved` if OK, `/Rejected` if suspicious
+- [ ] Contact bank if unrecognised
+
+## To Approve
+Move this file to `/Approved` folder.
+
+## To Reject
+Move this file to `/Rejected` folder.
+"""
+    return f"FINANCE_{now.strftime('%Y%m%d_%H%M%S')}_{i}_{safe_desc}.md", content
+
+
+def file_drop_note(i: int, rng: random.Random, now: datetime) -> tuple[str, str]:
+    stem, ext = rng.choice(_FILES).rsplit(".", 1)
+    original = f"{stem}_{i}.{ext}"
+    size = rng.randint(1_000, 5_000_000)
+    content = f"""---
+type: file_drop
+original_name: {original}
+size: {size}
+received: {now.isoformat()}
+status: pending
+priority: normal
+---
+
+# 📂 New File Drop: {original}
+
+**File:** `{original}`
+**Size:** {size:,} bytes
+**Detected:** {now.strftime('%Y-%m-%d %H:%M:%S')}
+**Copied to:** `Needs_Action/FILE_{original}`
+
+## Suggested Actions
+- [ ] Review the file content
+- [ ] Process or forward as needed
+- [ ] Move this note to `/Done` when complete
+"""
+    return f"FILE_{stem}_{i}.md", content
+
+
+TEMPLATES = {
+    "email": email_note,
+    "whatsapp": whatsapp_note,
+    "finance": finance_note,
+    "file_drop": file_drop_note,
+}
+
+
+# ── Generation ─────────────────────────────────────────────────────────────────
+class SyntheticNotes:
+    """Deterministic stream of (filename, content, kind) for a note mix."""
+
+    def __init__(self, mix: Optional[dict] = None, seed: int = 42, dup_rate: float = 0.0):
+        self.mix = {k: v for k, v in (mix or DEFAULT_MIX).items() if v > 0}
+        unknown = set(self.mix) - set(TEMPLATES)
+        if unknown:
+            raise ValueError(f"unknown note kinds: {', '.join(sorted(unknown))}")
+        self.rng = random.Random(seed)
+        self.dup_rate = dup_rate
+        self.now = datetime.now()
+        self._kinds = list(self.mix)
+        self._weights = [self.mix[k] for k in self._kinds]
+        self._recent: list[tuple[str, str]] = []      # (kind, content) for re-sends
+
+    def note(self, i: int) -> tuple[str, str, str]:
+        if self._recent and self.rng.random() < self.dup_rate:
+            kind, content = self.rng.choice(self._recent)
+            return f"{kind.upper()}_resent_{i}.md", content, kind
+        kind = self.rng.choices(self._kinds, self._weights)[0]
+        name, content = TEMPLATES[kind](i, self.rng, self.now)
+        if len(self._recent) < 1000:
+            self._recent.append((kind, content))
+        return name, content, kind
+
+
+def write_note(needs_action: Path, name: str, content: str, kind: str):
+    """Write like the watchers do (atomic); file drops also get their FILE_ copy."""
+    if kind == "file_drop" and "_resent_" not in name:
+        original = content.split("original_name: ", 1)[1].split("\n", 1)[0]
+        atomic_write_bytes(needs_action / f"FILE_{original}", b"\0" * 512)
+    atomic_write_text(needs_action / name, content, encoding="utf-8")
+
+
+def populate(vault: Path, count: int, mix: Optional[dict] = None, seed: int = 42,
+             dup_rate: float = 0.0) -> dict[str, int]:
+    """Write *count* notes into vault/Needs_Action; returns notes per kind."""
+    needs_action = Path(vault) / "Needs_Action"
+    needs_action.mkdir(parents=True, exist_ok=True)
+    notes = SyntheticNotes(mix, seed, dup_rate)
+    per_kind: dict[str, int] = {}
+    for i in range(count):
+        name, content, kind = notes.note(i)
+        write_note(needs_action, name, content, kind)
+        per_kind[kind] = per_kind.get(kind, 0) + 1
+    return per_kind
+
+
+def parse_mix(text: str) -> dict:
+    """'email=0.5,whatsapp=0.5' → {"email": 0.5, "whatsapp": 0.5}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic vault backlog")
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--out", default="./BenchVault", help="vault root (notes go to Needs_Action/)")
+    parser.add_argument("--mix", default="", help="e.g. email=0.4,whatsapp=0.3,finance=0.1,file_drop=0.2")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dup-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    per_kind = populate(Path(args.out), args.notes, parse_mix(args.mix) or None, args.seed, args.dup_rate)
+    print(f"Wrote {args.notes} notes to {Path(args.out) / 'Needs_Action'}: {per_kind}")
+
+
+if __name__ == "__main__":
+    main()
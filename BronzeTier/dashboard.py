@@ -0,0 +1,258 @@
+"""
+dashboard.py – Debounced Dashboard.md renderer fed from in-memory state
+
+Rewriting Dashboard.md after every processed / approved / rejected item means
+hundreds of full rewrites during a burst — and a git commit each for
+VaultSync. DashboardRenderer instead:
+
+  - keeps folder counts and a "latest 5" list per folder in memory, updated
+    from VaultIndex change events (no globbing, no stat() per file)
+  - reads the balance and month-to-date totals from the ledger header
+    (Accounting/ledger_header.json), re-loaded only when it changes
+  - coalesces update requests: at most one write per DASHBOARD_DEBOUNCE_SECONDS
+  - skips the write entirely when nothing but the timestamp would change
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from ledger import HEADER_FILE, format_money, load_header, month_totals
+from vault_index import VaultIndex
+from vault_io import atomic_write_text
+
+log = logging.getLogger("Dashboard")
+
+DASHBOARD_DEBOUNCE_SECONDS = float(os.getenv("DASHBOARD_DEBOUNCE_SECONDS", "5"))
+LATEST_N = 5
+TRACKED_FOLDERS = ("Needs_Action", "Pending_Approval", "Done")
+
+
+class DashboardRenderer:
+    """
+    *health()* returns the live bits of the System Health table:
+    {"watcher_threads": int, "gmail_ready": bool, "model": str}.
+    """
+
+    def __init__(self, vault: Path, index: VaultIndex, health: Callable[[], dict],
+                 debounce: float = DASHBOARD_DEBOUNCE_SECONDS):
+        self.vault = Path(vault)
+        self.path = self.vault / "Dashboard.md"
+        self.index = index
+        self.health = health
+        self.debounce = max(0.0, debounce)
+
+        self._lock = threading.Lock()
+        self._counts: dict[str, int] = {}
+        self._latest: dict[str, list[tuple[float, str]]] = {}     # newest first
+        self._stale: set[str] = set()                              # latest-N needs a refill
+        self._ledger_key: Optional[tuple] = None
+        self._ledger: Optional[dict] = None
+
+        self._timer: Optional[threading.Timer] = None
+        self._last_write = 0.0
+        self._last_digest = ""
+        self._stats = {"requests": 0, "renders": 0, "writes": 0, "skipped_unchanged": 0}
+
+        self.reload()
+        index.add_listener(self._on_index_change)
+
+    # ── State ──────────────────────────────────────────────────────────────────
+    def reload(self):
+        """Re-seed counters and latest lists from the index (after reconcile)."""
+        counts = self.index.counts()
+        latest = {
+            folder: [(n["mtime"], n["name"]) for n in self.index.latest(folder, LATEST_N)]
+            for folder in TRACKED_FOLDERS
+        }
+        with self._lock:
+            self._counts = {folder: counts.get(folder, 0) for folder in TRACKED_FOLDERS}
+            self._latest = latest
+            self._stale.clear()
+
+    def _on_index_change(self, old_folder: Optional[str], new_folder: Optional[str],
+                         name: str, mtime: Optional[float]):
+        if old_folder not in self._counts and new_folder not in self._counts:
+            return
+        with self._lock:
+            if old_folder in self._counts and old_folder != new_folder:
+                self._counts[old_folder] -= 1
+            if new_folder in self._counts and old_folder != new_folder:
+                self._counts[new_folder] += 1
+            if old_folder in self._latest:
+                entries = self._latest[old_folder]
+                kept = [e for e in entries if e[1] != name]
+                if len(kept) != len(entries):
+                    self._latest[old_folder] = kept
+                    if old_folder != new_folder:
+                        self._stale.add(old_folder)    # a slot opened up — refill lazily
+            if new_folder in self._latest and mtime is not None:
+                entries = self._latest[new_folder]
+                entries.append((mtime, name))
+                entries.sort(reverse=True)
+                del entries[LATEST_N:]
+        self.request_update()
+
+    def _latest_rows(self, folder: str) -> list[tuple[float, str]]:
+        with self._lock:
+            stale = folder in self._stale
+        if stale:
+            fresh = [(n["mtime"], n["name"]) for n in self.index.latest(folder, LATEST_N)]
+            with self._lock:
+                self._latest[folder] = fresh
+                self._stale.discard(folder)
+        with self._lock:
+            return list(self._latest[folder])
+
+    def _read_ledger(self) -> Optional[dict]:
+        """Ledger header (balance, per-month totals), re-read only when it changes."""
+        try:
+            st = os.stat(self.vault / "Accounting" / HEADER_FILE)
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        if key != self._ledger_key:
+            self._ledger = load_header(self.vault / "Accounting")
+            self._ledger_key = key
+        return self._ledger
+
+    # ── Scheduling ─────────────────────────────────────────────────────────────
+    def request_update(self):
+        """Ask for a refresh; coalesced into at most one write per debounce window."""
+        with self._lock:
+            self._stats["requests"] += 1
+            if self._timer is not None:
+                return
+            delay = max(0.0, self._last_write + self.debounce - time.monotonic())
+            self._timer = threading.Timer(delay, self._timer_fired)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timer_fired(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.write()
+        except Exception as exc:
+            log.warning("Dashboard update failed: %s", exc)
+
+    def flush(self):
+        """Write pending changes now (shutdown)."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+            self.write()
+
+    # ── Rendering ──────────────────────────────────────────────────────────────
+    def write(self) -> bool:
+        """Render and write Dashboard.md; returns False if the content was unchanged."""
+        body = self.render_body()
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._stats["renders"] += 1
+            self._last_write = time.monotonic()
+            if digest == self._last_digest:
+                self._stats["skipped_unchanged"] += 1
+                return False
+            self._last_digest = digest
+            self._stats["writes"] += 1
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        header = f"# 🤖 AI Employee Dashboard\n> **Last updated:** {now} (auto-updated by Orchestrator)\n"
+        atomic_write_text(self.path, header + body, encoding="utf-8")
+        log.info("Dashboard.md updated at %s", now)
+        return True
+
+    def render_body(self) -> str:
+        """Everything below the timestamp line (compared to detect no-op writes)."""
+        with self._lock:
+            counts = dict(self._counts)
+
+        na_rows = "\n".join(
+            f"| {Path(name).stem[:50]} | 🔴 | {datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')} |"
+            for mtime, name in self._latest_rows("Needs_Action")
+        ) or "| — | — | — |"
+
+        pa_rows = "\n".join(
+            f"| {Path(name).stem[:50]} | — | pending |"
+            for _, name in self._latest_rows("Pending_Approval")
+        ) or "| — | — | — |"
+
+        done_rows = "\n".join(
+            f"| {Path(name).stem[:50]} | {'✅ approved' if name.startswith('APPROVED') else '❌ rejected' if name.startswith('REJECTED') else '✔ processed'} |"
+            for _, name in self._latest_rows("Done")
+        ) or "| — | — |"
+
+        ledger = self._read_ledger()
+        mtd = month_totals(ledger)
+        balance_date = f" (as of {ledger['balance_date']})" if ledger and ledger.get("balance_date") else ""
+
+        health = self.health()
+        thread_count = health.get("watcher_threads", 0)
+        health_emoji = "🟢" if thread_count > 0 else "🔴"
+
+        return f"""
+---
+
+## 💰 Bank Balance
+| Account | Balance | Source |
+|---------|---------|--------|
+| Business Checking | {format_money((ledger or {}).get("balance"))}{balance_date} | Accounting/ledger |
+
+| Month to date | Income | Expenses | Net | Transactions |
+|---------------|--------|----------|-----|--------------|
+| {datetime.now().strftime("%B %Y")} | {format_money(mtd["income"])} | {format_money(mtd["expenses"])} | {format_money(mtd["net"])} | {mtd["count"]} |
+
+---
+
+## 📬 Inbox Summary
+| Folder | Count |
+|--------|-------|
+| 🔴 Needs Action | {counts["Needs_Action"]} |
+| ⏳ Pending Approval | {counts["Pending_Approval"]} |
+| ✅ Done (total) | {counts["Done"]} |
+
+---
+
+## 🔴 Needs Action (latest 5)
+| File | Urgency | Detected |
+|------|---------|----------|
+{na_rows}
+
+---
+
+## ⏳ Pending Your Approval (latest 5)
+| File | Amount | Status |
+|------|--------|--------|
+{pa_rows}
+
+---
+
+## ✅ Recently Completed (latest 5)
+| File | Outcome |
+|------|---------|
+{done_rows}
+
+---
+
+## 🏥 System Health
+| Component | Status |
+|-----------|--------|
+| Orchestrator | {health_emoji} Running ({thread_count} watcher threads) |
+| Gmail Watcher | {'🟢 Active' if health.get("gmail_ready") else '🟡 No credentials'} |
+| WhatsApp Webhook | 🟢 Meta Cloud API (port 3000) |
+| Finance Watcher | 🟢 Active |
+| Groq API | 🟢 {health.get("model", "")} |
+
+---
+*Single writer: Local Orchestrator | Vault: {self.vault.resolve()}*
+"""
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "debounce_s": self.debounce, "counts": dict(self._counts)}
@@ -0,0 +1,240 @@
+"""
+done_archive.py – Date-sharded /Done archive with a compact per-month index
+
+/Done only ever grows. With every finished item in one flat directory, each
+listing, glob and watchdog rescan of it gets slower the longer a deployment
+runs. Finished notes now go to a shard for the month they were archived in:
+
+  Done/
+    2026/
+      10/
+        index.jsonl      one line per archived file:
+                         {"name", "outcome", "archived", "modified"}
+        APPROVED_APPROVAL_REQUIRED_x.md
+        EMAIL_18c2f….md
+    OLD_FLAT_NOTE.md     ← pre-sharding files, moved into the shard of their
+                           mtime by the background compactor
+
+  - every writer (Orchestrator, hitl_orchestrator, ClaimOrchestrator, local
+    agent, LinkedIn publisher) archives through DoneArchive.archive()/write()
+  - the month index answers "what finished in October, and how" without
+    listing the shard; outcome comes from the name prefix (APPROVED_,
+    REJECTED_, FAILED_, PUBLISHED_) unless the caller passes one
+  - a directory never holds more than one month of notes, so listing cost
+    stays flat; the vault index tracks shards as the "Done" folder
+  - the compactor migrates DONE_COMPACT_BATCH flat files per pass, every
+    DONE_COMPACT_INTERVAL s (immediately again while a backlog remains)
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from vault_io import atomic_write_text, is_temp_name
+
+log = logging.getLogger("DoneArchive")
+
+DONE_COMPACT_INTERVAL = float(os.getenv("DONE_COMPACT_INTERVAL", "300"))
+DONE_COMPACT_BATCH = int(os.getenv("DONE_COMPACT_BATCH", "500"))
+INDEX_FILE = "index.jsonl"
+
+_OUTCOME_PREFIXES = (
+    ("APPROVED_", "approved"),
+    ("REJECTED_", "rejected"),
+    ("FAILED_", "failed"),
+    ("PUBLISHED_", "published"),
+)
+
+
+def outcome_for(name: str) -> str:
+    """Outcome implied by an archived file name ('done' if no known prefix)."""
+    for prefix, outcome in _OUTCOME_PREFIXES:
+        if name.startswith(prefix):
+            return outcome
+    return "done"
+
+
+def _month_key(when: datetime) -> str:
+    return when.strftime("%Y-%m")
+
+
+class DoneArchive:
+    def __init__(self, vault_path: Path | str):
+        self.done = Path(vault_path) / "Done"
+        self.done.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"archived": 0, "migrated": 0, "compactions": 0, "errors": 0}
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+
+    # ── Shards ─────────────────────────────────────────────────────────────────
+    def shard(self, when: Optional[datetime] = None) -> Path:
+        when = when or datetime.now()
+        path = self.done / when.strftime("%Y") / when.strftime("%m")
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def destination(self, name: str, when: Optional[datetime] = None) -> Path:
+        """Free path for *name* in the shard for *when* (timestamp suffix on collision)."""
+        when = when or datetime.now()
+        dest = self.shard(when) / name
+        if dest.exists():
+            stem, suffix = os.path.splitext(name)
+            dest = dest.with_name(f"{stem}_{datetime.now().strftime('%H%M%S%f')}{suffix}")
+        return dest
+
+    # ── Write ──────────────────────────────────────────────────────────────────
+    def archive(self, src: Path | str, name: Optional[str] = None, outcome: Optional[str] = None,
+                when: Optional[datetime] = None) -> Path:
+        """Move *src* into this month's shard (as *name*) and record it. Returns the new path."""
+        src = Path(src)
+        name = name or src.name
+        when = when or datetime.now()
+        try:
+            modified = src.stat().st_mtime
+        except OSError:
+            modified = None
+        dest = self.destination(name, when)
+        shutil.move(str(src), str(dest))           # a rename within the vault
+        self._record(dest, outcome or outcome_for(name), when, modified)
+        with self._lock:
+            self._stats["archived"] += 1
+        return dest
+
+    def write(self, name: str, text: str, outcome: Optional[str] = None,
+              when: Optional[datetime] = None) -> Path:
+        """Write a finished note straight into the archive (atomic) and record it."""
+        when = when or datetime.now()
+        dest = atomic_write_text(self.destination(name, when), text, encoding="utf-8")
+        self._record(dest, outcome or outcome_for(name), when, when.timestamp())
+        with self._lock:
+            self._stats["archived"] += 1
+        return dest
+
+    def _record(self, dest: Path, outcome: str, archived: datetime, modified: Optional[float]):
+        record = {
+            "name": dest.name,
+            "outcome": outcome,
+            "archived": archived.isoformat(timespec="seconds"),
+            "modified": datetime.fromtimestamp(modified).isoformat(timespec="seconds") if modified else "",
+        }
+        try:
+            with self._lock, (dest.parent / INDEX_FILE).open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as exc:
+            log.warning("Could not update Done index for %s: %s", dest.name, exc)
+
+    # ── Read ───────────────────────────────────────────────────────────────────
+    def months(self) -> list[str]:
+        """Archived months, oldest first ("YYYY-MM") — lists shard dirs only."""
+        found = []
+        for year in self.done.iterdir():
+            if year.is_dir() and year.name.isdigit():
+                found += [f"{year.name}-{m.name}" for m in year.iterdir() if m.is_dir() and m.name.isdigit()]
+        return sorted(found)
+
+    def month_index(self, month: Optional[str] = None) -> list[dict]:
+        """Index records for *month* ("YYYY-MM", default: this month)."""
+        month = month or _month_key(datetime.now())
+        year, mm = month.split("-")
+        records = []
+        try:
+            with (self.done / year / mm / INDEX_FILE).open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+
+    def find(self, name: str, months_back: int = 1) -> Optional[Path]:
+        """Locate a recently archived *name*: flat Done, this month and *months_back* earlier."""
+        candidates = [self.done / name]
+        year, month = datetime.now().year, datetime.now().month
+        for _ in range(months_back + 1):
+            candidates.append(self.done / f"{year:04d}" / f"{month:02d}" / name)
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return next((p for p in candidates if p.exists()), None)
+
+    # ── Compaction (flat → shards) ─────────────────────────────────────────────
+    def _flat_files(self, limit: int) -> list[os.DirEntry]:
+        files = []
+        with os.scandir(self.done) as entries:
+            for entry in entries:
+                if entry.is_file() and not is_temp_name(entry.name):
+                    files.append(entry)
+                    if len(files) >= limit:
+                        break
+        return files
+
+    def compact(self, limit: int = DONE_COMPACT_BATCH,
+                on_moved: Optional[Callable[[Path, Path], None]] = None) -> int:
+        """Move up to *limit* flat files into the shard of their mtime. Returns files moved."""
+        moved = 0
+        for entry in self._flat_files(limit):
+            src = Path(entry.path)
+            try:
+                mtime = entry.stat().st_mtime
+                when = datetime.fromtimestamp(mtime)
+                dest = self.destination(entry.name, when)
+                os.replace(src, dest)
+            except OSError as exc:
+                log.warning("Done compaction skipped %s: %s", entry.name, exc)
+                with self._lock:
+                    self._stats["errors"] += 1
+                continue
+            self._record(dest, outcome_for(entry.name), when, mtime)
+            moved += 1
+            if on_moved is not None:
+                on_moved(src, dest)
+        with self._lock:
+            self._stats["migrated"] += moved
+            self._stats["compactions"] += 1
+        if moved:
+            log.info("Done compaction: %d flat file(s) moved into monthly shards", moved)
+        return moved
+
+    def start_compactor(self, interval: float = DONE_COMPACT_INTERVAL, batch: int = DONE_COMPACT_BATCH,
+                        on_moved: Optional[Callable[[Path, Path], None]] = None):
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    moved = self.compact(batch, on_moved)
+                except Exception as exc:
+                    log.error("Done compactor failed: %s", exc)
+                    moved = 0
+                # Keep going while a legacy backlog remains, then idle
+                self._stop.wait(1.0 if moved >= batch else interval)
+
+        if self._compactor is None:
+            self._compactor = threading.Thread(target=_run, daemon=True, name="done-compactor")
+            self._compactor.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join(timeout=5)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "compactor": bool(self._compactor and self._compactor.is_alive())}
+
+
+_archives: dict[Path, DoneArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_done_archive(vault_path: Path | str) -> DoneArchive:
+    """One DoneArchive per vault per process (shared lock for the month indexes)."""
+    key = Path(vault_path).resolve()
+    with _archives_lock:
+        if key not in _archives:
+            _archives[key] = DoneArchive(key)
+        return _archives[key]
@@ -26,6 +26,8 @@ from typing import Any, Callable, Optional
 
 from dotenv import load_dotenv
 
+from vault_io import atomic_write_text
+
 load_dotenv()
 
 log = logging.getLogger(__name__)
@@ -61,6 +63,9 @@ class ErrorRecovery:
         self._errors: list[dict] = []
         self._max_history = max_history
         self._paused_components: set[str] = set()
+        # Never trimmed — for metrics. Keyed by fixed component names ("triage",
+        # "watcher:<name>"); per-item detail goes in *subject*, history only
+        self._totals: dict[tuple[str, str], int] = {}
 
     def record_error(
         self,
@@ -68,20 +73,24 @@ class ErrorRecovery:
         message: str,
         component: str = "unknown",
         exc: Optional[Exception] = None,
+        subject: Optional[str] = None,
     ):
         record = {
             "timestamp": datetime.now().isoformat(),
             "category": category.value,
             "component": component,
+            "subject": subject,
             "message": message,
             "traceback": traceback.format_exc() if exc else None,
         }
         self._errors.append(record)
         if len(self._errors) > self._max_history:
             self._errors.pop(0)
+        key = (category.value, component)
+        self._totals[key] = self._totals.get(key, 0) + 1
 
         _write_jsonl(ERROR_LOG_PATH, record)
-        log.error("[%s/%s] %s", category.value, component, message)
+        log.error("[%s/%s] %s%s", category.value, component, f"{subject}: " if subject else "", message)
 
         # Authentication errors → pause the component automatically
         if category == ErrorCategory.AUTHENTICATION:
@@ -109,6 +118,10 @@ class ErrorRecovery:
             counts[c] = counts.get(c, 0) + 1
         return counts
 
+    def error_totals(self) -> dict[tuple[str, str], int]:
+        """Errors since start per (category, component) — unlike the bounded history."""
+        return dict(self._totals)
+
 
 # ── Quarantine Manager ─────────────────────────────────────────────────────────
 class QuarantineManager:
@@ -120,6 +133,7 @@ class QuarantineManager:
     def __init__(self, quarantine_dir: Path):
         self.quarantine_dir = quarantine_dir
         self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        self.count = 0
 
     def quarantine(self, path: Path, reason: str) -> Path:
         dest = self.quarantine_dir / path.name
@@ -130,7 +144,8 @@ class QuarantineManager:
 
         # Write sidecar reason file
         reason_file = dest.with_suffix(".reason.txt")
-        reason_file.write_text(
+        atomic_write_text(
+            reason_file,
             f"Quarantined: {datetime.now().isoformat()}\nReason: {reason}\nOriginal: {path}\n",
             encoding="utf-8",
         )
@@ -142,6 +157,7 @@ class QuarantineManager:
             "message": f"Quarantined {path.name}: {reason}",
             "quarantine_path": str(dest),
         })
+        self.count += 1
         log.warning("QUARANTINED: %s → %s | Reason: %s", path.name, dest, reason)
         return dest
 
@@ -184,7 +200,7 @@ status: pending_review
 - [ ] Move original file back to /Needs_Action if valid
 - [ ] Delete this file when resolved
 """
-        review_path.write_text(content, encoding="utf-8")
+        atomic_write_text(review_path, content, encoding="utf-8")
         log.warning("Human review queued: %s", review_path.name)
         return review_path
 
@@ -338,5 +354,5 @@ status: unread
 ---
 *Generated automatically by AI Employee Error Recovery System*
 """
-    alert_path.write_text(content, encoding="utf-8")
+    atomic_write_text(alert_path, content, encoding="utf-8")
     log.critical("ALERT written to vault: %s", alert_path.name)
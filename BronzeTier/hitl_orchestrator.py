@@ -29,6 +29,14 @@ from pathlib import Path
 import requests
 from dotenv import load_dotenv
 
+_BRONZE_DIR = Path(__file__).resolve().parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from done_archive import get_done_archive
+from profiling import start_profiler
+from vault_frontmatter import read_frontmatter
+
 load_dotenv('BronzeTier/.env')  # always load BronzeTier credentials
 load_dotenv()                   # fallback to local .env
 
@@ -69,21 +77,6 @@ def _audit(action: str, filepath: str, result: str, success: bool):
         f.write(json.dumps(record, default=str) + '\n')
 
 
-def _extract_frontmatter(content: str) -> dict:
-    """Parse YAML frontmatter from a markdown file."""
-    meta = {}
-    lines = content.splitlines()
-    if not lines or lines[0].strip() != '---':
-        return meta
-    for line in lines[1:]:
-        if line.strip() == '---':
-            break
-        if ':' in line:
-            key, _, value = line.partition(':')
-            meta[key.strip()] = value.strip()
-    return meta
-
-
 def _extract_json_block(content: str) -> dict:
     """Extract JSON from a ```json ... ``` block in the file."""
     match = re.search(r'```json\s*\n(.*?)\n```', content, re.DOTALL)
@@ -212,8 +205,8 @@ ACTION_MAP = {
 
 def process_approved(filepath: Path):
     """Execute an approved action file."""
+    meta     = read_frontmatter(filepath).fields
     content  = filepath.read_text(encoding='utf-8')
-    meta     = _extract_frontmatter(content)
     details  = _extract_json_block(content)
     action   = meta.get('action', '')
 
@@ -233,13 +226,13 @@ def process_approved(filepath: Path):
             action = 'whatsapp_reply'
         elif msg_type == 'email':
             log.info('Raw email approved — archiving to Done (reply manually)')
-            shutil.move(str(filepath), DONE / filepath.name)
+            get_done_archive(VAULT_PATH).archive(filepath, outcome='approved')
             return
         else:
             result = f'No action found in frontmatter and unknown type: {msg_type}'
             log.warning(result)
             _audit('unknown', str(filepath), result, success=False)
-            shutil.move(str(filepath), DONE / filepath.name)
+            get_done_archive(VAULT_PATH).archive(filepath, outcome='unhandled')
             return
 
     log.info('Executing approved action: %s (%s)', action, filepath.name)
@@ -250,15 +243,15 @@ def process_approved(filepath: Path):
         log.warning(result)
         _audit(action, str(filepath), result, success=False)
         # Move to Done anyway to avoid reprocessing
-        shutil.move(str(filepath), DONE / filepath.name)
+        get_done_archive(VAULT_PATH).archive(filepath, outcome='unhandled')
         return
 
     try:
         result = executor(details, meta)
         log.info('Action succeeded: %s', result)
         _audit(action, str(filepath), result, success=True)
-        # Archive to Done
-        shutil.move(str(filepath), DONE / filepath.name)
+        # Archive to this month's Done shard
+        get_done_archive(VAULT_PATH).archive(filepath, outcome='approved')
         log.info('Archived to Done: %s', filepath.name)
     except Exception as exc:
         result = str(exc)
@@ -270,17 +263,16 @@ def process_approved(filepath: Path):
 
 def process_rejected(filepath: Path):
     """Archive a rejected action file."""
-    content = filepath.read_text(encoding='utf-8')
-    meta    = _extract_frontmatter(content)
-    action  = meta.get('action', 'unknown')
+    action  = read_frontmatter(filepath).action or 'unknown'
     log.info('Action rejected by human: %s (%s)', action, filepath.name)
     _audit(action, str(filepath), 'rejected_by_human', success=False)
-    shutil.move(str(filepath), DONE / f'REJECTED_{filepath.name}')
+    get_done_archive(VAULT_PATH).archive(filepath, f'REJECTED_{filepath.name}')
 
 
 def run():
     """Main loop — watch /Approved and /Rejected for files to process."""
     _ensure_folders()
+    start_profiler('hitl_orchestrator')
     log.info('HITL Orchestrator started.')
     log.info('Watching: %s', VAULT_PATH)
     log.info('  /Approved  → execute action')
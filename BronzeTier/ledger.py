@@ -0,0 +1,285 @@
+"""
+ledger.py – Structured running-balance ledger next to the Accounting notes
+
+The Accounting/Current_Month_YYYY-MM.md files are for humans: markdown tables,
+one import section per CSV. Getting a balance out of them meant reading and
+regex-scanning the newest file on every dashboard refresh. FinanceWatcher now
+also records every transaction here:
+
+  Accounting/ledger.jsonl        append-only, one JSON record per transaction
+  Accounting/ledger_header.json  tiny summary, rewritten atomically per import:
+                                   {"balance", "balance_date", "records",
+                                    "months": {"YYYY-MM": {"income", "expenses",
+                                                           "net", "count"}}, ...}
+
+Readers (dashboard, CEO briefing) only load the header — O(1) regardless of
+history length.
+
+The balance follows the chronologically newest record, not the last one
+applied. Each record carries "import" (the import's sequence number) and
+"row" (its position within that import, oldest first — a newest-first CSV is
+detected by its dates, or by its running balance when all rows share a day),
+so the balance moves only for a record later in (date, import, row) order. The header can always be rebuilt from ledger.jsonl, and on
+first use an existing vault is backfilled from the Current_Month_*.md tables.
+"""
+
+import json
+import logging
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from vault_io import atomic_write_text
+
+log = logging.getLogger("Ledger")
+
+LEDGER_FILE = "ledger.jsonl"
+HEADER_FILE = "ledger_header.json"
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+                 "%d.%m.%Y", "%d %b %Y", "%d %B %Y", "%b %d, %Y")
+_AMOUNT_STRIP_RE = re.compile(r"[^\d.\-+()]")
+_TABLE_ROW_RE = re.compile(r"^\|([^|]*)\|([^|]*)\|([^|]*)\|([^|]*)\|\s*$")
+
+
+def parse_amount(value) -> Optional[float]:
+    """'$1,234.50' / '-4.50' / '(12.00)' / '🔴 -4.50' → float, or None if empty/invalid."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    negative = text.startswith("(") and text.endswith(")")
+    cleaned = _AMOUNT_STRIP_RE.sub("", text).strip("()")
+    if not cleaned or cleaned in "+-.":
+        return None
+    try:
+        amount = float(cleaned)
+    except ValueError:
+        return None
+    return -abs(amount) if negative else amount
+
+
+def parse_date(value: str) -> Optional[date]:
+    text = (value or "").strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def empty_header() -> dict:
+    return {"balance": None, "balance_date": "", "balance_key": None, "imports": 0,
+            "records": 0, "months": {}, "updated": ""}
+
+
+def _newest_first(records: list[dict]) -> bool:
+    """Whether one import's rows run newest → oldest (bank exports often do)."""
+    dates = [r["date"] for r in records if r.get("date")]
+    if dates and dates[0] != dates[-1]:
+        return dates[0] > dates[-1]
+    # Same day throughout: see which direction the running balance adds up in
+    forward = backward = 0
+    for prev, cur in zip(records, records[1:]):
+        if None in (prev.get("balance"), cur.get("balance")):
+            continue
+        if cur.get("amount") is not None and round(prev["balance"] + cur["amount"], 2) == cur["balance"]:
+            forward += 1
+        if prev.get("amount") is not None and round(cur["balance"] + prev["amount"], 2) == prev["balance"]:
+            backward += 1
+    return backward > forward
+
+
+def _sequence(records: list[dict], import_no: int):
+    """
+    Stamp one import's records with its number and their chronological row.
+
+    A newest-first CSV with several rows on one day keeps the newest balance:
+
+    >>> header = empty_header()
+    >>> rows = [{"date": "2026-10-17", "month": "2026-10", "amount": -10.0, "balance": 90.0},
+    ...         {"date": "2026-10-17", "month": "2026-10", "amount": 5.0, "balance": 100.0}]
+    >>> _sequence(rows, 1)
+    >>> for row in rows:
+    ...     Ledger._apply(header, row)
+    >>> header["balance"], [row["row"] for row in rows]
+    (90.0, [1, 0])
+    """
+    reverse = _newest_first(records)
+    last = len(records) - 1
+    for i, record in enumerate(records):
+        record["import"] = import_no
+        record["row"] = last - i if reverse else i
+
+
+def load_header(accounting_dir: Path) -> Optional[dict]:
+    """The ledger summary, or None if this vault has no ledger yet."""
+    try:
+        return json.loads((Path(accounting_dir) / HEADER_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def month_totals(header: Optional[dict], month: Optional[str] = None) -> dict:
+    """Totals for *month* ("YYYY-MM", default: this month); zeros if none recorded."""
+    month = month or datetime.now().strftime("%Y-%m")
+    zero = {"income": 0.0, "expenses": 0.0, "net": 0.0, "count": 0}
+    return {**zero, **((header or {}).get("months", {}).get(month) or {})}
+
+
+def format_money(value: Optional[float]) -> str:
+    if value is None:
+        return "—"
+    return f"-{abs(value):,.2f}" if value < 0 else f"{value:,.2f}"
+
+
+class Ledger:
+    """Writer side, owned by FinanceWatcher (one per Accounting folder)."""
+
+    def __init__(self, accounting_dir: Path):
+        self.dir = Path(accounting_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.dir / LEDGER_FILE
+        self.header_path = self.dir / HEADER_FILE
+        self._lock = threading.Lock()
+        self._header = self._load_or_rebuild()
+
+    # ── Write ──────────────────────────────────────────────────────────────────
+    def append(self, transactions: Iterable[dict], source: str) -> int:
+        """Record parsed CSV rows ({date, description, amount, balance}); returns count."""
+        imported = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            records = [self._to_record(txn, source, imported) for txn in transactions]
+            if not records:
+                return 0
+            self._header["imports"] = self._header.get("imports", 0) + 1
+            _sequence(records, self._header["imports"])
+            for record in records:
+                self._apply(self._header, record)
+            with self.records_path.open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+            self._header["updated"] = imported
+            self._write_header()
+            return len(records)
+
+    @staticmethod
+    def _to_record(txn: dict, source: str, imported: str) -> dict:
+        day = parse_date(txn.get("date", ""))
+        return {
+            "date": day.isoformat() if day else "",
+            "month": (day or date.today()).strftime("%Y-%m"),
+            "description": txn.get("description", ""),
+            "amount": parse_amount(txn.get("amount")),
+            "balance": parse_amount(txn.get("balance")),
+            "source": source,
+            "imported": imported,
+        }
+
+    @staticmethod
+    def _apply(header: dict, record: dict):
+        amount = record.get("amount") or 0.0
+        month = header["months"].setdefault(
+            record["month"], {"income": 0.0, "expenses": 0.0, "net": 0.0, "count": 0})
+        if amount >= 0:
+            month["income"] = round(month["income"] + amount, 2)
+        else:
+            month["expenses"] = round(month["expenses"] - amount, 2)
+        month["net"] = round(month["income"] - month["expenses"], 2)
+        month["count"] += 1
+        header["records"] += 1
+
+        # Only a record strictly later in (date, import, row) order moves the
+        # balance: bank CSVs are often newest-first and imports arrive out of order
+        key = [record["date"], record.get("import", 0), record.get("row", 0)]
+        current = header.get("balance_key")
+        if current is None and header["balance_date"]:
+            current = [header["balance_date"], 0, 0]       # header from before balance_key
+        if current is not None and key <= current:
+            return
+        # Bank-reported balance wins; otherwise carry the last known one forward
+        if record.get("balance") is not None:
+            header["balance"] = record["balance"]
+        elif header["balance"] is not None and record.get("amount") is not None:
+            header["balance"] = round(header["balance"] + record["amount"], 2)
+        else:
+            return
+        header["balance_date"] = record["date"]
+        header["balance_key"] = key
+
+    def _write_header(self):
+        atomic_write_text(self.header_path, json.dumps(self._header, indent=2, ensure_ascii=False))
+
+    # ── Recovery ───────────────────────────────────────────────────────────────
+    def _load_or_rebuild(self) -> dict:
+        header = load_header(self.dir)
+        if header is not None and self.records_path.exists():
+            return header
+        if not self.records_path.exists():
+            self._backfill_from_markdown()
+        return self.rebuild()
+
+    def rebuild(self) -> dict:
+        """Recompute the header from ledger.jsonl (lost or corrupt header)."""
+        header = empty_header()
+        batches: list[list[dict]] = []
+        try:
+            with self.records_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if not isinstance(record, dict):
+                        continue
+                    batch_id = (record.get("import"), record.get("source"), record.get("imported"))
+                    if not batches or batches[-1][0] != batch_id:
+                        batches.append([batch_id])
+                    batches[-1].append(record)
+        except FileNotFoundError:
+            pass
+        for _, *records in batches:
+            if "row" not in records[0]:
+                _sequence(records, header["imports"] + 1)     # written before rows were numbered
+            header["imports"] = max(header["imports"], records[0]["import"])
+            for record in records:
+                try:
+                    self._apply(header, record)
+                except (KeyError, TypeError):
+                    continue
+        header["updated"] = datetime.now().isoformat(timespec="seconds")
+        self._header = header
+        self._write_header()
+        log.info("Ledger header rebuilt: %d records", header["records"])
+        return header
+
+    def _backfill_from_markdown(self):
+        """Seed ledger.jsonl once from the import tables FinanceWatcher already wrote."""
+        records = []
+        import_no = 0
+        for month_file in sorted(self.dir.glob("Current_Month_*.md")):
+            imported = datetime.fromtimestamp(month_file.stat().st_mtime).isoformat(timespec="seconds")
+            sections: list[list[dict]] = [[]]
+            for line in month_file.read_text(encoding="utf-8").splitlines():
+                if line.startswith("## Import:"):
+                    sections.append([])                 # one CSV import per section
+                    continue
+                match = _TABLE_ROW_RE.match(line)
+                if not match or set(match.group(1).strip()) <= set("-") or match.group(1).strip() == "Date":
+                    continue
+                txn = dict(zip(("date", "description", "amount", "balance"),
+                               (g.strip() for g in match.groups())))
+                sections[-1].append(self._to_record(txn, month_file.name, imported))
+            for rows in filter(None, sections):
+                import_no += 1
+                _sequence(rows, import_no)
+                records.extend(rows)
+        if records:
+            with self.records_path.open("a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+            log.info("Ledger backfilled with %d records from Accounting notes", len(records))
+
+    def header(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._header))
@@ -0,0 +1,250 @@
+"""
+llm_cache.py – Content-addressed cache for LLM results (SQLite)
+
+The same input reaches Groq again and again: re-sent WhatsApp messages, one
+email picked up by both the Gmail API and IMAP watchers, retries after
+with_error_recovery. This cache stores the model output under a SHA-256 of
+the normalized inputs, so a duplicate costs one SQLite lookup instead of a
+round trip.
+
+Key ingredients (hashed, never stored in clear):
+  - purpose tag ("triage", "prompt", ...)
+  - model name
+  - prompt prefix / handbook text (acts as the handbook version)
+  - note text (key(..., note=...)) with volatile fields removed from its
+    leading frontmatter block only (received, created, message_id, ...) —
+    the body and free-form prompts are hashed as written
+  - every part: line endings and trailing spaces normalized
+
+Eviction:
+  - TTL      : entries older than LLM_CACHE_TTL seconds are treated as misses
+  - LRU size : beyond LLM_CACHE_MAX_ENTRIES the least recently used rows go
+
+The database lives in <vault>/.cache/ next to the vault index.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("LLMCache")
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false"
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Frontmatter fields that differ between copies of the same message
+VOLATILE_FIELDS = (
+    "received", "created", "expires", "timestamp", "date", "message_id",
+    "id", "uid", "status", "claimed_by", "claimed_at", "retry", "attempt",
+)
+_VOLATILE_RE = re.compile(
+    r"^(?:%s)\s*:.*$\n?" % "|".join(re.escape(f) for f in VOLATILE_FIELDS),
+    re.MULTILINE | re.IGNORECASE,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key       TEXT PRIMARY KEY,
+    value     TEXT NOT NULL,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Line endings and trailing/leading whitespace noise only."""
+    text = text.replace("\r\n", "\n")
+    return "\n".join(line.rstrip() for line in text.strip().split("\n"))
+
+
+def normalize_note(text: str) -> str:
+    """normalize_text, plus volatile `key: value` lines dropped from the leading frontmatter."""
+    text = normalize_text(text)
+    if text.startswith("---\n"):
+        end = text.find("\n---", 4)
+        if end != -1:
+            text = "---\n" + _VOLATILE_RE.sub("", text[4:end + 1]) + text[end + 1:]
+    return text
+
+
+def default_cache_path(vault: Path) -> Path:
+    return Path(os.getenv("LLM_CACHE_PATH", str(Path(vault) / ".cache" / "llm_cache.sqlite3")))
+
+
+class LLMCache:
+    """
+    Persistent key → text store with TTL and LRU eviction.
+
+        key = cache.key("triage", model, prefix, note=note_text)
+        plan = cache.get_json(key)
+        if plan is None:
+            plan = call_groq(...)
+            cache.put_json(key, plan)
+    """
+
+    def __init__(self, db_path: Path | str, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, enabled: bool = LLM_CACHE_ENABLED):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._counts = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    # ── Keys ───────────────────────────────────────────────────────────────────
+    @staticmethod
+    def key(purpose: str, model: str, *parts: str, note: Optional[str] = None) -> str:
+        """
+        Hash of the purpose, model and input parts. *note* is vault note text:
+        its volatile frontmatter fields don't count (see normalize_note).
+        """
+        h = hashlib.sha256()
+        texts = [normalize_text(part or "") for part in (purpose, model, *parts)]
+        if note is not None:
+            texts.append(normalize_note(note))
+        for text in texts:
+            data = text.encode("utf-8")
+            h.update(len(data).to_bytes(8, "big"))   # length-prefixed: no ambiguous joins
+            h.update(data)
+        return h.hexdigest()
+
+    # ── Get / put ──────────────────────────────────────────────────────────────
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counts["misses"] += 1
+                return None
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._counts["expired"] += 1
+                self._counts["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._counts["hits"] += 1
+        return value
+
+    def put(self, key: str, value: str):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO llm_cache(key, value, created, last_used) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value, created = excluded.created, last_used = excluded.last_used
+                """,
+                (key, value, now, now),
+            )
+            self._counts["stores"] += 1
+            self._evict_locked()
+            self._conn.commit()
+
+    def get_json(self, key: str) -> Any:
+        raw = self.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    def put_json(self, key: str, value: Any):
+        self.put(key, json.dumps(value, ensure_ascii=False))
+
+    def get_or_call(self, key: str, fn: Callable[[], str]) -> str:
+        """Return the cached text for *key*, or call *fn* and cache its result."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = fn()
+        if value:
+            self.put(key, value)
+        return value
+
+    # ── Maintenance ────────────────────────────────────────────────────────────
+    def _evict_locked(self):
+        """Keep at most max_entries rows, dropping the least recently used."""
+        if not self.max_entries:
+            return
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        excess = total - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._counts["evicted"] += excess
+
+    def purge_expired(self) -> int:
+        if not self.ttl:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM llm_cache WHERE created < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            self._counts["expired"] += cur.rowcount
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "entries": entries,
+            "hit_rate": round(counts["hits"] / lookups, 3) if lookups else 0.0,
+            "enabled": self.enabled,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ── Per-process shared instance ────────────────────────────────────────────────
+_shared: dict[str, LLMCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache(vault: Path | str) -> LLMCache:
+    """One LLMCache per database path per process."""
+    path = default_cache_path(Path(vault))
+    with _shared_lock:
+        cache = _shared.get(str(path))
+        if cache is None:
+            cache = _shared[str(path)] = LLMCache(path)
+        return cache
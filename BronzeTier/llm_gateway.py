@@ -0,0 +1,257 @@
+"""
+llm_gateway.py – Single entry point for LLM calls
+
+Every component used to build its own Groq(api_key=...) client, several of
+them per call, so no HTTP connection was ever reused. The gateway owns:
+
+  - Providers   : LLMProvider interface; GroqProvider (one long-lived pooled
+                  async client with explicit timeouts, SDK retries off because
+                  the executor retries), StubProvider (offline,
+                  deterministic — for benchmarks and tests) and
+                  ReplayProvider (answers recorded in vault_trace traces).
+                  LLM_PROVIDER picks one.
+  - Execution   : the process-wide ReasoningExecutor (concurrency cap,
+                  retries, rate limiter, per-component usage accounting
+                  from response.usage)
+  - ask()       : prompt → text helper used by every former _ask_groq,
+                  optionally through the persistent LLM result cache
+
+    from llm_gateway import ask, get_gateway
+    text = ask("Summarise ...", model=GROQ_MODEL, component="cloud_agent", cache_vault=VAULT_PATH)
+    future = get_gateway().submit(component="triage", model=..., messages=[...])
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from rate_limiter import LANE_TRIAGE
+from reasoning_executor import ReasoningExecutor, get_reasoning_executor
+from vault_trace import PROMPT_FILE_RE, load_llm_index, prompt_text
+
+log = logging.getLogger("LLMGateway")
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_STUB_LATENCY = float(os.getenv("LLM_STUB_LATENCY", "0"))
+TRACE_REPLAY = os.getenv("TRACE_REPLAY", "")                     # trace file(s), os.pathsep-separated
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0"))
+DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+
+
+# ── Providers ──────────────────────────────────────────────────────────────────
+class LLMProvider:
+    """
+    A provider hands the executor an async client exposing
+    `client.chat.completions.create(**kwargs)` (OpenAI/Groq shape). Clients
+    may also offer `with_raw_response` so rate-limit headers can be read.
+    """
+    name = "base"
+
+    def create_client(self):
+        raise NotImplementedError
+
+
+class GroqProvider(LLMProvider):
+    name = "groq"
+
+    def create_client(self):
+        import httpx
+        from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+        timeout = httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+        http_client = DefaultAsyncHttpxClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+        )
+        return AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY", ""),
+            timeout=timeout,
+            max_retries=0,            # ReasoningExecutor retries with the rate limiter
+            http_client=http_client,
+        )
+
+
+class StubProvider(LLMProvider):
+    """
+    Offline provider: answers are a pure function of the request, so runs are
+    reproducible. JSON-mode triage prompts get a valid plan per `File:` item
+    (batched prompts get {"items": [...]}); other prompts get a short text.
+    """
+    name = "stub"
+
+    def __init__(self, latency: float = LLM_STUB_LATENCY):
+        self.latency = latency
+
+    def create_client(self):
+        return _StubClient(self.latency)
+
+
+_APPROVAL_WORDS = ("payment", "invoice", "transfer", "refund", "contract")
+
+
+class _StubCompletions:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = prompt_text(kwargs)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        if (kwargs.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps(_stub_plans(prompt))
+        else:
+            content = f"[stub {kwargs.get('model', '')}] Draft {digest[:12]}: {prompt.strip()[:120]}"
+        return _completion(f"stub-{digest[:16]}", kwargs.get("model", "stub"), content,
+                           len(prompt) // 4, len(content) // 4)
+
+
+def _completion(response_id: str, model: str, content: str, prompt_tokens: int, completion_tokens: int):
+    """A chat.completions response object (the fields the executor and callers read)."""
+    return SimpleNamespace(
+        id=response_id,
+        model=model,
+        choices=[SimpleNamespace(
+            index=0, finish_reason="stop",
+            message=SimpleNamespace(role="assistant", content=content, tool_calls=None),
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+def _stub_plans(prompt: str) -> dict:
+    matches = list(PROMPT_FILE_RE.finditer(prompt))
+    plans = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(prompt)
+        body = prompt[match.end():end].lower()
+        needs_approval = any(word in body for word in _APPROVAL_WORDS)
+        name = match.group(1)
+        if "type: email" in body:
+            action = {"action": "reply_email", "description": f"Reply to {name}", "mcp_server": "email"}
+        else:
+            action = {"action": "other", "description": f"Review {name}", "mcp_server": "filesystem"}
+        plans.append({
+            "file": name,
+            "summary": f"Stub triage of {name}",
+            "category": "finance" if needs_approval else "other",
+            "urgency": "high" if "urgent" in body else "low",
+            "requires_approval": needs_approval,
+            "approval_reason": "Mentions a payment" if needs_approval else "",
+            "amount": 0.0,
+            "actions": [action],
+            "plan_entry": f"- [ ] Review {name}",
+        })
+    if len(plans) == 1:
+        plans[0].pop("file")
+        return plans[0]
+    return {"items": plans}
+
+
+class _StubClient:
+    def __init__(self, latency: float):
+        self.chat = SimpleNamespace(completions=_StubCompletions(latency))
+
+    async def close(self):
+        pass
+
+
+class ReplayProvider(LLMProvider):
+    """
+    Offline provider for trace replay (benchmarks/replay_trace.py): answers
+    come from the LLM responses recorded in TRACE_REPLAY, after the recorded
+    latency × LLM_REPLAY_LATENCY_SCALE. Requests the trace can't answer get
+    the stub's answer (counted as "missed" in the index stats).
+    """
+    name = "replay"
+
+    def __init__(self, paths: str = TRACE_REPLAY, latency_scale: float = LLM_REPLAY_LATENCY_SCALE):
+        self.paths = [p for p in paths.split(os.pathsep) if p]
+        self.latency_scale = latency_scale
+
+    def create_client(self):
+        if not self.paths:
+            raise ValueError("LLM_PROVIDER=replay needs TRACE_REPLAY=<trace.jsonl>")
+        client = _StubClient(0.0)
+        client.chat = SimpleNamespace(completions=_ReplayCompletions(
+            load_llm_index(self.paths), self.latency_scale, client.chat.completions,
+        ))
+        return client
+
+
+class _ReplayCompletions:
+    def __init__(self, index, latency_scale: float, fallback: _StubCompletions):
+        self.index = index
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+
+    async def create(self, **kwargs):
+        hit = self.index.lookup(kwargs)
+        if hit is None:
+            return await self.fallback.create(**kwargs)
+        content, latency, usage = hit
+        if latency and self.latency_scale:
+            await asyncio.sleep(latency * self.latency_scale)
+        return _completion("replay", kwargs.get("model", "replay"), content,
+                           usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+
+PROVIDERS = {"groq": GroqProvider, "stub": StubProvider, "replay": ReplayProvider}
+
+
+def get_provider(name: Optional[str] = None) -> LLMProvider:
+    name = (name or LLM_PROVIDER).lower()
+    if name not in PROVIDERS:
+        log.warning("Unknown LLM_PROVIDER %r — using groq", name)
+        name = "groq"
+    return PROVIDERS[name]()
+
+
+# ── Gateway ────────────────────────────────────────────────────────────────────
+def get_gateway() -> ReasoningExecutor:
+    """The process-wide executor, bound to the configured provider."""
+    return get_reasoning_executor()
+
+
+def ask(prompt: str, model: str = DEFAULT_MODEL, max_tokens: int = 1024,
+        component: str = "default", lane: str = LANE_TRIAGE,
+        cache_vault: Optional[Path] = None, template: Optional[str] = None,
+        note: Optional[str] = None, **kwargs) -> str:
+    """
+    Single user prompt → reply text. With *cache_vault* the reply is served
+    from / stored in that vault's LLM result cache.
+
+    A prompt that embeds a vault note should pass the *template* id and the
+    *note* text: the key is then built from those, with the note's volatile
+    frontmatter (received:, message_id:, …) dropped, so a re-sent message
+    hits the cache. Otherwise the whole prompt is the key.
+    """
+    def _call() -> str:
+        return get_gateway().complete_text(
+            prompt, model, max_tokens, lane=lane, component=component, **kwargs,
+        )
+
+    if cache_vault is None:
+        return _call()
+    from llm_cache import get_llm_cache
+    cache = get_llm_cache(cache_vault)
+    if note is not None:
+        key = cache.key("draft", model, str(max_tokens), template or "", note=note)
+    else:
+        key = cache.key("prompt", model, str(max_tokens), prompt)
+    return cache.get_or_call(key, _call)
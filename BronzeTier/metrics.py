@@ -0,0 +1,301 @@
+"""
+metrics.py – Prometheus-style metrics for the Orchestrator process
+
+Until now the only live signal was the health line Orchestrator.run logs
+every 5 minutes. This module keeps counters, gauges and histograms in memory
+and exposes them in the Prometheus text format (0.0.4) two ways:
+
+  - HTTP   : GET http://METRICS_HOST:METRICS_PORT/metrics  (0 disables)
+  - File   : METRICS_TEXTFILE rewritten atomically every
+             METRICS_TEXTFILE_INTERVAL s (node_exporter textfile collector)
+
+Two kinds of sources:
+  - instruments, updated inline:  get_metrics().counter(...).inc(component="triage")
+  - collectors, called per scrape: components that already keep stats()
+    (worker pool, ErrorRecovery, dashboard, plan writer, ...) are read at
+    scrape time instead of being instrumented twice
+
+No client library needed — the format is a few lines of text.
+"""
+
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from vault_io import atomic_write_text
+
+log = logging.getLogger("Metrics")
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_INTERVAL = float(os.getenv("METRICS_TEXTFILE_INTERVAL", "15"))
+
+# Seconds: LLM calls, watcher polls, file handling
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Seconds a human takes to approve / reject: 1 min … 3 days
+HITL_BUCKETS = (60, 300, 900, 3600, 4 * 3600, 12 * 3600, 24 * 3600, 72 * 3600)
+
+# A collector returns [(name, type, help, [(labels, value), ...]), ...]
+Family = tuple[str, str, str, list[tuple[dict, float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# ── Instruments ────────────────────────────────────────────────────────────────
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: expected labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.label_names, key))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            return [(self.name, self._labels(k), v) for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            return [(self.name, self._labels(k), v) for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        out = []
+        with self._lock:
+            items = [(k, dict(v, counts=list(v["counts"]))) for k, v in self._values.items()]
+        for key, state in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                out.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            out.append((f"{self.name}_sum", labels, state["sum"]))
+            out.append((f"{self.name}_count", labels, state["count"]))
+        return out
+
+
+# ── Registry ───────────────────────────────────────────────────────────────────
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def _get_or_create(self, cls, name: str, help: str, labels: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labels, buckets=buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[Family]]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                         for name, labels, value in metric.samples())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as exc:
+                log.warning("Metrics collector %s failed: %s", getattr(collector, "__name__", collector), exc)
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                             for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+# ── Exporters ──────────────────────────────────────────────────────────────────
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # scrapes every 15s would flood the log
+
+
+class MetricsExporter:
+    """Runs the HTTP endpoint and/or the textfile writer for one registry."""
+
+    def __init__(self, registry: MetricsRegistry, host: str = METRICS_HOST, port: int = METRICS_PORT,
+                 textfile: str = METRICS_TEXTFILE, interval: float = METRICS_TEXTFILE_INTERVAL):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.textfile = Path(textfile) if textfile else None
+        self.interval = max(1.0, interval)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self):
+        if self.port:
+            handler = type("MetricsHandler", (_MetricsRequestHandler,), {"registry": self.registry})
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), handler)
+            except OSError as exc:
+                log.warning("Metrics endpoint not started on %s:%d: %s", self.host, self.port, exc)
+            else:
+                self._server.daemon_threads = True
+                self._spawn(self._server.serve_forever, "metrics-http")
+                log.info("Metrics endpoint: http://%s:%d/metrics", self.host, self.server_port)
+        if self.textfile is not None:
+            self._spawn(self._textfile_loop, "metrics-textfile")
+            log.info("Metrics textfile: %s (every %.0fs)", self.textfile, self.interval)
+        return self
+
+    @property
+    def server_port(self) -> int:
+        return self._server.server_address[1] if self._server else 0
+
+    def _spawn(self, target: Callable, name: str):
+        t = threading.Thread(target=target, daemon=True, name=name)
+        t.start()
+        self._threads.append(t)
+
+    def _textfile_loop(self):
+        while not self._stop.is_set():
+            self.write_textfile()
+            self._stop.wait(self.interval)
+
+    def write_textfile(self):
+        try:
+            self.textfile.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.textfile, self.registry.render())
+        except OSError as exc:
+            log.warning("Could not write metrics textfile %s: %s", self.textfile, exc)
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self.textfile is not None:
+            self.write_textfile()            # final values for the collector
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
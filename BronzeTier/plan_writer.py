@@ -0,0 +1,184 @@
+"""
+plan_writer.py – Single-writer, batched append service for Plan.md
+
+Every triaged note appends an entry to Plan.md. Doing that by opening the file
+in append mode from each handler thread interleaves writes, and the file grows
+without bound — slow for Obsidian to open and for VaultSync to diff. Instead:
+
+  handler threads ──append()──▶ queue ──▶ writer thread
+                                            ├─ Plans/YYYY-MM-DD.md  (append-only day log)
+                                            └─ Plan.md              (last N entries, rewritten)
+
+  - One thread owns both files; callers only enqueue
+  - Entries are flushed together once PLAN_FLUSH_ENTRIES are queued or the
+    oldest has waited PLAN_FLUSH_SECONDS
+  - Each entry goes to the day file for its timestamp, so the history rotates
+    daily by itself; Plan.md stays a small rolling view
+  - A pre-existing hand-edited Plan.md is moved to Plans/ once, never overwritten
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from vault_io import atomic_write_text
+
+log = logging.getLogger("PlanWriter")
+
+PLAN_FLUSH_ENTRIES = int(os.getenv("PLAN_FLUSH_ENTRIES", "20"))
+PLAN_FLUSH_SECONDS = float(os.getenv("PLAN_FLUSH_SECONDS", "2"))
+PLAN_ROLLING_ENTRIES = int(os.getenv("PLAN_ROLLING_ENTRIES", "50"))
+
+ROLLING_MARKER = "<!-- plan_writer: rolling view, full history in Plans/ -->"
+_DAY_FILE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}\.md$")
+_ENTRY_SPLIT_RE = re.compile(r"(?m)^(?=## )")
+
+_STOP = object()
+
+
+class PlanWriter:
+    """Owns Plan.md and Plans/YYYY-MM-DD.md for one vault."""
+
+    def __init__(self, vault: Path, flush_entries: int = PLAN_FLUSH_ENTRIES,
+                 flush_seconds: float = PLAN_FLUSH_SECONDS,
+                 rolling_entries: int = PLAN_ROLLING_ENTRIES):
+        self.vault = Path(vault)
+        self.path = self.vault / "Plan.md"
+        self.plans_dir = self.vault / "Plans"
+        self.flush_entries = max(1, flush_entries)
+        self.flush_seconds = max(0.0, flush_seconds)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._rolling: deque[str] = deque(maxlen=max(1, rolling_entries))
+        self._stats = {"appended": 0, "flushes": 0, "written": 0, "day_files": 0, "errors": 0}
+
+        self.plans_dir.mkdir(parents=True, exist_ok=True)
+        self._archive_legacy_plan()
+        self._seed_rolling()
+
+        self._thread = threading.Thread(target=self._run, daemon=True, name="plan-writer")
+        self._thread.start()
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+    def append(self, text: str, when: Optional[datetime] = None):
+        """Queue one Markdown entry (should start with a `## ` heading)."""
+        with self._lock:
+            self._stats["appended"] += 1
+        self._queue.put((when or datetime.now(), text.strip("\n")))
+
+    def close(self, timeout: float = 5.0):
+        """Flush everything queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "queued": self._queue.qsize(), "rolling": len(self._rolling)}
+
+    # ── Startup ────────────────────────────────────────────────────────────────
+    def _archive_legacy_plan(self):
+        """A Plan.md we didn't write (the old unbounded log) moves to Plans/ intact."""
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                head = f.read(4096)
+        except FileNotFoundError:
+            return
+        if ROLLING_MARKER in head:
+            return
+        target = self.plans_dir / f"Plan_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        os.replace(self.path, target)
+        log.info("Moved existing Plan.md to %s", target.relative_to(self.vault))
+
+    def _seed_rolling(self):
+        """Fill the rolling view from the newest day files so restarts keep it."""
+        day_files = sorted((p for p in self.plans_dir.iterdir() if _DAY_FILE_RE.match(p.name)),
+                           reverse=True)
+        collected: list[str] = []
+        for day_file in day_files:
+            text = day_file.read_text(encoding="utf-8")
+            entries = [e.strip("\n") for e in _ENTRY_SPLIT_RE.split(text) if e.startswith("## ")]
+            collected[:0] = entries
+            if len(collected) >= self._rolling.maxlen:
+                break
+        self._rolling.extend(collected[-self._rolling.maxlen:])
+
+    # ── Writer thread ──────────────────────────────────────────────────────────
+    def _run(self):
+        batch: list[tuple[datetime, str]] = []
+        deadline = 0.0
+        stopping = False
+        while not stopping:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                stopping = True
+            elif item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_seconds
+                batch.append(item)
+            if batch and (stopping or len(batch) >= self.flush_entries
+                          or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch: list[tuple[datetime, str]]):
+        by_day: dict[str, list[str]] = {}
+        for when, text in batch:
+            by_day.setdefault(when.strftime("%Y-%m-%d"), []).append(text)
+        try:
+            for day, entries in by_day.items():
+                day_file = self.plans_dir / f"{day}.md"
+                new_file = not day_file.exists()
+                with day_file.open("a", encoding="utf-8") as f:
+                    if new_file:
+                        f.write(f"# 📋 Plan – {day}\n")
+                    f.write("".join(f"\n{entry}\n" for entry in entries))
+                if new_file:
+                    with self._lock:
+                        self._stats["day_files"] += 1
+            self._rolling.extend(text for _, text in batch)
+            self._write_rolling(max(by_day))
+        except OSError as exc:
+            with self._lock:
+                self._stats["errors"] += 1
+            log.error("Plan flush failed (%d entries): %s", len(batch), exc)
+            return
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["written"] += len(batch)
+        log.info("Plan.md updated with %d entr%s", len(batch), "y" if len(batch) == 1 else "ies")
+
+    def _write_rolling(self, latest_day: str):
+        body = "\n\n".join(self._rolling)
+        text = (
+            f"# 📋 Plan\n{ROLLING_MARKER}\n"
+            f"> Last {len(self._rolling)} entries · latest day: [[Plans/{latest_day}]]\n\n"
+            f"{body}\n"
+        )
+        atomic_write_text(self.path, text)
+
+
+_writers: dict[str, PlanWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_plan_writer(vault: Path | str) -> PlanWriter:
+    """One PlanWriter per vault per process."""
+    key = str(Path(vault).resolve())
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = _writers[key] = PlanWriter(Path(vault))
+        return writer
@@ -0,0 +1,225 @@
+"""
+profiling.py – Opt-in sampling profiler for the long-running agents
+
+cProfile only sees the thread that enabled it, and in the Orchestrator,
+hitl_orchestrator, cloud_orchestrator and local_agent the main thread just
+sleeps — the work happens on watcher, worker-pool, finisher, executor and
+writer threads. This profiler samples every thread instead:
+
+  profiler thread ──every PROFILE_INTERVAL s──▶ sys._current_frames()
+        │                                        (all threads, incl. ones
+        │                                         started later)
+        ▼
+  stack counts, merged by thread name (needs-action_0 … _3 → needs-action)
+        │
+        └──every PROFILE_DUMP_INTERVAL s and at exit──▶ PROFILE_DIR/
+              <component>_<pid>.collapsed   flame-graph input (flamegraph.pl,
+                                            speedscope, inferno): "thread;fn;fn N"
+              <component>_<pid>.top.txt     per-function self / total samples
+
+Counts are cumulative since start; each dump rewrites both files atomically.
+Threads blocked in known wait calls (locks, queues, selectors) are skipped
+unless PROFILE_INCLUDE_IDLE=true, so the output shows where CPU goes.
+
+Enable with PROFILE_ENABLED=true — no restart under a debugger, no code
+changes. Every daemon calls start_profiler("<component>") at startup; it is
+a no-op when disabled.
+"""
+
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from vault_io import atomic_write_text
+
+log = logging.getLogger("Profiler")
+
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.02"))            # seconds between samples
+PROFILE_DUMP_INTERVAL = float(os.getenv("PROFILE_DUMP_INTERVAL", "60"))    # seconds between dumps
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "./logs/profiles"))
+PROFILE_INCLUDE_IDLE = os.getenv("PROFILE_INCLUDE_IDLE", "false").lower() == "true"
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "60"))                          # rows in the .top.txt report
+_MAX_DEPTH = 128
+
+# Leaf frames of threads that are waiting, not working (best effort)
+_IDLE_LEAVES = {
+    ("threading", "wait"), ("threading", "_wait_for_tstate_lock"), ("threading", "join"),
+    ("queue", "get"), ("selectors", "select"), ("socket", "accept"), ("socket", "readinto"),
+    ("inotify_c", "read_events"), ("inotify_c", "do_poll"), ("delayed_queue", "get"),
+    ("connection", "wait"), ("thread", "_worker"),        # idle ThreadPoolExecutor worker
+}
+_THREAD_NUMBER_RE = re.compile(r"[-_]\d+")
+
+
+def _thread_group(name: str) -> str:
+    """'needs-action_2' / 'ThreadPoolExecutor-0_1' → 'needs-action' / 'ThreadPoolExecutor'."""
+    return _THREAD_NUMBER_RE.sub("", name) or name
+
+
+def _module_name(filename: str) -> str:
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def _frame_label(code) -> str:
+    return f"{_module_name(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    def __init__(self, component: str, interval: float = PROFILE_INTERVAL,
+                 dump_interval: float = PROFILE_DUMP_INTERVAL, out_dir: Path = PROFILE_DIR,
+                 include_idle: bool = PROFILE_INCLUDE_IDLE):
+        self.component = component
+        self.interval = max(0.001, interval)
+        self.dump_interval = max(1.0, dump_interval)
+        self.out_dir = Path(out_dir)
+        self.include_idle = include_idle
+        self._stacks: dict[tuple[str, ...], int] = {}
+        self._labels: dict = {}                          # code object → label, cached
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stats = {"samples": 0, "thread_samples": 0, "idle_skipped": 0, "dumps": 0, "sampling_s": 0.0}
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profiler")
+
+    @property
+    def base_path(self) -> Path:
+        return self.out_dir / f"{self.component}_{os.getpid()}"
+
+    def start(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        log.info("Sampling profiler on (every %.0fms, dump every %.0fs) → %s.collapsed / .top.txt",
+                 self.interval * 1000, self.dump_interval, self.base_path)
+        return self
+
+    # ── Sampling ───────────────────────────────────────────────────────────────
+    def _run(self):
+        next_dump = time.monotonic() + self.dump_interval
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if time.monotonic() >= next_dump:
+                self.dump()
+                next_dump = time.monotonic() + self.dump_interval
+
+    def sample(self):
+        started = time.perf_counter()
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        collected = []
+        idle = 0
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            leaf = frame.f_code
+            if not self.include_idle and (_module_name(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                idle += 1
+                continue
+            labels = []
+            while frame is not None and len(labels) < _MAX_DEPTH:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = _frame_label(code)
+                labels.append(label)
+                frame = frame.f_back
+            labels.append(_thread_group(names.get(ident, f"thread-{ident}")))
+            collected.append(tuple(reversed(labels)))
+        with self._lock:
+            for stack in collected:
+                self._stacks[stack] = self._stacks.get(stack, 0) + 1
+            self._stats["samples"] += 1
+            self._stats["thread_samples"] += len(collected)
+            self._stats["idle_skipped"] += idle
+            self._stats["sampling_s"] += time.perf_counter() - started
+
+    # ── Reports ────────────────────────────────────────────────────────────────
+    def function_stats(self) -> list[tuple[str, int, int]]:
+        """(function, self samples, total samples) sorted by total, merged across threads."""
+        with self._lock:
+            stacks = dict(self._stacks)
+        self_counts: dict[str, int] = {}
+        total_counts: dict[str, int] = {}
+        for stack, count in stacks.items():
+            frames = stack[1:]                          # drop the thread-name root
+            if not frames:
+                continue
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for fn in set(frames):                      # recursion counts once per sample
+                total_counts[fn] = total_counts.get(fn, 0) + count
+        return sorted(((fn, self_counts.get(fn, 0), total) for fn, total in total_counts.items()),
+                      key=lambda row: (-row[2], -row[1], row[0]))
+
+    def collapsed(self) -> str:
+        with self._lock:
+            stacks = sorted(self._stacks.items())
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks)
+
+    def top_report(self, limit: int = PROFILE_TOP) -> str:
+        rows = self.function_stats()
+        stats = self.stats()
+        n = max(1, stats["thread_samples"])
+        lines = [
+            f"# {self.component} pid={os.getpid()} uptime={stats['uptime_s']:.0f}s "
+            f"samples={stats['samples']} thread_samples={stats['thread_samples']} "
+            f"idle_skipped={stats['idle_skipped']} overhead={stats['overhead_pct']:.2f}%",
+            f"{'self%':>7} {'total%':>7} {'self':>8} {'total':>8}  function",
+        ]
+        for fn, self_count, total in rows[:limit]:
+            lines.append(f"{self_count / n * 100:7.2f} {total / n * 100:7.2f} {self_count:8d} {total:8d}  {fn}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self):
+        try:
+            atomic_write_text(Path(f"{self.base_path}.collapsed"), self.collapsed())
+            atomic_write_text(Path(f"{self.base_path}.top.txt"), self.top_report())
+        except OSError as exc:
+            log.warning("Profile dump failed: %s", exc)
+            return
+        with self._lock:
+            self._stats["dumps"] += 1
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.dump()
+        log.info("Profile written: %s.collapsed", self.base_path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["stacks"] = len(self._stacks)
+        uptime = time.monotonic() - self._started
+        stats["uptime_s"] = round(uptime, 1)
+        stats["overhead_pct"] = round(stats["sampling_s"] / uptime * 100, 3) if uptime else 0.0
+        stats["sampling_s"] = round(stats["sampling_s"], 3)
+        return stats
+
+
+_profiler: Optional[SamplingProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def start_profiler(component: str) -> Optional[SamplingProfiler]:
+    """Start the process-wide profiler if PROFILE_ENABLED; None otherwise."""
+    global _profiler
+    if not PROFILE_ENABLED:
+        return None
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = SamplingProfiler(component).start()
+        return _profiler
+
+
+def get_profiler() -> Optional[SamplingProfiler]:
+    return _profiler
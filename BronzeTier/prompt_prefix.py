@@ -0,0 +1,74 @@
+"""
+prompt_prefix.py – Cached, precompiled prompt prefix built from a vault file
+
+Every triage request starts with the same block: role, Company Handbook
+rules, approval policy and JSON schema. Rebuilding it means re-reading the
+handbook from disk for every note. PromptPrefix renders it once and keeps it
+in memory, shared by all worker threads:
+
+  - Invalidation : one stat() per get(); a changed mtime/size (or an explicit
+                   invalidate(), e.g. from a watchdog event) triggers a rebuild
+  - Stable first : callers put this prefix at the very start of the prompt and
+                   append per-item text after it, so provider-side prompt
+                   caching can reuse the common prefix
+  - version      : short hash of the rendered prefix, usable in cache keys
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+log = logging.getLogger("PromptPrefix")
+
+
+class PromptPrefix:
+    """
+    *render(source_text)* turns the source file's text ("" if missing) into the
+    prefix string. It runs only when the file changes.
+    """
+
+    def __init__(self, source: Path | str, render: Callable[[str], str]):
+        self.source = Path(source)
+        self.render = render
+        self._lock = threading.Lock()
+        self._signature: tuple | None = None
+        self._text = ""
+        self._version = ""
+        self.rebuilds = 0
+        self.last_build_ms = 0.0
+
+    def _stat_signature(self) -> tuple:
+        try:
+            st = self.source.stat()
+        except FileNotFoundError:
+            return ("missing",)
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self) -> str:
+        signature = self._stat_signature()
+        with self._lock:
+            if signature != self._signature:
+                started = time.perf_counter()
+                try:
+                    source_text = self.source.read_text(encoding="utf-8")
+                except FileNotFoundError:
+                    source_text = ""
+                self._text = self.render(source_text)
+                self._version = hashlib.sha256(self._text.encode("utf-8")).hexdigest()[:16]
+                self._signature = signature
+                self.rebuilds += 1
+                self.last_build_ms = (time.perf_counter() - started) * 1000
+                log.info("Prompt prefix rebuilt from %s (version %s)", self.source.name, self._version)
+            return self._text
+
+    @property
+    def version(self) -> str:
+        self.get()
+        return self._version
+
+    def invalidate(self):
+        with self._lock:
+            self._signature = None
@@ -0,0 +1,321 @@
+"""
+rate_limiter.py – Shared Groq rate limiter and daily token budgets
+
+Groq's requests/min and tokens/min limits are shared by every component that
+calls it (Orchestrator triage, reasoning loop, cloud/local agents, CEO
+briefing, LinkedIn drafts). Without coordination a long CEO briefing can
+drain the token window and live triage then hits 429 retry storms.
+
+  - Token buckets  : requests/min and tokens/min, refilled continuously and
+                     corrected from the provider's x-ratelimit-* headers, so
+                     usage by other processes on the same key is accounted for
+  - Priority lanes : "triage" may use the whole window; "batch" jobs wait
+                     while triage requests are queued and never dip into the
+                     LLM_BATCH_RESERVE fraction kept for triage
+  - Daily budgets  : per-component token caps (LLM_DAILY_BUDGETS), persisted in
+                     <vault>/.cache/llm_budget.json so restarts don't reset them;
+                     over budget → BudgetExceeded, no request is sent.
+                     Usage is counted in memory at once and merged into the
+                     file every LLM_BUDGET_FLUSH_INTERVAL s on a timer thread,
+                     so record() never does file I/O on the event loop
+
+The ReasoningExecutor calls acquire() before and record() after every request.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Mapping, Optional
+
+from vault_io import atomic_write_text
+
+log = logging.getLogger("RateLimiter")
+
+LANE_TRIAGE = "triage"
+LANE_BATCH = "batch"
+
+LLM_RPM = float(os.getenv("LLM_RPM", "30"))
+LLM_TPM = float(os.getenv("LLM_TPM", "12000"))
+LLM_BATCH_RESERVE = float(os.getenv("LLM_BATCH_RESERVE", "0.3"))
+# "triage=500000,ceo_briefing=60000" — components not listed are unlimited
+LLM_DAILY_BUDGETS = os.getenv("LLM_DAILY_BUDGETS", "")
+LLM_BUDGET_FLUSH_INTERVAL = float(os.getenv("LLM_BUDGET_FLUSH_INTERVAL", "5"))
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class BudgetExceeded(RuntimeError):
+    """A component has used up its daily token budget."""
+
+
+def parse_duration(value: Optional[str]) -> float:
+    """Parse Groq reset durations such as '7.66s', '2m59.56s', '120ms' → seconds."""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(n) * units[u] for n, u in _DURATION_RE.findall(value))
+
+
+def parse_budgets(spec: str) -> dict[str, int]:
+    budgets = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, _, amount = part.partition("=")
+            try:
+                budgets[name.strip()] = int(float(amount))
+            except ValueError:
+                log.warning("Ignoring bad LLM_DAILY_BUDGETS entry: %s", part)
+    return budgets
+
+
+def estimate_tokens(kwargs: Mapping) -> int:
+    """Rough request size: ~4 chars per prompt token plus the completion cap."""
+    chars = sum(len(str(m.get("content") or "")) for m in kwargs.get("messages", []))
+    return chars // 4 + int(kwargs.get("max_tokens") or 1024)
+
+
+class TokenBucket:
+    """Continuously refilling bucket of *capacity* units per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = max(1.0, per_minute)
+        self.level = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float, floor: float = 0.0, now: Optional[float] = None) -> float:
+        """Seconds until *amount* can be taken while leaving *floor* behind (0 = now)."""
+        now = now if now is not None else time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        amount = min(amount, self.capacity - floor)     # oversized requests wait for a full bucket
+        missing = amount + floor - self.level
+        return 0.0 if missing <= 0 else missing * 60.0 / self.capacity
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def refund(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], reset_s: float, now: float):
+        """Apply the provider's view of this window."""
+        self._refill(now)
+        if limit:
+            self.capacity = max(1.0, limit)
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+            if remaining <= 0 and reset_s:
+                self.blocked_until = max(self.blocked_until, now + reset_s)
+
+
+class RateLimiter:
+    """Process-wide limiter shared by every LLM call site in the process."""
+
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM,
+                 batch_reserve: float = LLM_BATCH_RESERVE,
+                 budgets: Optional[dict[str, int]] = None,
+                 budget_path: Optional[Path] = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.batch_reserve = min(max(batch_reserve, 0.0), 0.9)
+        self.budgets = parse_budgets(LLM_DAILY_BUDGETS) if budgets is None else budgets
+        self.budget_path = budget_path or Path(
+            os.getenv("LLM_BUDGET_PATH",
+                      str(Path(os.getenv("VAULT_PATH", "./Vault")) / ".cache" / "llm_budget.json"))
+        )
+        self._lock = threading.Lock()
+        self._waiting = {LANE_TRIAGE: 0, LANE_BATCH: 0}
+        self._counts = {"throttled": 0, "throttle_seconds": 0.0, "rate_limited": 0, "budget_rejections": 0}
+        self._usage_day = date.today().isoformat()
+        self._usage: dict[str, int] = self._load_usage()
+        self._pending: dict[str, int] = {}            # recorded, not yet in the file
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()           # one file read-modify-write at a time
+        atexit.register(self.flush)
+
+    # ── Budgets ────────────────────────────────────────────────────────────────
+    def _load_usage(self, day: Optional[str] = None) -> dict[str, int]:
+        try:
+            data = json.loads(self.budget_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data.get("usage", {}) if data.get("day") == (day or self._usage_day) else {}
+
+    def _add_usage_locked(self, component: str, tokens: int):
+        """Count *tokens* now; the file catches up on the next flush."""
+        self._roll_day_locked()
+        self._usage[component] = self._usage.get(component, 0) + tokens
+        self._pending[component] = self._pending.get(component, 0) + tokens
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(LLM_BUDGET_FLUSH_INTERVAL, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Read-modify-write the pending usage so processes sharing the vault add up."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, {}
+            day = self._usage_day
+        if not pending:
+            return
+        with self._flush_lock:
+            usage = self._load_usage(day)
+            for component, tokens in pending.items():
+                usage[component] = usage.get(component, 0) + tokens
+            try:
+                self.budget_path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(self.budget_path, json.dumps({"day": day, "usage": usage}))
+            except OSError as exc:
+                log.warning("Could not persist LLM budget usage: %s", exc)
+        with self._lock:
+            if day == self._usage_day:
+                # Other processes' usage from the file + ours recorded since
+                self._usage = {k: usage.get(k, 0) + self._pending.get(k, 0)
+                               for k in usage.keys() | self._pending.keys()}
+
+    def _roll_day_locked(self):
+        today = date.today().isoformat()
+        if today != self._usage_day:
+            self._usage_day = today
+            self._usage = {}
+            self._pending = {}                  # yesterday's unflushed tail no longer counts
+
+    def check_budget(self, component: str, tokens: int):
+        with self._lock:
+            self._roll_day_locked()
+            budget = self.budgets.get(component)
+            if budget is not None and self._usage.get(component, 0) + tokens > budget:
+                self._counts["budget_rejections"] += 1
+                raise BudgetExceeded(
+                    f"{component} daily LLM budget exhausted "
+                    f"({self._usage.get(component, 0)}/{budget} tokens)"
+                )
+
+    # ── Acquire / record ───────────────────────────────────────────────────────
+    def _try_acquire(self, lane: str, tokens: int) -> float:
+        with self._lock:
+            if lane == LANE_BATCH and self._waiting[LANE_TRIAGE] > 0:
+                return 0.25                      # triage is queued — let it go first
+            reserve = self.batch_reserve if lane == LANE_BATCH else 0.0
+            now = time.monotonic()
+            wait = max(
+                self.requests.wait_time(1, reserve * self.requests.capacity, now),
+                self.tokens.wait_time(tokens, reserve * self.tokens.capacity, now),
+            )
+            if wait <= 0:
+                self.requests.take(1)
+                self.tokens.take(tokens)
+            return wait
+
+    async def acquire(self, lane: str, tokens: int, component: str = "default"):
+        """Wait (on the event loop) until *lane* may send a request of ~*tokens*."""
+        self.check_budget(component, tokens)
+        lane = lane if lane in self._waiting else LANE_TRIAGE
+        with self._lock:
+            self._waiting[lane] += 1
+        waited = 0.0
+        try:
+            while True:
+                wait = self._try_acquire(lane, tokens)
+                if wait <= 0:
+                    break
+                wait = min(wait, 5.0)
+                waited += wait
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting[lane] -= 1
+                if waited:
+                    self._counts["throttled"] += 1
+                    self._counts["throttle_seconds"] += waited
+
+    def record(self, component: str, estimated: int, used: Optional[int],
+               headers: Optional[Mapping] = None):
+        """Reconcile the estimate with real usage and the provider's headers."""
+        with self._lock:
+            if used is not None:
+                self.tokens.refund(estimated - used)
+                if used:
+                    self._add_usage_locked(component, used)
+            if headers:
+                self._sync_headers_locked(headers)
+
+    def on_rate_limited(self, headers: Optional[Mapping]):
+        """A 429 came back: block both windows until the provider says so."""
+        with self._lock:
+            self._counts["rate_limited"] += 1
+            now = time.monotonic()
+            retry_after = parse_duration((headers or {}).get("retry-after"))
+            if retry_after:
+                self.tokens.blocked_until = max(self.tokens.blocked_until, now + retry_after)
+            if headers:
+                self._sync_headers_locked(headers)
+
+    def _sync_headers_locked(self, headers: Mapping):
+        def _num(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        now = time.monotonic()
+        # Groq's request headers describe the per-day window; only honour exhaustion
+        remaining_requests = _num("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests <= 0:
+            reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+            self.requests.blocked_until = max(self.requests.blocked_until, now + reset)
+        self.tokens.sync(
+            _num("x-ratelimit-limit-tokens"),
+            _num("x-ratelimit-remaining-tokens"),
+            parse_duration(headers.get("x-ratelimit-reset-tokens")),
+            now,
+        )
+
+    # ── Metrics ────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            self._roll_day_locked()
+            now = time.monotonic()
+            self.tokens._refill(now)
+            self.requests._refill(now)
+            return {
+                **{k: round(v, 2) if isinstance(v, float) else v for k, v in self._counts.items()},
+                "waiting": dict(self._waiting),
+                "tokens_available": int(self.tokens.level),
+                "tokens_per_min": int(self.tokens.capacity),
+                "requests_available": round(self.requests.level, 1),
+                "usage_today": dict(self._usage),
+                "budgets": dict(self.budgets),
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,276 @@
+"""
+reasoning_executor.py – Async Groq execution path
+
+A blocking chat.completions call parks one OS thread for the whole round trip.
+With a few workers that caps in-flight Groq requests at the worker count, and
+raising it means hundreds of idle threads. The executor instead runs every
+request on one asyncio event loop (dedicated daemon thread) with the async
+Groq client:
+
+  caller thread ──submit(**kwargs)──▶ Future ◀── event loop ── AsyncGroq
+                                                   │
+                                                   └─ global semaphore (LLM_MAX_CONCURRENCY)
+
+  - submit()         : non-blocking, returns a concurrent.futures.Future
+  - complete()       : blocking convenience wrapper for scripts / sync code
+  - complete_text()  : single user prompt → reply text
+  - retries          : 429 / 5xx / connection errors retried with backoff on
+                       the loop (no thread sleeps); other 4xx fail immediately
+  - rate limiting    : every attempt first waits for the shared RateLimiter
+                       (lane + component), which is fed the response headers
+  - tracing          : with TRACE_RECORD on, answers go to the vault_trace
+                       recorder for offline replay
+  - then(fut, fn)    : chain a cheap transformation onto a Future
+
+One executor per process (get_reasoning_executor()), so the semaphore really is
+global for the Orchestrator, agents and scripts living in that process.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from metrics import get_metrics
+from rate_limiter import LANE_TRIAGE, RateLimiter, estimate_tokens, get_rate_limiter
+from vault_trace import get_trace_recorder
+
+log = logging.getLogger("ReasoningExecutor")
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "3"))
+LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "2.0"))
+
+_LLM_SECONDS = get_metrics().histogram(
+    "ai_employee_llm_request_seconds", "LLM API call latency per attempt", ("component", "outcome"))
+_LLM_TOKENS = get_metrics().counter(
+    "ai_employee_llm_tokens_total", "Tokens reported by the LLM API", ("component", "kind"))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Rate limits, server errors and transport failures are worth retrying."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        return not isinstance(exc, (ValueError, TypeError, PermissionError))
+    return status == 429 or status >= 500
+
+
+def _default_client_factory():
+    """Client of the provider selected by LLM_PROVIDER (see llm_gateway)."""
+    from llm_gateway import get_provider
+    return get_provider().create_client()
+
+
+def then(future: Future, fn: Callable[[Any], Any]) -> Future:
+    """Return a Future resolved with fn(result); exceptions propagate."""
+    out: Future = Future()
+
+    def _done(f: Future):
+        try:
+            out.set_result(fn(f.result()))
+        except BaseException as exc:
+            out.set_exception(exc)
+
+    future.add_done_callback(_done)
+    return out
+
+
+class ReasoningExecutor:
+    """Runs chat.completions requests concurrently on a private event loop."""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        retries: int = LLM_RETRIES,
+        backoff: float = LLM_RETRY_BACKOFF,
+        client_factory: Callable[[], Any] = _default_client_factory,
+        name: str = "reasoning",
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.client_factory = client_factory
+        self.name = name
+        self.limiter = limiter or get_rate_limiter()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client = None
+
+        # Metrics — in-flight/latency counters are only written on the loop thread
+        self._stats_lock = threading.Lock()
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "retries": 0}
+        self._in_flight = 0
+        self._waiting = 0
+        self._max_in_flight = 0
+        self._latencies: deque = deque(maxlen=1000)
+        self._usage: dict[str, dict] = {}       # component → request/token totals
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_loop, daemon=True, name=f"{self.name}-loop")
+            self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._ready.set()
+        log.info("%s: event loop started (max %d concurrent requests)", self.name, self.max_concurrency)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def shutdown(self, timeout: float = 5.0):
+        if self._loop is None or self._thread is None:
+            return
+        if self._client is not None and hasattr(self._client, "close"):
+            try:
+                asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result(timeout)
+            except Exception:
+                pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=timeout)
+
+    # ── Requests ───────────────────────────────────────────────────────────────
+    async def _send(self, kwargs: dict) -> tuple[Any, Any]:
+        """One API call; returns (response, headers) — headers via the raw-response API."""
+        completions = self._client.chat.completions
+        raw_api = getattr(completions, "with_raw_response", None)
+        if raw_api is None:
+            return await completions.create(**kwargs), None
+        raw = await raw_api.create(**kwargs)
+        return await raw.parse(), raw.headers
+
+    async def _create(self, kwargs: dict, lane: str, component: str):
+        if self._client is None:
+            self._client = self.client_factory()
+        estimated = estimate_tokens(kwargs)
+        try:
+            for attempt in range(1, self.retries + 1):
+                self._waiting += 1
+                try:
+                    await self.limiter.acquire(lane, estimated, component)
+                    await self._semaphore.acquire()
+                finally:
+                    self._waiting -= 1
+                self._in_flight += 1
+                self._max_in_flight = max(self._max_in_flight, self._in_flight)
+                started = time.monotonic()
+                try:
+                    response, headers = await self._send(kwargs)
+                except Exception as exc:
+                    headers = getattr(getattr(exc, "response", None), "headers", None)
+                    _LLM_SECONDS.observe(time.monotonic() - started, component=component, outcome="error")
+                    if getattr(exc, "status_code", None) == 429:
+                        self.limiter.on_rate_limited(headers)
+                    self.limiter.record(component, estimated, 0, headers)
+                    if attempt == self.retries or not _is_retryable(exc):
+                        raise
+                    delay = self.backoff ** attempt
+                    with self._stats_lock:
+                        self._counts["retries"] += 1
+                    log.warning("%s: attempt %d/%d failed (%s) — retrying in %.1fs",
+                                self.name, attempt, self.retries, exc, delay)
+                else:
+                    usage = getattr(response, "usage", None)
+                    self.limiter.record(component, estimated, getattr(usage, "total_tokens", None), headers)
+                    latency = time.monotonic() - started
+                    # stats() reads these from other threads: mutate under the lock
+                    with self._stats_lock:
+                        self._account(component, usage)
+                        self._counts["completed"] += 1
+                        self._latencies.append(latency)
+                    _LLM_SECONDS.observe(latency, component=component, outcome="ok")
+                    recorder = get_trace_recorder()
+                    if recorder is not None:
+                        recorder.llm(component, kwargs, response, latency)
+                    return response
+                finally:
+                    self._in_flight -= 1
+                    self._semaphore.release()
+                await asyncio.sleep(delay)
+        except Exception:
+            with self._stats_lock:
+                self._counts["failed"] += 1
+            raise
+
+    def _account(self, component: str, usage):
+        totals = self._usage.setdefault(
+            component, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        )
+        totals["requests"] += 1
+        for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            totals[field] += getattr(usage, field, 0) or 0
+        for kind in ("prompt", "completion"):
+            _LLM_TOKENS.inc(getattr(usage, f"{kind}_tokens", 0) or 0, component=component, kind=kind)
+
+    def submit(self, lane: str = LANE_TRIAGE, component: str = "default", **kwargs) -> Future:
+        """
+        Queue one chat.completions.create(**kwargs) call; returns a Future.
+        *lane* picks the rate-limit priority lane, *component* the daily budget.
+        """
+        self.start()
+        with self._stats_lock:
+            self._counts["submitted"] += 1
+        return asyncio.run_coroutine_threadsafe(self._create(kwargs, lane, component), self._loop)
+
+    def complete(self, timeout: Optional[float] = None, **kwargs):
+        """Blocking form of submit() for sync callers."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("complete() would deadlock on the reasoning loop thread")
+        return self.submit(**kwargs).result(timeout)
+
+    def complete_text(self, prompt: str, model: str, max_tokens: int = 1024, **kwargs) -> str:
+        response = self.complete(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs,
+        )
+        return response.choices[0].message.content
+
+    # ── Metrics ────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._stats_lock:
+            counts = dict(self._counts)
+            latencies = sorted(self._latencies)
+            usage = {name: dict(totals) for name, totals in self._usage.items()}
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        return {
+            **counts,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_in_flight_seen": self._max_in_flight,
+            "max_concurrency": self.max_concurrency,
+            "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+            "latency_p95_ms": round(p95 * 1000, 1),
+            "usage": usage,
+        }
+
+
+# ── Per-process shared instance ────────────────────────────────────────────────
+_executor: Optional[ReasoningExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_reasoning_executor() -> ReasoningExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ReasoningExecutor()
+        return _executor
@@ -0,0 +1,342 @@
+"""
+seen_store.py – Persistent, bounded "already processed?" sets for watchers
+
+Every watcher kept the IDs it had handled in a plain set(): it grew for the
+life of the process and was gone after every restart by watchdog_monitor, so
+the same emails, chats and files were written to Needs_Action — and sent to
+Groq — again. A SeenSet replaces those sets:
+
+  "msg-123" in seen ──▶ TimeWindowBloom  ── definitely new ──▶ False  (no I/O)
+                             │ maybe seen
+                             ▼
+                        SQLite seen(ns, key, seen_at)  ── exact answer
+
+  seen.add("msg-123") ──▶ bloom (current generation) + upsert (seen_at refreshed)
+
+  - one database per vault (<vault>/.cache/seen.sqlite3, SEEN_DB_PATH),
+    one namespace per watcher ("gmail", "whatsapp", "drop_folder", ...)
+  - the bloom filter is a ring of generations covering SEEN_RETENTION_DAYS;
+    a generation is sealed after retention / SEEN_BLOOM_GENERATIONS or once
+    it holds SEEN_BLOOM_CAPACITY keys, and dropped when its newest key
+    leaves the window. It is rebuilt from the database on startup.
+  - compaction (every SEEN_COMPACT_INTERVAL s, on the next add) deletes rows
+    older than the retention window and keeps at most SEEN_MAX_KEYS per
+    namespace, newest first
+
+The same database keeps named sync cursors (get_cursor/set_cursor), e.g.
+the Gmail watcher's last historyId, so a watcher's "seen" state and its
+position in the source survive restarts together.
+
+Keys older than the retention window count as new again — pick a window
+longer than any source re-delivers items (Gmail keeps unread mail listed).
+A namespace whose keys are not unique forever (WhatsApp keys on chat text)
+can ask for a shorter window: namespace(ns, retention_days=...).
+A namespace must be written by one process: other processes' blooms don't
+see its adds.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+log = logging.getLogger("SeenStore")
+
+SEEN_RETENTION_DAYS = float(os.getenv("SEEN_RETENTION_DAYS", "90"))
+SEEN_MAX_KEYS = int(os.getenv("SEEN_MAX_KEYS", "200000"))                  # per namespace
+SEEN_BLOOM_CAPACITY = int(os.getenv("SEEN_BLOOM_CAPACITY", "50000"))       # keys per generation
+SEEN_BLOOM_ERROR_RATE = float(os.getenv("SEEN_BLOOM_ERROR_RATE", "0.01"))
+SEEN_BLOOM_GENERATIONS = int(os.getenv("SEEN_BLOOM_GENERATIONS", "6"))
+SEEN_COMPACT_INTERVAL = float(os.getenv("SEEN_COMPACT_INTERVAL", "3600"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    ns      TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_seen_ns_seen_at ON seen(ns, seen_at);
+CREATE TABLE IF NOT EXISTS cursors (
+    name       TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def default_seen_path(vault: Path) -> Path:
+    return Path(os.getenv("SEEN_DB_PATH", str(Path(vault) / ".cache" / "seen.sqlite3")))
+
+
+# ── Bloom filter ───────────────────────────────────────────────────────────────
+class _BloomGeneration:
+    """Fixed-size bloom filter (double hashing over one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int, error_rate: float, started: float):
+        self.bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+        self.started = started
+        self.newest = started
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str, when: float):
+        for pos in self._positions(key):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+        self.newest = max(self.newest, when)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TimeWindowBloom:
+    """Ring of bloom generations covering the last *window* seconds."""
+
+    def __init__(self, window: float, capacity: int = SEEN_BLOOM_CAPACITY,
+                 error_rate: float = SEEN_BLOOM_ERROR_RATE, generations: int = SEEN_BLOOM_GENERATIONS):
+        self.window = window
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.span = window / max(1, generations)
+        self._generations: list[_BloomGeneration] = []
+
+    def add(self, key: str, when: Optional[float] = None):
+        when = time.time() if when is None else when
+        current = self._generations[-1] if self._generations else None
+        if current is None or current.count >= self.capacity or when - current.started >= self.span:
+            current = _BloomGeneration(self.capacity, self.error_rate, when)
+            self._generations.append(current)
+        current.add(key, when)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in generation for generation in self._generations)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop generations whose newest key is older than the window."""
+        cutoff = (time.time() if now is None else now) - self.window
+        before = len(self._generations)
+        self._generations = [g for g in self._generations if g.newest >= cutoff]
+        return before - len(self._generations)
+
+    def stats(self) -> dict:
+        return {
+            "generations": len(self._generations),
+            "keys": sum(g.count for g in self._generations),
+            "bytes": sum(len(g._array) for g in self._generations),
+        }
+
+
+# ── Store ──────────────────────────────────────────────────────────────────────
+class SeenStore:
+    """The SQLite side: one connection per database per process, shared by namespaces."""
+
+    def __init__(self, db_path: Path | str, retention_days: float = SEEN_RETENTION_DAYS,
+                 max_keys: int = SEEN_MAX_KEYS, compact_interval: float = SEEN_COMPACT_INTERVAL):
+        self.db_path = Path(db_path)
+        self.retention = retention_days * 86400
+        self.max_keys = max_keys
+        self.compact_interval = compact_interval
+        self._lock = threading.Lock()
+        self._sets: dict[str, "SeenSet"] = {}
+        self._last_compact = 0.0
+        self._counts = {"compactions": 0, "expired": 0, "trimmed": 0}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def namespace(self, ns: str, retention_days: Optional[float] = None) -> "SeenSet":
+        """The SeenSet for *ns*; *retention_days* overrides the store's window for it."""
+        with self._lock:
+            seen = self._sets.get(ns)
+        if seen is None:
+            retention = self.retention if retention_days is None else retention_days * 86400
+            seen = SeenSet(self, ns, retention)      # loads the bloom — outside the lock
+            with self._lock:
+                seen = self._sets.setdefault(ns, seen)
+        return seen
+
+    # ── SQL (callers hold no lock) ─────────────────────────────────────────────
+    def _load(self, ns: str, since: float) -> list[tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, seen_at FROM seen WHERE ns = ? AND seen_at >= ? ORDER BY seen_at", (ns, since),
+            ).fetchall()
+
+    def _exists(self, ns: str, key: str, since: float) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM seen WHERE ns = ? AND key = ? AND seen_at >= ?", (ns, key, since),
+            ).fetchone() is not None
+
+    def _insert(self, ns: str, rows: list[tuple[str, float]]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen(ns, key, seen_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(ns, key) DO UPDATE SET seen_at = excluded.seen_at",
+                [(ns, key, when) for key, when in rows],
+            )
+            self._conn.commit()
+        if time.time() - self._last_compact >= self.compact_interval:
+            self.compact()
+
+    def _delete(self, ns: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM seen WHERE ns = ? AND key = ?", (ns, key))
+            self._conn.commit()
+
+    # ── Cursors ────────────────────────────────────────────────────────────────
+    def get_cursor(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, name: str, value: Optional[str]):
+        """Store *value* under *name* (None deletes it)."""
+        with self._lock:
+            if value is None:
+                self._conn.execute("DELETE FROM cursors WHERE name = ?", (name,))
+            else:
+                self._conn.execute(
+                    "INSERT INTO cursors(name, value, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    (name, str(value), time.time()),
+                )
+            self._conn.commit()
+
+    # ── Maintenance ────────────────────────────────────────────────────────────
+    def compact(self) -> dict:
+        """Delete rows past the retention window and trim each namespace to max_keys."""
+        now = time.time()
+        self._last_compact = now
+        with self._lock:
+            expired = trimmed = 0
+            for (ns,) in self._conn.execute("SELECT DISTINCT ns FROM seen").fetchall():
+                seen = self._sets.get(ns)
+                retention = seen.retention if seen is not None else self.retention
+                expired += self._conn.execute(
+                    "DELETE FROM seen WHERE ns = ? AND seen_at < ?", (ns, now - retention),
+                ).rowcount
+                if self.max_keys:
+                    cutoff = self._conn.execute(
+                        "SELECT seen_at, key FROM seen WHERE ns = ? ORDER BY seen_at DESC, key DESC LIMIT 1 OFFSET ?",
+                        (ns, self.max_keys - 1),
+                    ).fetchone()
+                    if cutoff is not None:
+                        trimmed += self._conn.execute(
+                            "DELETE FROM seen WHERE ns = ? AND (seen_at < ? OR (seen_at = ? AND key < ?))",
+                            (ns, cutoff[0], cutoff[0], cutoff[1]),
+                        ).rowcount
+            self._conn.commit()
+            self._counts["compactions"] += 1
+            self._counts["expired"] += expired
+            self._counts["trimmed"] += trimmed
+            sets = list(self._sets.values())
+        for seen in sets:
+            seen.bloom.expire(now)
+        if expired or trimmed:
+            log.info("Seen store compacted: %d expired, %d trimmed", expired, trimmed)
+        return {"expired": expired, "trimmed": trimmed}
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT ns, COUNT(*) FROM seen GROUP BY ns").fetchall())
+            counts = dict(self._counts)
+            sets = dict(self._sets)
+        return {**counts, "namespaces": {ns: {**s.stats(), "rows": rows.get(ns, 0)} for ns, s in sets.items()}}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SeenSet:
+    """
+    Set-like view of one namespace: `key in seen`, seen.add(key).
+
+        seen = get_seen_set(VAULT_PATH, "gmail")
+        new = [m for m in messages if m["id"] not in seen]
+        ...
+        seen.add(m["id"])
+    """
+
+    def __init__(self, store: SeenStore, ns: str, retention: Optional[float] = None):
+        self.store = store
+        self.ns = ns
+        self.retention = store.retention if retention is None else retention
+        self.bloom = TimeWindowBloom(self.retention)
+        self._counts = {"lookups": 0, "bloom_negative": 0, "false_positives": 0, "adds": 0}
+        self._lock = threading.Lock()
+        for key, when in store._load(ns, time.time() - self.retention):
+            self.bloom.add(key, when)
+
+    def __contains__(self, key) -> bool:
+        key = str(key)
+        with self._lock:
+            self._counts["lookups"] += 1
+            if key not in self.bloom:
+                self._counts["bloom_negative"] += 1
+                return False
+        found = self.store._exists(self.ns, key, time.time() - self.retention)
+        if not found:
+            with self._lock:
+                self._counts["false_positives"] += 1
+        return found
+
+    def add(self, key):
+        self.update((key,))
+
+    def update(self, keys: Iterable):
+        now = time.time()
+        rows = [(str(key), now) for key in keys]
+        if not rows:
+            return
+        with self._lock:
+            for key, when in rows:
+                self.bloom.add(key, when)
+            self._counts["adds"] += len(rows)
+        self.store._insert(self.ns, rows)
+
+    def discard(self, key):
+        """Forget *key* (it stays a bloom 'maybe'; the database answers no)."""
+        self.store._delete(self.ns, str(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counts, "bloom": self.bloom.stats()}
+
+
+# ── Per-process shared instance ────────────────────────────────────────────────
+_stores: dict[str, SeenStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_seen_store(vault: Path | str) -> SeenStore:
+    """One SeenStore per database path per process."""
+    path = default_seen_path(Path(vault))
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = _stores[str(path)] = SeenStore(path)
+        return store
+
+
+def get_seen_set(vault: Path | str, namespace: str, retention_days: Optional[float] = None) -> SeenSet:
+    return get_seen_store(vault).namespace(namespace, retention_days)
@@ -1,11 +1,18 @@
 """
 Vault Skill – Read/write Markdown notes in the Obsidian vault.
 """
-import os
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from done_archive import get_done_archive
+from vault_io import atomic_write_text
+
 
 class VaultSkill:
     """
@@ -60,7 +67,10 @@ class VaultSkill:
         safe_title = re.sub(r"[^\w\- ]", "", title).strip().replace(" ", "_")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{timestamp}_{safe_title}.md"
-        filepath = self.vault / folder / filename
+        if folder == "Done":
+            filepath = get_done_archive(self.vault).destination(filename)
+        else:
+            filepath = self.vault / folder / filename
 
         tag_str = ""
         if tags:
@@ -75,7 +85,7 @@ created: {datetime.now().isoformat()}{tag_str}
 
 {body}
 """
-        filepath.write_text(note, encoding="utf-8")
+        atomic_write_text(filepath, note, encoding="utf-8")
         return filepath
 
     def move_note(self, note_path: Path | str, target_folder: str) -> Path:
@@ -85,6 +95,8 @@ created: {datetime.now().isoformat()}{tag_str}
         note_path = Path(note_path)
         if target_folder not in self.FOLDERS:
             raise ValueError(f"target_folder must be one of {self.FOLDERS}")
+        if target_folder == "Done":
+            return get_done_archive(self.vault).archive(note_path)
         dest = self.vault / target_folder / note_path.name
         note_path.rename(dest)
         return dest
@@ -107,21 +119,29 @@ created: {datetime.now().isoformat()}{tag_str}
             f"> Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             new_content,
         )
-        dashboard.write_text(new_content, encoding="utf-8")
+        atomic_write_text(dashboard, new_content, encoding="utf-8")
 
     # ------------------------------------------------------------------
     # Read helpers
     # ------------------------------------------------------------------
 
-    def list_notes(self, folder: str) -> list[dict]:
+    def list_notes(self, folder: str, month: str | None = None) -> list[dict]:
         """
         List all notes in *folder* with metadata.
+
+        Done is sharded by month (Done/YYYY/MM/): it lists *month*
+        ("YYYY-MM", default: the current month) plus any not-yet-compacted
+        notes directly in Done/.
         """
         if folder not in self.FOLDERS:
             raise ValueError(f"folder must be one of {self.FOLDERS}")
         folder_path = self.vault / folder
+        files = list(folder_path.glob("*.md"))
+        if folder == "Done":
+            year, mm = (month or datetime.now().strftime("%Y-%m")).split("-")
+            files += (folder_path / year / mm).glob("*.md")
         notes = []
-        for f in sorted(folder_path.glob("*.md")):
+        for f in sorted(files):
             notes.append(
                 {
                     "path": str(f),
@@ -0,0 +1,160 @@
+"""
+triage_batcher.py – Micro-batching for Groq triage calls
+
+During a burst (webhook flood, backlog drain) every item would send its own
+chat.completions request, each repeating the handbook prefix and JSON schema.
+TriageBatcher hands items to one collector thread, which packs up to
+BATCH_SIZE items (or whatever arrived within MAX_WAIT seconds) into a single
+request.
+
+  submit() ─┐
+  submit() ─┼─▶ collector ─▶ batch_fn([(key, payload), ...]) ─▶ Future{key: result}
+  submit() ─┘                       │
+                                    └─ missing / malformed key → single_fn(key, payload)
+
+Both functions return Futures (see reasoning_executor), so nothing here
+blocks on the network. A failed batch call or an item missing from the
+response is never lost: it is re-issued as a single-item call.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+log = logging.getLogger("TriageBatcher")
+
+
+def _forward(src: Future, dest: Future):
+    """Resolve *dest* with *src*'s outcome once it is done."""
+    def _done(f: Future):
+        exc = f.exception()
+        if exc is not None:
+            dest.set_exception(exc)
+        else:
+            dest.set_result(f.result())
+    src.add_done_callback(_done)
+
+
+class TriageBatcher:
+    """
+    *batch_fn(items)*  – items is a list of (key, payload); returns a Future of
+                         {key: result}. Keys absent from the dict fall back to
+                         single calls.
+    *single_fn(key, payload)* – one-item call returning a Future; also used
+                         when batch_size <= 1.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], Future],
+        single_fn: Callable[[Hashable, Any], Future],
+        batch_size: int = 4,
+        max_wait: float = 0.5,
+        name: str = "triage",
+    ):
+        self.batch_fn = batch_fn
+        self.single_fn = single_fn
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.name = name
+
+        self._pending: list[tuple] = []        # (key, payload, future, enqueued_at)
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._counts = {"batches": 0, "batched_items": 0, "single_calls": 0, "fallbacks": 0}
+        self._counts_lock = threading.Lock()
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+    def submit(self, key: Hashable, payload: Any) -> Future:
+        """Queue one item; the Future resolves with its result."""
+        if self.batch_size <= 1:
+            return self._single(key, payload)
+
+        fut: Future = Future()
+        with self._cond:
+            self._ensure_started()
+            self._pending.append((key, payload, fut, time.monotonic()))
+            self._cond.notify()
+        return fut
+
+    def triage(self, key: Hashable, payload: Any) -> Any:
+        """Blocking form of submit()."""
+        return self.submit(key, payload).result()
+
+    def stats(self) -> dict:
+        with self._counts_lock:
+            counts = dict(self._counts)
+        with self._cond:
+            counts["waiting"] = len(self._pending)
+        counts["avg_batch_size"] = (
+            round(counts["batched_items"] / counts["batches"], 2) if counts["batches"] else 0.0
+        )
+        counts.update(batch_size=self.batch_size, max_wait_s=self.max_wait)
+        return counts
+
+    # ── Internals ──────────────────────────────────────────────────────────────
+    def _single(self, key: Hashable, payload: Any) -> Future:
+        with self._counts_lock:
+            self._counts["single_calls"] += 1
+        try:
+            return self.single_fn(key, payload)
+        except Exception as exc:
+            failed: Future = Future()
+            failed.set_exception(exc)
+            return failed
+
+    def _fallback(self, key: Hashable, payload: Any, fut: Future):
+        with self._counts_lock:
+            self._counts["fallbacks"] += 1
+        _forward(self._single(key, payload), fut)
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._collector, daemon=True, name=f"{self.name}-batcher")
+            self._thread.start()
+
+    def _collector(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Wait until the batch is full or the oldest item has waited long enough
+                while len(self._pending) < self.batch_size:
+                    remaining = self.max_wait - (time.monotonic() - self._pending[0][3])
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            self._flush(batch)
+
+    def _flush(self, batch: list[tuple]):
+        if len(batch) == 1:
+            # Nothing to share the request with — make a normal call
+            key, payload, fut, _ = batch[0]
+            _forward(self._single(key, payload), fut)
+            return
+        with self._counts_lock:
+            self._counts["batches"] += 1
+            self._counts["batched_items"] += len(batch)
+        try:
+            batch_future = self.batch_fn([(key, payload) for key, payload, _, _ in batch])
+        except Exception as exc:
+            batch_future = Future()
+            batch_future.set_exception(exc)
+
+        def _done(f: Future):
+            exc = f.exception()
+            if exc is not None:
+                log.warning("%s: batch of %d failed (%s) — falling back to single calls",
+                            self.name, len(batch), exc)
+            results = (f.result() or {}) if exc is None else {}
+            for key, payload, fut, _ in batch:
+                if key in results:
+                    fut.set_result(results[key])
+                else:
+                    self._fallback(key, payload, fut)
+
+        batch_future.add_done_callback(_done)
@@ -0,0 +1,190 @@
+"""
+vault_events.py – Coalesced "note ready" events for watched vault folders
+
+watchdog reports what the OS saw, not what we care about. A note can arrive
+in Needs_Action as a create (watcher wrote it), a move (vault_io rename,
+ClaimOrchestrator._fail, a drag in Obsidian) or a burst of modifies (git pull
+in VaultSync, an editor save). Handlers that only implemented on_created
+missed most of these; handlers that react to everything see event storms.
+
+NoteEventCoalescer normalizes them:
+
+  created ─┐
+  modified ├─▶ pending[path] ── quiet for VAULT_EVENT_WINDOW s ──▶ on_ready(path)
+  moved-in ┘        (deadline resets per event, capped at VAULT_EVENT_MAX_DELAY)
+  deleted / moved-out ──▶ pending entry dropped, on_gone(path)
+
+  - one on_ready per path per burst, emitted from a single dispatcher thread
+  - hidden / in-progress files (vault_io temp names) are ignored
+  - a path whose (mtime, size) is unchanged since its last on_ready is skipped
+  - the file must still exist when the window closes
+
+Used by the Needs_Action monitor, the drop-folder watcher and the vault index.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # read-only users of vault_index import this module too
+    FileSystemEventHandler = object
+
+from vault_io import is_temp_name
+
+log = logging.getLogger("VaultEvents")
+
+VAULT_EVENT_WINDOW = float(os.getenv("VAULT_EVENT_WINDOW", "0.5"))
+VAULT_EVENT_MAX_DELAY = float(os.getenv("VAULT_EVENT_MAX_DELAY", "5"))
+_SEEN_MAX = 10_000                       # versions remembered for the unchanged-skip
+
+
+class NoteEventCoalescer(FileSystemEventHandler):
+    """
+    *suffixes* limits which files count (None = any file). *folders*, if given,
+    restricts events to files directly inside those directories — moves out of
+    a watched folder then only count as "gone".
+    """
+
+    def __init__(self, on_ready: Callable[[Path], None],
+                 on_gone: Optional[Callable[[Path], None]] = None,
+                 window: float = VAULT_EVENT_WINDOW,
+                 max_delay: float = VAULT_EVENT_MAX_DELAY,
+                 suffixes: Optional[Iterable[str]] = (".md",),
+                 folders: Optional[Iterable[Path]] = None,
+                 name: str = "vault-events"):
+        super().__init__()
+        self.on_ready = on_ready
+        self.on_gone = on_gone
+        self.window = max(0.0, window)
+        self.max_delay = max(self.window, max_delay)
+        self.suffixes = tuple(suffixes) if suffixes is not None else None
+        self.folders = {Path(f).resolve() for f in folders} if folders is not None else None
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._pending: dict[str, tuple[float, float]] = {}     # path → (deadline, first_seen)
+        self._seen: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._stats = {"events": 0, "ready": 0, "coalesced": 0, "unchanged": 0, "vanished": 0, "gone": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+        self._thread.start()
+
+    # ── watchdog callbacks ─────────────────────────────────────────────────────
+    def on_created(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._gone(event.src_path)
+            self._touch(event.dest_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._gone(event.src_path)
+
+    # ── Coalescing ─────────────────────────────────────────────────────────────
+    def _accepts(self, path: Path) -> bool:
+        if is_temp_name(path.name):
+            return False
+        if self.suffixes is not None and path.suffix not in self.suffixes:
+            return False
+        return self.folders is None or path.parent.resolve() in self.folders
+
+    def _touch(self, src: str):
+        path = Path(src)
+        if not self._accepts(path):
+            return
+        now = time.monotonic()
+        with self._cond:
+            self._stats["events"] += 1
+            previous = self._pending.get(src)
+            if previous is not None:
+                self._stats["coalesced"] += 1
+                first_seen = previous[1]
+            else:
+                first_seen = now
+            self._pending[src] = (min(now + self.window, first_seen + self.max_delay), first_seen)
+            self._cond.notify()
+
+    def _gone(self, src: str):
+        path = Path(src)
+        if is_temp_name(path.name) or (self.suffixes is not None and path.suffix not in self.suffixes):
+            return
+        with self._cond:
+            self._pending.pop(src, None)
+            self._seen.pop(src, None)
+            self._stats["gone"] += 1
+        if self.on_gone is not None:
+            self._call(self.on_gone, path)
+
+    # ── Dispatcher ─────────────────────────────────────────────────────────────
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [p for p, (deadline, _) in self._pending.items() if deadline <= now]
+                    if due:
+                        break
+                    timeout = min((d for d, _ in self._pending.values()), default=now + 3600) - now
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+                for p in due:
+                    del self._pending[p]
+            for p in due:
+                self._dispatch(Path(p))
+
+    def _dispatch(self, path: Path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            with self._cond:
+                self._stats["vanished"] += 1
+            return
+        version = (st.st_mtime_ns, st.st_size)
+        key = str(path)
+        with self._cond:
+            if self._seen.get(key) == version:
+                self._stats["unchanged"] += 1
+                return
+            self._seen[key] = version
+            self._seen.move_to_end(key)
+            while len(self._seen) > _SEEN_MAX:
+                self._seen.popitem(last=False)
+            self._stats["ready"] += 1
+        self._call(self.on_ready, path)
+
+    def _call(self, fn: Callable[[Path], None], path: Path):
+        try:
+            fn(path)
+        except Exception as exc:
+            log.error("%s handler failed for %s: %s", self.name, path.name, exc)
+
+    def flush(self):
+        """Dispatch everything pending now (tests, shutdown)."""
+        with self._cond:
+            due, self._pending = list(self._pending), {}
+        for p in due:
+            self._dispatch(Path(p))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=2)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending), "window_s": self.window}
@@ -0,0 +1,212 @@
+"""
+vault_frontmatter.py – Shared, cached frontmatter reader for vault notes
+
+Every component (Orchestrator, HITL orchestrator, ClaimOrchestrator, Local
+Agent, vault index) needs a couple of frontmatter fields from each note it
+touches. Reading and re-splitting the whole file on every poll is wasted work,
+so this module:
+
+  - reads only up to the closing `---` (bounded, buffered line reads)
+  - returns a typed NoteMeta object
+  - memoizes results keyed by (path, mtime_ns, size) → one parse per file version
+
+Frontmatter format (what the watchers write):
+
+    ---
+    type: email
+    priority: high
+    actions: [
+      {"action": "reply_email", ...}
+    ]
+    ---
+
+Indented / bracket lines are continuations of the previous key, so multi-line
+JSON values such as `actions:` survive intact.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from vault_io import atomic_write_bytes
+
+MAX_HEADER_BYTES = int(os.getenv("FRONTMATTER_MAX_BYTES", "65536"))
+CACHE_SIZE = int(os.getenv("FRONTMATTER_CACHE_SIZE", "4096"))
+
+_KEY_RE = re.compile(r"^([A-Za-z_][\w\-]*)\s*:(.*)$")
+
+
+@dataclass(frozen=True)
+class NoteMeta:
+    """Parsed frontmatter of one note version."""
+    path: Path
+    fields: dict = field(default_factory=dict)
+    header_bytes: int = 0          # byte offset where the body starts (0 = no frontmatter)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.fields.get(key, default)
+
+    def json(self, key: str, default: Any = None) -> Any:
+        """Return a JSON-encoded field (e.g. `actions:`) decoded, or *default*."""
+        raw = self.fields.get(key)
+        if not raw:
+            return default
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return default
+
+    @property
+    def type(self) -> str:
+        return self.fields.get("type", "")
+
+    @property
+    def status(self) -> str:
+        return self.fields.get("status", "")
+
+    @property
+    def priority(self) -> str:
+        return self.fields.get("priority", "")
+
+    @property
+    def action(self) -> str:
+        return self.fields.get("action", "")
+
+
+# ── Parsing ────────────────────────────────────────────────────────────────────
+def parse_frontmatter(text: str) -> dict:
+    """Parse frontmatter from text already in memory."""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+    return _parse_lines(lines[1:])
+
+
+def _parse_lines(lines) -> dict:
+    fields: dict = {}
+    current: Optional[str] = None
+    for line in lines:
+        if line.strip() == "---":
+            break
+        match = _KEY_RE.match(line)
+        if match:
+            current = match.group(1)
+            fields[current] = match.group(2).strip()
+        elif current is not None and line.strip():
+            # Continuation of a multi-line value (e.g. indented JSON)
+            fields[current] = f"{fields[current]}\n{line}" if fields[current] else line
+    return fields
+
+
+def _read_header(path: Path) -> tuple[dict, int]:
+    """Read lines up to the closing `---` (never more than MAX_HEADER_BYTES)."""
+    lines: list[str] = []
+    consumed = 0
+    with path.open("rb") as f:
+        first = f.readline(MAX_HEADER_BYTES)
+        if first.strip() != b"---":
+            return {}, 0
+        consumed = len(first)
+        while consumed < MAX_HEADER_BYTES:
+            raw = f.readline(MAX_HEADER_BYTES - consumed)
+            if not raw:
+                break
+            consumed += len(raw)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line.strip() == "---":
+                return _parse_lines(lines), consumed
+            lines.append(line)
+    # Unterminated or oversized header — use what we have, body offset unknown
+    return _parse_lines(lines), 0
+
+
+def _header_end(data: bytes) -> int:
+    """Byte offset just past the closing `---` in *data* (0 = no complete frontmatter)."""
+    lines = data[:MAX_HEADER_BYTES].splitlines(keepends=True)
+    if not lines or lines[0].strip() != b"---":
+        return 0
+    consumed = len(lines[0])
+    for raw in lines[1:]:
+        consumed += len(raw)
+        if raw.strip() == b"---":
+            return consumed
+    return 0
+
+
+# ── Cache ──────────────────────────────────────────────────────────────────────
+_cache: "OrderedDict[tuple, NoteMeta]" = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def read_frontmatter(path: Path | str) -> NoteMeta:
+    """
+    Return the frontmatter of *path*, parsed at most once per file version.
+    Missing files return an empty NoteMeta.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+    except OSError:
+        return NoteMeta(path=path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    with _cache_lock:
+        meta = _cache.get(key)
+        if meta is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return meta
+        _stats["misses"] += 1
+
+    try:
+        fields, header_bytes = _read_header(path)
+    except OSError:
+        return NoteMeta(path=path)
+    meta = NoteMeta(path=path, fields=fields, header_bytes=header_bytes)
+
+    with _cache_lock:
+        _cache[key] = meta
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return meta
+
+
+def cache_stats() -> dict:
+    with _cache_lock:
+        return {**_stats, "entries": len(_cache)}
+
+
+# ── Writing ────────────────────────────────────────────────────────────────────
+def update_frontmatter_field(path: Path | str, key: str, value: str) -> bool:
+    """
+    Rewrite `key:` inside the frontmatter only (the body is never searched).
+    Returns False if the note has no such field.
+    """
+    path = Path(path)
+    # One read: the boundary is found in these bytes, never taken from the cached
+    # NoteMeta — the note may have changed since it was parsed
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return False
+    end = _header_end(data)
+    if not end:
+        return False
+    header = data[:end].decode("utf-8", errors="replace")
+    if key not in _parse_lines(header.splitlines()[1:]):
+        return False
+    new_header, n = re.subn(
+        rf"^({re.escape(key)}:\s*).*$", lambda m: f"{m.group(1)}{value}",
+        header, count=1, flags=re.MULTILINE,
+    )
+    if not n:
+        return False
+    # Atomic: watchers and orchestrators read these notes concurrently
+    atomic_write_bytes(path, new_header.encode("utf-8") + data[end:])
+    return True
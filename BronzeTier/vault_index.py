@@ -0,0 +1,434 @@
+"""
+vault_index.py – Incrementally maintained vault index (SQLite)
+
+The Dashboard, health checks and CEO briefing all need "how many notes are in
+each folder" and "what are the latest N". Globbing and stat()-ing every file
+on every refresh is O(n) syscalls, and /Done grows forever.
+
+This index keeps one row per note instead:
+
+  Step              | Cost                 | When
+  ----------------- | -------------------- | ------------------------------
+  reconcile()       | O(n) scan            | At startup, or a read after a folder changed
+  watchdog events   | O(log n) per note    | Continuously (coalesced, vault_events)
+  count(folder)     | O(1)                 | Trigger-maintained counter table
+  latest(folder, n) | O(log n + n)         | (folder, mtime) B-tree index
+
+/Done is sharded into Done/YYYY/MM/ (done_archive); shard notes count as
+"Done". reconcile() re-scans a shard only when its directory mtime changed,
+so startup cost doesn't grow with the archive.
+
+The database lives in <vault>/.cache/ so Obsidian ignores it. It runs in WAL
+mode, so other processes (watchdog_monitor, ceo_briefing, health_monitor) can
+read counts while the Orchestrator keeps the index current.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from vault_events import NoteEventCoalescer
+from vault_frontmatter import read_frontmatter
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # read-only users (ceo_briefing) don't need live updates
+    Observer = None
+
+log = logging.getLogger("VaultIndex")
+
+# Folders tracked by the index (top-level *.md only, same as glob("*.md"))
+INDEXED_FOLDERS = (
+    "Inbox", "Needs_Action", "Pending_Approval", "Approved",
+    "Rejected", "Done", "Plans", "Updates",
+)
+# ...plus <folder>/YYYY/MM/*.md for these (done_archive shards)
+SHARDED_FOLDERS = ("Done",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    path     TEXT PRIMARY KEY,
+    folder   TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    type     TEXT,
+    status   TEXT,
+    priority TEXT,
+    mtime    REAL NOT NULL,
+    size     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notes_folder_mtime ON notes(folder, mtime DESC);
+
+CREATE TABLE IF NOT EXISTS folder_counts (
+    folder TEXT PRIMARY KEY,
+    count  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TRIGGER IF NOT EXISTS notes_after_insert AFTER INSERT ON notes BEGIN
+    INSERT INTO folder_counts(folder, count) VALUES (NEW.folder, 1)
+        ON CONFLICT(folder) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS notes_after_delete AFTER DELETE ON notes BEGIN
+    UPDATE folder_counts SET count = count - 1 WHERE folder = OLD.folder;
+END;
+
+CREATE TRIGGER IF NOT EXISTS notes_after_move AFTER UPDATE OF folder ON notes
+WHEN OLD.folder != NEW.folder BEGIN
+    UPDATE folder_counts SET count = count - 1 WHERE folder = OLD.folder;
+    INSERT INTO folder_counts(folder, count) VALUES (NEW.folder, 1)
+        ON CONFLICT(folder) DO UPDATE SET count = count + 1;
+END;
+"""
+
+
+def default_index_path(vault: Path) -> Path:
+    return Path(os.getenv("VAULT_INDEX_PATH", str(vault / ".cache" / "vault_index.sqlite3")))
+
+
+def _read_header_fields(path: Path) -> dict:
+    """type/status/priority from the (cached, header-only) frontmatter reader."""
+    return read_frontmatter(path).fields
+
+
+class VaultIndex:
+    """
+    SQLite-backed index of vault notes: folder, type, status, priority,
+    mtime and size per note.
+
+    Long-running owners (Orchestrator, Local Agent) call reconcile() once and
+    then start() to follow watchdog events. Short-lived readers call
+    ensure_reconciled() before answering: it compares the folders' (and
+    shards') directory mtimes with those recorded by the last reconcile and
+    re-scans only if a note was added, removed or renamed since — so counts
+    stay live when no Orchestrator is running.
+    """
+
+    def __init__(self, vault_path: Path | str, db_path: Path | str | None = None,
+                 folders: Iterable[str] = INDEXED_FOLDERS):
+        self.vault = Path(vault_path).resolve()
+        self.folders = tuple(folders)
+        self.db_path = Path(db_path) if db_path else default_index_path(self.vault)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._listeners: list[Callable] = []
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    # ── Path helpers ───────────────────────────────────────────────────────────
+    def _folder_of(self, path: Path) -> Optional[str]:
+        """Return the indexed folder name for *path*, or None if not tracked."""
+        try:
+            rel = path.resolve().relative_to(self.vault)
+        except ValueError:
+            return None
+        parts = rel.parts
+        if not parts or parts[0] not in self.folders:
+            return None
+        if len(parts) != 2 and not (len(parts) == 4 and parts[0] in SHARDED_FOLDERS
+                                    and parts[1].isdigit() and parts[2].isdigit()):
+            return None
+        if path.suffix != ".md" or path.name.startswith("."):
+            return None
+        return parts[0]
+
+    def _scan_dirs(self, folder: str) -> list[tuple[Path, str]]:
+        """(directory, key prefix) pairs holding *folder*'s notes: the folder and its shards."""
+        folder_path = self.vault / folder
+        dirs = [(folder_path, folder)]
+        if folder in SHARDED_FOLDERS:
+            for year in sorted(p for p in folder_path.iterdir() if p.is_dir() and p.name.isdigit()):
+                for month in sorted(p for p in year.iterdir() if p.is_dir() and p.name.isdigit()):
+                    dirs.append((month, f"{folder}/{year.name}/{month.name}"))
+        return dirs
+
+    def _key(self, path: Path) -> str:
+        return path.resolve().relative_to(self.vault).as_posix()
+
+    # ── Change listeners ───────────────────────────────────────────────────────
+    def add_listener(self, fn: Callable[[Optional[str], Optional[str], str, Optional[float]], None]):
+        """
+        Call fn(old_folder, new_folder, name, mtime) after every live change:
+        (None, folder) = added, (folder, None) = removed, (f, f) = modified.
+        Bulk reconcile() does not notify; listeners re-read the index after it.
+        """
+        self._listeners.append(fn)
+
+    def _notify(self, old_folder: Optional[str], new_folder: Optional[str], name: str,
+                mtime: Optional[float] = None):
+        for fn in self._listeners:
+            try:
+                fn(old_folder, new_folder, name, mtime)
+            except Exception as exc:
+                log.warning("Vault index listener failed: %s", exc)
+
+    # ── Writes ─────────────────────────────────────────────────────────────────
+    def upsert(self, path: Path | str) -> bool:
+        """Insert or refresh one note. Returns False if the path isn't tracked."""
+        path = Path(path)
+        folder = self._folder_of(path)
+        if folder is None:
+            return False
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.remove(path)
+            return False
+        fields = _read_header_fields(path)
+        key = self._key(path)
+        with self._lock:
+            row = self._conn.execute("SELECT folder FROM notes WHERE path = ?", (key,)).fetchone()
+            self._conn.execute(
+                """
+                INSERT INTO notes(path, folder, name, type, status, priority, mtime, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    folder = excluded.folder, type = excluded.type,
+                    status = excluded.status, priority = excluded.priority,
+                    mtime = excluded.mtime, size = excluded.size
+                """,
+                (key, folder, path.name, fields.get("type"),
+                 fields.get("status"), fields.get("priority"), st.st_mtime, st.st_size),
+            )
+            self._conn.commit()
+        self._notify(row["folder"] if row else None, folder, path.name, st.st_mtime)
+        return True
+
+    def remove(self, path: Path | str):
+        path = Path(path)
+        folder = self._folder_of(path)
+        if folder is None:
+            return
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM notes WHERE path = ?", (self._key(path),))
+            self._conn.commit()
+        if cur.rowcount:
+            self._notify(folder, None, path.name)
+
+    def move(self, src: Path | str, dest: Path | str):
+        """Handle a rename: drop the old row, index the new location."""
+        self.remove(src)
+        self.upsert(dest)
+
+    def reconcile(self) -> dict:
+        """
+        Full scan of the indexed folders. Rows whose mtime and size are
+        unchanged are kept without re-reading the file; new or changed notes
+        are (re)parsed and vanished notes are deleted.
+        """
+        started = time.monotonic()
+        with self._lock:
+            known = {
+                row["path"]: (row["mtime"], row["size"])
+                for row in self._conn.execute("SELECT path, mtime, size FROM notes")
+            }
+            shard_mtimes = {
+                row["key"][len("shard:"):]: row["value"]
+                for row in self._conn.execute("SELECT key, value FROM meta WHERE key LIKE 'shard:%'")
+            }
+        seen: set[str] = set()
+        changed: list[tuple] = []
+        skipped_shards: list[str] = []
+        scanned_dirs: dict[str, str] = {}
+
+        for folder in self.folders:
+            folder_path = self.vault / folder
+            if not folder_path.is_dir():
+                continue
+            for dir_path, prefix in self._scan_dirs(folder):
+                # Taken before the scan: a change during it shows up as stale next time
+                dir_mtime = str(dir_path.stat().st_mtime_ns)
+                if prefix != folder:
+                    # A shard whose directory is unchanged since the last scan keeps its rows
+                    if shard_mtimes.get(prefix) == dir_mtime:
+                        skipped_shards.append(prefix + "/")
+                        continue
+                    scanned_dirs[f"shard:{prefix}"] = dir_mtime
+                else:
+                    scanned_dirs[f"dir:{prefix}"] = dir_mtime
+                self._scan_dir(dir_path, folder, prefix, known, seen, changed)
+
+        removed = [(key,) for key in known
+                   if key not in seen and not key.startswith(tuple(skipped_shards))]
+        with self._lock:
+            self._conn.executemany("DELETE FROM notes WHERE path = ?", removed)
+            self._conn.executemany(
+                """
+                INSERT INTO notes(path, folder, name, type, status, priority, mtime, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    folder = excluded.folder, type = excluded.type,
+                    status = excluded.status, priority = excluded.priority,
+                    mtime = excluded.mtime, size = excluded.size
+                """,
+                changed,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                list(scanned_dirs.items()),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('reconciled_at', ?)",
+                (datetime.now().isoformat(),),
+            )
+            self._conn.commit()
+
+        stats = {
+            "scanned": len(seen),
+            "updated": len(changed),
+            "removed": len(removed),
+            "shards_skipped": len(skipped_shards),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        log.info("Vault index reconciled: %s", stats)
+        return stats
+
+    @staticmethod
+    def _scan_dir(dir_path: Path, folder: str, prefix: str, known: dict, seen: set, changed: list):
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".md") or entry.name.startswith("."):
+                    continue
+                if not entry.is_file():
+                    continue
+                key = f"{prefix}/{entry.name}"
+                seen.add(key)
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if known.get(key) == (st.st_mtime, st.st_size):
+                    continue
+                fields = _read_header_fields(Path(entry.path))
+                changed.append((
+                    key, folder, entry.name, fields.get("type"), fields.get("status"),
+                    fields.get("priority"), st.st_mtime, st.st_size,
+                ))
+
+    def _dir_mtimes(self) -> dict[str, str]:
+        """meta key → current mtime of every indexed directory (folders and shards)."""
+        mtimes = {}
+        for folder in self.folders:
+            if not (self.vault / folder).is_dir():
+                continue
+            for dir_path, prefix in self._scan_dirs(folder):
+                key = f"dir:{prefix}" if prefix == folder else f"shard:{prefix}"
+                mtimes[key] = str(dir_path.stat().st_mtime_ns)
+        return mtimes
+
+    def is_stale(self) -> bool:
+        """True if the index was never built or a directory changed since the last reconcile."""
+        with self._lock:
+            stored = {
+                row["key"]: row["value"]
+                for row in self._conn.execute(
+                    "SELECT key, value FROM meta WHERE key = 'reconciled_at' "
+                    "OR key LIKE 'dir:%' OR key LIKE 'shard:%'"
+                )
+            }
+        if "reconciled_at" not in stored:
+            return True
+        return any(stored.get(key) != mtime for key, mtime in self._dir_mtimes().items())
+
+    def ensure_reconciled(self) -> bool:
+        """
+        Reconcile if the index is stale (one stat() per folder/shard when it
+        isn't). Readers call this before answering. Returns True if it scanned.
+        """
+        if not self.is_stale():
+            return False
+        self.reconcile()
+        return True
+
+    # ── Reads ──────────────────────────────────────────────────────────────────
+    def count(self, folder: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM folder_counts WHERE folder = ?", (folder,)
+            ).fetchone()
+        return row["count"] if row else 0
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT folder, count FROM folder_counts").fetchall()
+        result = {folder: 0 for folder in self.folders}
+        result.update({row["folder"]: row["count"] for row in rows})
+        return result
+
+    def latest(self, folder: str, limit: int = 5) -> list[dict]:
+        """Return the *limit* most recently modified notes in *folder*."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT path, name, type, status, priority, mtime, size
+                FROM notes WHERE folder = ? ORDER BY mtime DESC LIMIT ?
+                """,
+                (folder, limit),
+            ).fetchall()
+        return [
+            {
+                "path": self.vault / row["path"],
+                "name": row["name"],
+                "stem": Path(row["name"]).stem,
+                "type": row["type"],
+                "status": row["status"],
+                "priority": row["priority"],
+                "mtime": row["mtime"],
+                "size": row["size"],
+            }
+            for row in rows
+        ]
+
+    def notes(self, folder: str) -> list[dict]:
+        """Every note in *folder*, oldest first (used for one-off backlog scans)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, name, status, priority, mtime FROM notes WHERE folder = ? ORDER BY mtime",
+                (folder,),
+            ).fetchall()
+        return [
+            {"path": self.vault / row["path"], "name": row["name"], "status": row["status"],
+             "priority": row["priority"], "mtime": row["mtime"]}
+            for row in rows
+        ]
+
+    # ── Live updates ───────────────────────────────────────────────────────────
+    def start(self, observer=None):
+        """Follow watchdog events for every indexed folder. Returns the observer."""
+        observer = observer or Observer()
+        handler = VaultIndexHandler(self)
+        for folder in self.folders:
+            folder_path = self.vault / folder
+            folder_path.mkdir(parents=True, exist_ok=True)
+            observer.schedule(handler, str(folder_path), recursive=folder in SHARDED_FOLDERS)
+        if not observer.is_alive():
+            observer.start()
+        log.info("Vault index watching %d folders (db: %s)", len(self.folders), self.db_path)
+        return observer
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class VaultIndexHandler(NoteEventCoalescer):
+    """Applies watchdog events to a VaultIndex: coalesced upserts, immediate removals."""
+
+    def __init__(self, index: VaultIndex):
+        super().__init__(index.upsert, on_gone=index.remove, name="vault-index-events")
+        self.index = index
@@ -0,0 +1,165 @@
+"""
+vault_io.py – Atomic vault writes (temp file + rename) with optional fsync
+
+Producers used to Path.write_text() straight into watched folders. watchdog's
+on_created fires as soon as the file exists — often before the content is
+written — so the Orchestrator read an empty or half-written note, quarantined
+it as empty and burned retries. Every vault note is now written like this:
+
+  .NOTE.md.<pid>.<n>.tmp   write + flush   (hidden: ignored by Obsidian, the
+        │                                   *.md globs and every watcher)
+        └── os.replace() ──▶ NOTE.md        one atomic rename — readers see
+                                            nothing or the complete note
+
+Consumers react to the rename (on_moved with a .md dest) and skip dotfiles.
+
+Durability (VAULT_FSYNC):
+  off     rename only (default; what write_text gave us, minus partial reads)
+  always  fsync the file before the rename and the directory after
+  batch   rename immediately; a background thread fsyncs written files and
+          their directories every VAULT_FSYNC_INTERVAL seconds
+"""
+
+import itertools
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger("VaultIO")
+
+VAULT_FSYNC = os.getenv("VAULT_FSYNC", "off").lower()
+VAULT_FSYNC_INTERVAL = float(os.getenv("VAULT_FSYNC_INTERVAL", "1.0"))
+
+TEMP_SUFFIX = ".tmp"
+# Partial downloads / editor swap files that other tools rename into place later
+_PARTIAL_SUFFIXES = (TEMP_SUFFIX, ".part", ".partial", ".crdownload", ".download", ".swp", "~")
+_counter = itertools.count()
+
+
+def is_temp_name(name: str) -> bool:
+    """True for in-progress writes and other hidden files consumers must skip."""
+    return name.startswith(".") or name.endswith(_PARTIAL_SUFFIXES)
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{next(_counter)}{TEMP_SUFFIX}")
+
+
+def _fsync_path(path: Path):
+    flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) if path.is_dir() else os.O_RDONLY
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return                      # gone already, or directories can't be opened (Windows)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ── Batched fsync ──────────────────────────────────────────────────────────────
+class _FsyncBatcher:
+    """Collects written paths and fsyncs them (plus their dirs) once per interval."""
+
+    def __init__(self, interval: float):
+        self.interval = max(0.05, interval)
+        self._pending: set[Path] = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.synced = 0
+
+    def add(self, path: Path):
+        with self._cond:
+            self._pending.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="vault-fsync")
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Let the batch accumulate, then sync everything in one sweep
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        with self._cond:
+            batch, self._pending = self._pending, set()
+        for path in batch:
+            _fsync_path(path)
+        for directory in {p.parent for p in batch}:
+            _fsync_path(directory)
+        self.synced += len(batch)
+
+
+_batcher = _FsyncBatcher(VAULT_FSYNC_INTERVAL)
+
+
+def flush_pending():
+    """Sync everything the batch mode still holds (call on shutdown)."""
+    if VAULT_FSYNC == "batch":
+        _batcher.flush()
+
+
+# ── Writers ────────────────────────────────────────────────────────────────────
+def _publish(tmp: Path, path: Path, fsync: str):
+    try:
+        if fsync == "always":
+            _fsync_path(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if fsync == "always":
+        _fsync_path(path.parent)
+    elif fsync == "batch":
+        _batcher.add(path)
+
+
+def atomic_write_text(path: Path | str, text: str, encoding: str = "utf-8",
+                      fsync: Optional[str] = None) -> Path:
+    """Write *text* to a hidden temp file next to *path*, then rename it into place."""
+    path = Path(path)
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, "w", encoding=encoding) as f:
+            f.write(text)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _publish(tmp, path, fsync or VAULT_FSYNC)
+    return path
+
+
+def atomic_write_bytes(path: Path | str, data: bytes, fsync: Optional[str] = None) -> Path:
+    path = Path(path)
+    tmp = _temp_path(path)
+    try:
+        tmp.write_bytes(data)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _publish(tmp, path, fsync or VAULT_FSYNC)
+    return path
+
+
+def atomic_copy(src: Path | str, dest: Path | str, fsync: Optional[str] = None) -> Path:
+    """shutil.copy2 via a temp file, so *dest* appears complete or not at all."""
+    dest = Path(dest)
+    tmp = _temp_path(dest)
+    try:
+        shutil.copy2(src, tmp)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _publish(tmp, dest, fsync or VAULT_FSYNC)
+    return dest
@@ -0,0 +1,324 @@
+"""
+vault_trace.py – Record production vault traffic and LLM answers for offline replay
+
+Synthetic benchmarks (benchmarks/run_benchmark.py) have the right note
+formats but the wrong traffic shape: real days have bursts after a Gmail
+sync, quiet nights, approvals that arrive in batches, and Groq latency that
+spikes. A trace captures the inputs of one real run so it can be replayed
+against the pipeline without Groq, Gmail or WhatsApp:
+
+  Orchestrator (TRACE_RECORD=true)
+    ├─ Needs_Action  note ready ──▶ {"type": "note", name, content}
+    ├─ Approved /    note ready ──▶ {"type": "decision", decision, name,
+    │  Rejected                      source_file, content}    (human moves)
+    └─ ReasoningExecutor answer ──▶ {"type": "llm", component, key, files,
+                                     content, usage, latency_s}
+                 │
+                 ▼
+  TRACE_DIR/<component>_<YYYYmmdd_HHMMSS>_<pid>.jsonl   (header line first)
+                 │
+                 ▼
+  python -m benchmarks.replay_trace <trace>... --speed 60
+    notes and decisions re-enacted on the recorded timeline (÷ speed);
+    LLM_PROVIDER=replay answers from the recorded responses
+
+Every event carries "t", seconds since the recorder started. Outputs
+(Pending_Approval, Done, Plan.md) are not recorded — the replayed pipeline
+produces them again.
+
+Triage prompts embed the current time and batch composition changes with
+timing, so replayed requests rarely match byte for byte. LLMTraceIndex
+therefore answers in order of preference:
+  exact     same model + messages + response_format as a recorded request
+  composed  JSON triage: the recorded plan of every `File:` in the prompt
+            (single plan or {"items": [...]}), latency = slowest of them
+  missed    neither — the caller falls back to the stub provider
+
+Traces contain full note bodies and LLM output: keep them with the vault,
+not in git.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from vault_events import NoteEventCoalescer
+from vault_frontmatter import parse_frontmatter
+
+log = logging.getLogger("VaultTrace")
+
+TRACE_RECORD = os.getenv("TRACE_RECORD", "false").lower() == "true"
+TRACE_DIR = Path(os.getenv("TRACE_DIR", "./logs/traces"))
+TRACE_VERSION = 1
+
+NOTE_FOLDER = "Needs_Action"
+DECISION_FOLDERS = {"Approved": "approved", "Rejected": "rejected"}
+_SYSTEM_PREFIXES = ("REJECTED_", "FAILED_")        # written by the pipeline, not a human
+_RECORD_WINDOW = 0.1                               # read notes before the pipeline moves them
+
+# `File: <name>` (single triage) / `### File: <name>` (batched triage) lines
+PROMPT_FILE_RE = re.compile(r"^(?:### )?File: (\S+)$", re.MULTILINE)
+
+
+# ── Request identity ───────────────────────────────────────────────────────────
+def request_key(kwargs: dict) -> str:
+    """Stable hash of what determines an LLM answer (model, messages, response format)."""
+    payload = json.dumps(
+        [kwargs.get("model"), kwargs.get("messages"), kwargs.get("response_format")],
+        sort_keys=True, default=str, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def prompt_text(kwargs: dict) -> str:
+    return "\n".join(str(m.get("content") or "") for m in kwargs.get("messages", []))
+
+
+def is_json_request(kwargs: dict) -> bool:
+    return (kwargs.get("response_format") or {}).get("type") == "json_object"
+
+
+def prompt_files(kwargs: dict) -> list[str]:
+    """Note names a triage prompt is about, in prompt order."""
+    return PROMPT_FILE_RE.findall(prompt_text(kwargs))
+
+
+def _plans_by_file(files: list[str], content: str) -> dict[str, dict]:
+    """Split a triage answer into {file name: plan}; {} if it isn't one."""
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    if len(files) == 1 and "items" not in data:
+        return {files[0]: data}
+    plans = {}
+    for entry in data.get("items", []) if isinstance(data.get("items"), list) else []:
+        if isinstance(entry, dict) and entry.get("file") in files:
+            plans[entry["file"]] = {k: v for k, v in entry.items() if k != "file"}
+    return plans
+
+
+# ── Recording ──────────────────────────────────────────────────────────────────
+class TraceRecorder:
+    """Appends trace events of one process to a JSONL file."""
+
+    def __init__(self, path: Path | str, component: str):
+        self.path = Path(path)
+        self.component = component
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._stats = {"note": 0, "decision": 0, "llm": 0, "missed": 0, "errors": 0}
+        self._events: Optional[NoteEventCoalescer] = None
+        self._observer = None
+        self._write({
+            "type": "header", "version": TRACE_VERSION, "component": component,
+            "started": datetime.now().isoformat(timespec="milliseconds"), "epoch": time.time(),
+            "host": socket.gethostname(), "pid": os.getpid(),
+        })
+
+    def _write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._file.write(line)
+                self._file.flush()
+            except OSError as exc:
+                self._stats["errors"] += 1
+                log.warning("Trace write failed: %s", exc)
+                return
+            if record["type"] in self._stats:
+                self._stats[record["type"]] += 1
+
+    def record(self, kind: str, **fields):
+        self._write({"t": round(time.monotonic() - self._started, 4), "type": kind, **fields})
+
+    # ── Vault events ───────────────────────────────────────────────────────────
+    def watch_vault(self, vault: Path | str):
+        """Record notes arriving in Needs_Action and human moves into Approved/Rejected."""
+        from watchdog.observers import Observer
+
+        vault = Path(vault)
+        folders = [vault / NOTE_FOLDER, *(vault / name for name in DECISION_FOLDERS)]
+        for folder in folders:
+            folder.mkdir(parents=True, exist_ok=True)
+        self._events = NoteEventCoalescer(self._on_ready, window=_RECORD_WINDOW, max_delay=1.0,
+                                          folders=folders, name="trace-events")
+        self._observer = Observer()
+        for folder in folders:
+            self._observer.schedule(self._events, str(folder), recursive=False)
+        self._observer.start()
+        log.info("Recording vault trace → %s", self.path)
+
+    def _on_ready(self, path: Path):
+        folder = path.parent.name
+        if folder in DECISION_FOLDERS and path.name.startswith(_SYSTEM_PREFIXES):
+            return
+        try:
+            content = path.read_text(encoding="utf-8")
+        except OSError:
+            with self._lock:
+                self._stats["missed"] += 1          # processed before we could read it
+            return
+        if folder == NOTE_FOLDER:
+            self.record("note", folder=folder, name=path.name, content=content)
+        else:
+            self.record("decision", decision=DECISION_FOLDERS[folder], name=path.name,
+                        source_file=str(parse_frontmatter(content).get("source_file", "")),
+                        content=content)
+
+    # ── LLM answers ────────────────────────────────────────────────────────────
+    def llm(self, component: str, kwargs: dict, response, latency_s: float):
+        try:
+            content = response.choices[0].message.content
+        except (AttributeError, IndexError):
+            return
+        usage = getattr(response, "usage", None)
+        self.record(
+            "llm", component=component, model=kwargs.get("model"), key=request_key(kwargs),
+            json=is_json_request(kwargs), files=prompt_files(kwargs) if is_json_request(kwargs) else [],
+            content=content, latency_s=round(latency_s, 4),
+            usage={k: getattr(usage, k, 0) or 0 for k in ("prompt_tokens", "completion_tokens")},
+        )
+
+    def close(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+        if self._events is not None:
+            self._events.flush()
+            self._events.close()
+        with self._lock:
+            self._file.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "path": str(self.path)}
+
+
+_recorder: Optional[TraceRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def start_trace_recorder(component: str, vault: Optional[Path | str] = None) -> Optional[TraceRecorder]:
+    """Start the process-wide recorder if TRACE_RECORD; None otherwise."""
+    global _recorder
+    if not TRACE_RECORD:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            name = f"{component}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl"
+            _recorder = TraceRecorder(TRACE_DIR / name, component)
+            if vault is not None:
+                _recorder.watch_vault(vault)
+        return _recorder
+
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    return _recorder
+
+
+# ── Reading ────────────────────────────────────────────────────────────────────
+def read_trace(paths: Iterable[Path | str]) -> list[dict]:
+    """
+    Events of one or more trace files merged on a common timeline: "t" is
+    re-based to seconds since the earliest recorder start.
+    """
+    events = []
+    for path in paths:
+        epoch = None
+        with Path(path).open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue                        # torn last line of a live trace
+                if record.get("type") == "header":
+                    if record.get("version") != TRACE_VERSION:
+                        raise ValueError(f"{path}: unsupported trace version {record.get('version')}")
+                    epoch = record["epoch"]
+                elif epoch is not None and "t" in record:
+                    record["t"] = epoch + record["t"]
+                    events.append(record)
+    if events:
+        start = min(e["t"] for e in events)
+        for e in events:
+            e["t"] -= start
+    events.sort(key=lambda e: e["t"])
+    return events
+
+
+class LLMTraceIndex:
+    """Recorded LLM answers, looked up exactly or composed per triaged file."""
+
+    def __init__(self, events: Iterable[dict]):
+        self.exact: dict[str, dict] = {}
+        self.by_file: dict[str, tuple[dict, float, dict]] = {}     # name → (plan, latency, usage share)
+        for e in events:
+            if e.get("type") != "llm":
+                continue
+            self.exact[e["key"]] = e
+            files = e.get("files") or []
+            if not files:
+                continue
+            share = {k: (e.get("usage") or {}).get(k, 0) // len(files)
+                     for k in ("prompt_tokens", "completion_tokens")}
+            for name, plan in _plans_by_file(files, e["content"]).items():
+                self.by_file[name] = (plan, e.get("latency_s", 0.0), share)
+        self._lock = threading.Lock()
+        self._stats = {"exact": 0, "composed": 0, "missed": 0}
+
+    def lookup(self, kwargs: dict) -> Optional[tuple[str, float, dict]]:
+        """(content, latency_s, usage) for a request, or None if it wasn't recorded."""
+        hit = self.exact.get(request_key(kwargs))
+        if hit is not None:
+            self._count("exact")
+            return hit["content"], hit.get("latency_s", 0.0), hit.get("usage") or {}
+        files = prompt_files(kwargs) if is_json_request(kwargs) else []
+        if files and all(name in self.by_file for name in files):
+            recorded = [self.by_file[name] for name in files]
+            if len(files) == 1:
+                content = json.dumps(recorded[0][0])
+            else:
+                content = json.dumps({"items": [{"file": name, **plan}
+                                                for name, (plan, _, _) in zip(files, recorded)]})
+            usage = {k: sum(share.get(k, 0) for _, _, share in recorded)
+                     for k in ("prompt_tokens", "completion_tokens")}
+            self._count("composed")
+            return content, max(latency for _, latency, _ in recorded), usage
+        self._count("missed")
+        return None
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "recorded_requests": len(self.exact), "recorded_files": len(self.by_file)}
+
+
+_indexes: dict[tuple[str, ...], LLMTraceIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def load_llm_index(paths: Iterable[Path | str]) -> LLMTraceIndex:
+    """One LLMTraceIndex per set of trace files per process."""
+    key = tuple(str(Path(p).resolve()) for p in paths)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = LLMTraceIndex(read_trace(key))
+        return _indexes[key]
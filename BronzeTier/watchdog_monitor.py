@@ -31,6 +31,9 @@ if str(_BRONZE_DIR) not in sys.path:
     sys.path.insert(0, str(_BRONZE_DIR))
 load_dotenv(dotenv_path=_BRONZE_DIR / ".env")
 
+from vault_index import VaultIndex
+from vault_io import atomic_write_text
+
 log = logging.getLogger("WatchdogMonitor")
 logging.basicConfig(
     level=logging.INFO,
@@ -50,6 +53,17 @@ RESTART_DELAY       = int(os.getenv("WATCHDOG_RESTART_DELAY", "15"))   # seconds
 HEALTH_INTERVAL     = int(os.getenv("WATCHDOG_HEALTH_INTERVAL", "60")) # seconds
 MIN_DISK_GB         = float(os.getenv("WATCHDOG_MIN_DISK_GB", "1.0"))  # alert if below
 
+# Shared with the Orchestrator, which keeps it current via watchdog events
+_vault_index: VaultIndex | None = None
+
+
+def _get_vault_index() -> VaultIndex:
+    global _vault_index
+    if _vault_index is None:
+        _vault_index = VaultIndex(VAULT_PATH)
+    _vault_index.ensure_reconciled()     # re-scans only if a folder changed
+    return _vault_index
+
 
 def _write_jsonl(path: Path, record: dict):
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -63,7 +77,8 @@ def _alert_vault(subject: str, body: str):
     alert_dir = VAULT_PATH / "Needs_Action"
     alert_dir.mkdir(parents=True, exist_ok=True)
     alert_path = alert_dir / f"ALERT_SYSTEM_{now.strftime('%Y%m%d_%H%M%S')}.md"
-    alert_path.write_text(
+    atomic_write_text(
+        alert_path,
         f"""---
 type: system_alert
 subject: {subject}
@@ -105,10 +120,9 @@ def health_checks() -> dict:
     if not VAULT_PATH.exists():
         issues["vault"] = f"Vault path missing: {VAULT_PATH}"
 
-    # Needs_Action backlog
-    needs_action = VAULT_PATH / "Needs_Action"
-    if needs_action.exists():
-        backlog = len(list(needs_action.glob("*.md")))
+    # Needs_Action backlog (O(1) count from the vault index)
+    if VAULT_PATH.exists():
+        backlog = _get_vault_index().count("Needs_Action")
         if backlog > 50:
             issues["backlog"] = f"Needs_Action backlog is large: {backlog} files"
 
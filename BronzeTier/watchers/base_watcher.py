@@ -4,11 +4,45 @@ base_watcher.py – Template for all watchers.
 All Watchers inherit from BaseWatcher and implement:
   - check_for_updates() -> list   : return list of new items to process
   - create_action_file(item) -> Path : create .md file in Needs_Action folder
+
+run() polls every check_interval seconds until stop() is called; the wait
+between polls is an Event wait, so stop() takes effect immediately.
+
+AsyncBaseWatcher runs the same loop on an asyncio event loop and creates the
+action files of one poll concurrently (at most max_concurrency at a time,
+default WATCHER_CONCURRENCY), so one slow item no longer delays the rest.
+Subclasses may implement check_for_updates_async()/create_action_file_async()
+natively; by default they adapt the sync methods onto worker threads, so a
+sync watcher only has to change its base class.
+
+Metrics: ai_employee_watcher_poll_seconds, ai_employee_watcher_poll_items,
+ai_employee_watcher_items_total (per watcher); stats() for health checks.
 """
+import asyncio
+import os
+import sys
+import threading
 import time
 import logging
 from pathlib import Path
 from abc import ABC, abstractmethod
+from typing import Optional
+
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from metrics import get_metrics
+
+WATCHER_CONCURRENCY = int(os.getenv('WATCHER_CONCURRENCY', '4'))
+
+_POLL_SECONDS = get_metrics().histogram(
+    'ai_employee_watcher_poll_seconds', 'Duration of one check_for_updates() poll', ('watcher', 'outcome'))
+_POLL_ITEMS = get_metrics().histogram(
+    'ai_employee_watcher_poll_items', 'New items returned by one poll', ('watcher',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100))
+_WATCHER_ITEMS = get_metrics().counter(
+    'ai_employee_watcher_items_total', 'Action files created by watchers', ('watcher', 'outcome'))
 
 
 class BaseWatcher(ABC):
@@ -17,6 +51,10 @@ class BaseWatcher(ABC):
         self.needs_action = self.vault_path / 'Needs_Action'
         self.check_interval = check_interval
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {'polls': 0, 'poll_errors': 0, 'created': 0, 'failed': 0,
+                       'last_poll_s': 0.0, 'last_poll_items': 0, 'last_poll_at': None}
         # Ensure Needs_Action folder exists
         self.needs_action.mkdir(parents=True, exist_ok=True)
 
@@ -30,18 +68,140 @@ class BaseWatcher(ABC):
         """Create .md file in Needs_Action folder. Return the path created."""
         pass
 
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self):
+        """Ask run() to return; an in-progress poll finishes first."""
+        self._stop.set()
+
     def run(self):
-        """Main watcher loop – poll indefinitely at check_interval seconds."""
-        self.logger.info(f'Starting {self.__class__.__name__}')
-        while True:
+        """Main watcher loop – poll at check_interval seconds until stop()."""
+        self.logger.info(f'Starting {self.name}')
+        while not self._stop.is_set():
+            started = time.monotonic()
             try:
                 items = self.check_for_updates()
-                for item in items:
-                    try:
-                        path = self.create_action_file(item)
-                        self.logger.info(f'Action file created: {path}')
-                    except Exception as e:
-                        self.logger.error(f'Failed to create action file for item {item}: {e}')
             except Exception as e:
+                self._record_poll(started, None)
                 self.logger.error(f'Error in check_for_updates: {e}')
-            time.sleep(self.check_interval)
+            else:
+                self._record_poll(started, items)
+                for item in items:
+                    if self._stop.is_set():
+                        break
+                    self._create(item)
+            self._stop.wait(self.check_interval)
+        self.logger.info(f'{self.name} stopped')
+
+    # ── Bookkeeping ────────────────────────────────────────────────────────────
+    def _create(self, item) -> bool:
+        try:
+            path = self.create_action_file(item)
+        except Exception as e:
+            self._record_item(item, None, e)
+            return False
+        self._record_item(item, path, None)
+        return True
+
+    def _record_poll(self, started: float, items: Optional[list]):
+        elapsed = time.monotonic() - started
+        _POLL_SECONDS.observe(elapsed, watcher=self.name, outcome='ok' if items is not None else 'error')
+        if items is not None:
+            _POLL_ITEMS.observe(len(items), watcher=self.name)
+        with self._stats_lock:
+            self._stats['polls'] += 1
+            self._stats['poll_errors'] += int(items is None)
+            self._stats['last_poll_s'] = round(elapsed, 3)
+            self._stats['last_poll_items'] = len(items) if items is not None else 0
+            self._stats['last_poll_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    def _record_item(self, item, path: Optional[Path], error: Optional[Exception]):
+        outcome = 'failed' if error is not None else 'created'
+        _WATCHER_ITEMS.inc(watcher=self.name, outcome=outcome)
+        with self._stats_lock:
+            self._stats[outcome] += 1
+        if error is not None:
+            self.logger.error(f'Failed to create action file for item {item}: {error}')
+        else:
+            self.logger.info(f'Action file created: {path}')
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {**self._stats, 'running': not self._stop.is_set(), 'interval_s': self.check_interval}
+
+
+class AsyncBaseWatcher(BaseWatcher):
+    """
+    BaseWatcher on an asyncio loop: cancellable waits and up to
+    max_concurrency create_action_file calls in flight per poll.
+    """
+    max_concurrency = WATCHER_CONCURRENCY
+
+    def __init__(self, vault_path: str, check_interval: int = 60):
+        super().__init__(vault_path, check_interval)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ── Async hooks (default: the sync methods on worker threads) ─────────────
+    async def check_for_updates_async(self) -> list:
+        return await asyncio.to_thread(self.check_for_updates)
+
+    async def create_action_file_async(self, item) -> Path:
+        return await asyncio.to_thread(self.create_action_file, item)
+
+    # ── Loop ───────────────────────────────────────────────────────────────────
+    async def _create_async(self, item, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            if self._stop.is_set():
+                return False
+            try:
+                path = await self.create_action_file_async(item)
+            except Exception as e:
+                self._record_item(item, None, e)
+                return False
+            self._record_item(item, path, None)
+            return True
+
+    async def run_async(self):
+        self.logger.info(f'Starting {self.name} (async, {self.max_concurrency} concurrent items)')
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    items = await self.check_for_updates_async()
+                except Exception as e:
+                    self._record_poll(started, None)
+                    self.logger.error(f'Error in check_for_updates: {e}')
+                else:
+                    self._record_poll(started, items)
+                    await asyncio.gather(*(self._create_async(item, semaphore) for item in items))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+        self.logger.info(f'{self.name} stopped')
+
+    def run(self):
+        """Blocking entry point (watcher thread / __main__), same as BaseWatcher.run."""
+        asyncio.run(self.run_async())
+
+    def stop(self):
+        super().stop()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass                       # loop already closed
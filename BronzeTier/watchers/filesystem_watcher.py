@@ -12,13 +12,11 @@ Setup:
 """
 import logging
 import os
-import shutil
-import time
+import sys
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
-from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
 try:
@@ -26,6 +24,14 @@ try:
 except ImportError:
     from watchers.base_watcher import BaseWatcher
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from vault_events import NoteEventCoalescer
+from seen_store import get_seen_set
+from vault_io import atomic_copy, atomic_write_text
+
 load_dotenv()
 
 logging.basicConfig(
@@ -35,29 +41,38 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
-class DropFolderHandler(FileSystemEventHandler):
+class DropFolderHandler(NoteEventCoalescer):
     """
     Handles new files dropped into the watch folder.
     Copies file to /Needs_Action and creates a metadata .md note.
+
+    Events are coalesced (vault_events), so a large file that is still being
+    copied — or a download renamed from .part/.crdownload — is handled once,
+    after it has been quiet for the coalescing window.
+
+    Handled files are remembered in the seen store ("drop_folder") by path,
+    mtime and size: a restart doesn't re-import them, a changed file is.
     """
 
     def __init__(self, vault_path: str):
-        super().__init__()
+        super().__init__(self._handle, suffixes=None, name='drop-folder-events')
         self.needs_action = Path(vault_path) / 'Needs_Action'
         self.needs_action.mkdir(parents=True, exist_ok=True)
-        self._processed: set[str] = set()
+        self._processed = get_seen_set(vault_path, 'drop_folder')
 
-    def on_created(self, event):
-        if event.is_directory:
+    def _handle(self, source: Path):
+        # Ignore already-processed items (hidden / in-progress files never get here)
+        try:
+            st = source.stat()
+        except OSError:
             return
-        source = Path(event.src_path)
-        # Ignore hidden files and already-processed items
-        if source.name.startswith('.') or str(source) in self._processed:
+        key = f'{source}:{st.st_mtime_ns}:{st.st_size}'
+        if key in self._processed:
             return
-        self._processed.add(str(source))
+        self._processed.add(key)
         try:
             dest = self.needs_action / f'FILE_{source.name}'
-            shutil.copy2(source, dest)
+            atomic_copy(source, dest)
             self.create_metadata(source, dest)
             log.info('File dropped and copied: %s → Needs_Action/', source.name)
         except Exception as e:
@@ -71,7 +86,8 @@ class DropFolderHandler(FileSystemEventHandler):
             size = 0
 
         meta_path = self.needs_action / f'{dest.stem}.md'
-        meta_path.write_text(
+        atomic_write_text(
+            meta_path,
             f"""---
 type: file_drop
 original_name: {source.name}
@@ -126,11 +142,12 @@ class FilesystemWatcher(BaseWatcher):
         log.info('Starting filesystem drop-folder watcher on: %s', self.watch_path)
         self._observer.start()
         try:
-            while True:
-                time.sleep(1)
+            while not self._stop.wait(1):
+                pass
         except KeyboardInterrupt:
-            self._observer.stop()
-            log.info('Filesystem watcher stopped.')
+            pass
+        self._observer.stop()
+        log.info('Filesystem watcher stopped.')
         self._observer.join()
 
 
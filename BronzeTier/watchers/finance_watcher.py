@@ -2,7 +2,9 @@
 finance_watcher.py – Finance Watcher.
 
 Monitors a folder for bank CSV exports and appends new transactions
-to /Accounting/Current_Month.md in the Obsidian vault.
+to /Accounting/Current_Month.md in the Obsidian vault, and to the structured
+ledger (Accounting/ledger.jsonl + ledger_header.json, see ledger.py) that the
+dashboard and CEO briefing read the balance and month totals from.
 
 How to use:
   1. Export your bank statement as CSV (most banks support this).
@@ -19,6 +21,7 @@ import csv
 import logging
 import os
 import shutil
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -30,6 +33,13 @@ try:
 except ImportError:
     from watchers.base_watcher import BaseWatcher
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from ledger import Ledger, parse_amount
+from vault_io import atomic_write_text
+
 load_dotenv()
 
 logging.basicConfig(
@@ -55,6 +65,7 @@ class FinanceWatcher(BaseWatcher):
         self.drop_folder.mkdir(parents=True, exist_ok=True)
         self.accounting_dir = self.vault_path / 'Accounting'
         self.accounting_dir.mkdir(parents=True, exist_ok=True)
+        self.ledger = Ledger(self.accounting_dir)
         self.processed_dir = self.drop_folder / 'processed'
         self.processed_dir.mkdir(parents=True, exist_ok=True)
 
@@ -75,14 +86,10 @@ class FinanceWatcher(BaseWatcher):
         # Append to /Accounting/Current_Month.md
         month_file = self.accounting_dir / f'Current_Month_{datetime.now().strftime("%Y-%m")}.md'
         self._append_to_monthly_log(month_file, transactions, item.name)
+        self.ledger.append(transactions, item.name)
 
         # Flag large transactions to /Needs_Action (skip empty/invalid amounts)
-        def _safe_amount(t):
-            try:
-                return abs(float(t.get('amount', '0').replace(',', '').replace('$', '') or '0'))
-            except (ValueError, AttributeError):
-                return 0.0
-        large = [t for t in transactions if _safe_amount(t) >= APPROVAL_THRESHOLD]
+        large = [t for t in transactions if abs(parse_amount(t.get('amount')) or 0.0) >= APPROVAL_THRESHOLD]
         for txn in large:
             self._flag_large_transaction(txn)
 
@@ -195,7 +202,7 @@ Move this file to `/Approved` folder.
 ## To Reject
 Move this file to `/Rejected` folder.
 """
-        filepath.write_text(content, encoding='utf-8')
+        atomic_write_text(filepath, content, encoding='utf-8')
         self.logger.warning(f'Large transaction flagged: {txn.get("amount")} – {txn.get("description")}')
 
     def _archive_csv(self, filepath: Path):
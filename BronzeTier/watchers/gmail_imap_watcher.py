@@ -1,10 +1,29 @@
 """
 gmail_imap_watcher.py – Persistent Gmail watcher using IMAP.
 
-Polls Gmail every 60s for unread important emails, writes .md notes
-to BronzeTier/Vault/Needs_Action/, and auto-triggers orchestrator
+Watches Gmail for unread emails, writes .md notes to
+BronzeTier/Vault/Needs_Action/, and auto-triggers orchestrator
 for HIGH priority emails (urgent/payment/invoice keywords).
 
+One long-lived IMAP session instead of a TLS handshake + login per poll:
+
+  connect ─▶ SELECT inbox ─▶ fetch UNSEEN ◀────────────────────────────┐
+                            (until caught up)                         │
+                                  ▼                                   │
+                                IDLE ──(* n EXISTS)──▶ DONE ──────────┤
+                                  └── quiet IMAP_KEEPALIVE s ─▶ NOOP ─┘
+  any connection error ─▶ jittered exponential backoff ─▶ connect
+
+  - the UNSEEN fetch repeats while the 10-per-pass cap left UIDs behind or
+    an EXISTS arrived (untagged) during the fetches or a NOOP, and runs
+    again after every keepalive NOOP
+  - new mail is pushed within seconds while IDLE; an IDLE is ended after
+    IMAP_KEEPALIVE s of silence and never held longer than IMAP_IDLE_REFRESH
+    (29 min — servers drop IDLE after 30), then a NOOP checks the session
+  - servers without IDLE (or IMAP_IDLE=false): NOOP + search every POLL_INTERVAL
+  - a dropped connection is re-opened after min(IMAP_BACKOFF_MAX,
+    IMAP_BACKOFF_BASE × 2^failures) × random(0.5–1.0) s
+
 No OAuth2 needed — uses Gmail App Password (GMAIL_APP_PASSWORD in .env).
 
 Usage:
@@ -14,6 +33,8 @@ import email
 import imaplib
 import logging
 import os
+import random
+import select
 import sys
 import time
 import threading
@@ -23,6 +44,13 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from seen_store import get_seen_set
+from vault_io import atomic_write_text
+
 load_dotenv('BronzeTier/.env')
 
 logging.basicConfig(
@@ -41,13 +69,19 @@ NEEDS_ACTION.mkdir(parents=True, exist_ok=True)
 
 GMAIL_EMAIL      = os.getenv('GMAIL_EMAIL', '')
 GMAIL_PASSWORD   = os.getenv('GMAIL_APP_PASSWORD', '')
-POLL_INTERVAL    = int(os.getenv('GMAIL_POLL_INTERVAL', '60'))
+POLL_INTERVAL    = int(os.getenv('GMAIL_POLL_INTERVAL', '60'))          # without IDLE
+IMAP_IDLE        = os.getenv('IMAP_IDLE', 'true').lower() == 'true'
+IMAP_IDLE_REFRESH = float(os.getenv('IMAP_IDLE_REFRESH', str(29 * 60)))
+IMAP_KEEPALIVE   = float(os.getenv('IMAP_KEEPALIVE', '300'))
+IMAP_BACKOFF_BASE = float(os.getenv('IMAP_BACKOFF_BASE', '2'))
+IMAP_BACKOFF_MAX = float(os.getenv('IMAP_BACKOFF_MAX', '300'))
 
 # Keywords that flag an email as HIGH priority
 URGENT_KEYWORDS  = ['urgent', 'asap', 'emergency', 'payment', 'invoice',
                     'overdue', 'immediately', 'critical', 'wire transfer', 'refund']
 
-_processed_ids: set[str] = set()
+# IMAP UIDs (stable across sessions, unlike sequence numbers) already saved
+_processed_ids = get_seen_set(VAULT_PATH, 'gmail_imap')
 
 
 def _decode_str(value: str) -> str:
@@ -125,60 +159,82 @@ message_id: {uid}
 """
     safe_uid = uid.replace(' ', '_')
     filepath = NEEDS_ACTION / f'EMAIL_{safe_uid}.md'
-    filepath.write_text(content, encoding='utf-8')
+    atomic_write_text(filepath, content, encoding='utf-8')
     log.info('Saved email [%s priority]: %s → %s', urgency.upper(), subject[:60], filepath.name)
 
     # Auto-trigger orchestrator for HIGH priority
     if urgency == 'high':
         log.info('🔴 HIGH priority email — triggering orchestrator...')
-        threading.Thread(target=_trigger_orchestrator, args=(filepath,), daemon=True).start()
+        _trigger_orchestrator(filepath)
 
     return filepath
 
 
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def _get_orchestrator():
+    """One shared Orchestrator per watcher process (its worker pool does the work)."""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            from Orchestrator import Orchestrator
+            _orchestrator = Orchestrator()
+        return _orchestrator
+
+
 def _trigger_orchestrator(filepath: Path):
-    """Trigger the main orchestrator to reason about this email."""
+    """Queue this email on the orchestrator's worker pool."""
     try:
-        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-        from Orchestrator import Orchestrator
-        orch = Orchestrator()
-        orch.process_needs_action_file(filepath)
-        log.info('Orchestrator processed: %s', filepath.name)
+        if _get_orchestrator().submit(filepath):
+            log.info('Queued for orchestrator: %s', filepath.name)
     except Exception as e:
         log.warning('Orchestrator trigger failed (will be picked up on next cycle): %s', e)
 
 
+def _process_unseen(mail: imaplib.IMAP4_SSL) -> bool:
+    """
+    Fetch unseen emails on an open, selected session and save new ones.
+    Returns True if the per-cycle cap left new emails for another pass.
+    """
+    status, data = mail.uid('search', None, 'UNSEEN')
+    if status != 'OK':
+        log.warning('IMAP search failed: %s', status)
+        return False
+
+    uids = data[0].split()
+    new  = [u.decode() for u in uids if u.decode() not in _processed_ids]
+    # Only process the 10 most recent emails per cycle to avoid flooding vault
+    backlog = len(new) > 10
+    new  = new[-10:]
+    log.info('Found %d new unread emails (processing last 10).', len(new))
+
+    saved = 0
+    for uid in new[:10]:  # max 10 per cycle
+        try:
+            status, msg_data = mail.uid('fetch', uid, '(RFC822)')
+            if status != 'OK':
+                continue
+            raw = msg_data[0][1]
+            msg = email.message_from_bytes(raw)
+            _save_email(uid, msg)
+            _processed_ids.add(uid)
+            saved += 1
+        except (imaplib.IMAP4.abort, OSError):
+            raise                           # connection is gone — reconnect
+        except Exception as e:
+            log.error('Error processing email UID %s: %s', uid, e)
+    # Only go round again if this pass made progress (failing UIDs would spin)
+    return backlog and saved > 0
+
+
 def poll_once():
     """Connect to Gmail, fetch unseen emails, save new ones."""
     try:
         mail = _connect()
         mail.select('inbox')
-
-        # Fetch all unseen emails
-        status, data = mail.search(None, 'UNSEEN')
-        if status != 'OK':
-            log.warning('IMAP search failed: %s', status)
-            mail.logout()
-            return
-
-        uids = data[0].split()
-        new  = [u.decode() for u in uids if u.decode() not in _processed_ids]
-        # Only process the 10 most recent emails per cycle to avoid flooding vault
-        new  = new[-10:]
-        log.info('Found %d new unread emails (processing last 10).', len(new))
-
-        for uid in new[:10]:  # max 10 per cycle
-            try:
-                status, msg_data = mail.fetch(uid, '(RFC822)')
-                if status != 'OK':
-                    continue
-                raw = msg_data[0][1]
-                msg = email.message_from_bytes(raw)
-                _save_email(uid, msg)
-                _processed_ids.add(uid)
-            except Exception as e:
-                log.error('Error processing email UID %s: %s', uid, e)
-
+        _process_unseen(mail)
         mail.logout()
 
     except imaplib.IMAP4.error as e:
@@ -187,8 +243,87 @@ def poll_once():
         log.error('Unexpected error: %s', e)
 
 
+# ── Persistent session ────────────────────────────────────────────────────────
+def _idle(mail: imaplib.IMAP4_SSL, timeout: float) -> bool:
+    """
+    IDLE for up to *timeout* s (RFC 2177). Returns True as soon as the
+    server reports new mail (EXISTS), False after *timeout* of silence.
+    """
+    tag = mail._new_tag()
+    mail.send(tag + b' IDLE\r\n')
+    line = mail.readline()
+    if not line.startswith(b'+'):
+        raise imaplib.IMAP4.error(f'IDLE rejected: {line.strip()!r}')
+
+    new_mail = False
+    deadline = time.monotonic() + timeout
+    while not new_mail:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # select() sees the socket, not TLS-decrypted bytes (pending()); a line already
+        # in imaplib's read buffer waits for the next wake-up or for DONE's reply
+        if not getattr(mail.sock, 'pending', lambda: 0)():
+            readable, _, _ = select.select([mail.sock], [], [], remaining)
+            if not readable:
+                break
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort('connection closed during IDLE')
+        new_mail = line.rstrip().endswith(b'EXISTS')
+
+    mail.send(b'DONE\r\n')
+    while True:                             # untagged updates, then "<tag> OK IDLE terminated"
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort('connection closed ending IDLE')
+        if line.startswith(tag + b' '):
+            if not line[len(tag) + 1:].startswith(b'OK'):
+                raise imaplib.IMAP4.error(f'IDLE failed: {line.strip()!r}')
+            return new_mail
+        new_mail = new_mail or line.rstrip().endswith(b'EXISTS')
+
+
+def _pending_exists(mail: imaplib.IMAP4_SSL) -> bool:
+    """Pop any EXISTS imaplib collected from untagged responses to earlier commands."""
+    _, data = mail.response('EXISTS')
+    return data != [None]
+
+
+def _session():
+    """One IMAP session: connect, then fetch → wait for mail → repeat until it drops."""
+    mail = _connect()
+    try:
+        mail.select('inbox')
+        use_idle = IMAP_IDLE and 'IDLE' in mail.capabilities
+        log.info('IMAP session open (%s).', 'IDLE push' if use_idle else f'NOOP poll every {POLL_INTERVAL}s')
+        idle_for = min(IMAP_KEEPALIVE, IMAP_IDLE_REFRESH)
+        while True:
+            # Catch up: the cap may have left UIDs behind, and mail arriving during
+            # the fetches / a NOOP is reported as an untagged EXISTS on that command
+            while _process_unseen(mail) or _pending_exists(mail):
+                pass
+            if use_idle:
+                if _idle(mail, idle_for):
+                    log.info('IDLE: new mail reported.')
+                else:
+                    mail.noop()             # keepalive between IDLEs; raises if the session died
+            else:
+                time.sleep(POLL_INTERVAL)
+                mail.noop()
+    finally:
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
+
+def _backoff_delay(failures: int) -> float:
+    return min(IMAP_BACKOFF_MAX, IMAP_BACKOFF_BASE * 2 ** failures) * random.uniform(0.5, 1.0)
+
+
 def run():
-    """Main loop — poll Gmail every POLL_INTERVAL seconds."""
+    """Main loop — keep one IMAP session open, reconnecting with backoff when it drops."""
     if not GMAIL_EMAIL or not GMAIL_PASSWORD:
         log.error('GMAIL_EMAIL and GMAIL_APP_PASSWORD must be set in BronzeTier/.env')
         sys.exit(1)
@@ -196,13 +331,23 @@ def run():
     log.info('Gmail IMAP Watcher started.')
     log.info('  Account      : %s', GMAIL_EMAIL)
     log.info('  Vault        : %s', VAULT_PATH.resolve())
-    log.info('  Poll interval: %ds', POLL_INTERVAL)
+    log.info('  Mode         : %s', 'IDLE push' if IMAP_IDLE else f'poll every {POLL_INTERVAL}s')
     log.info('  Urgent words : %s', ', '.join(URGENT_KEYWORDS))
 
+    failures = 0
     while True:
-        poll_once()
-        log.info('Next check in %ds...', POLL_INTERVAL)
-        time.sleep(POLL_INTERVAL)
+        started = time.monotonic()
+        try:
+            _session()
+        except (imaplib.IMAP4.error, OSError) as e:
+            log.error('IMAP session dropped: %s', e)
+        except Exception as e:
+            log.error('Unexpected error: %s', e)
+        # A session that lasted a while was healthy: start the backoff over
+        failures = 0 if time.monotonic() - started > IMAP_BACKOFF_MAX else failures + 1
+        delay = _backoff_delay(failures)
+        log.info('Reconnecting in %.1fs...', delay)
+        time.sleep(delay)
 
 
 if __name__ == '__main__':
@@ -11,22 +11,58 @@ Setup:
   4. Set GMAIL_CREDENTIALS_PATH=./credentials.json in .env
   5. First run will open browser for OAuth consent → saves token.json
   6. Set GMAIL_TOKEN_PATH=./token.json in .env
+
+Incremental sync: the watcher keeps the mailbox historyId it has synced up
+to (seen store cursor "gmail_history_id") and each poll asks
+users.history.list for what changed since — messages added, or labelled
+UNREAD/IMPORTANT — so a poll costs one small request when nothing arrived,
+however large the inbox. Without a cursor, or once Gmail has expired it
+(history.list → 404), it does a full resync: the historyId from
+getProfile, then every page of `is:unread is:important`
+(GMAIL_MAX_RESULTS per page, at most GMAIL_RESYNC_LIMIT messages). Only the
+newest GMAIL_RESYNC_NOTES unseen ids of a resync become notes; the older
+ones are recorded as seen, so a first run or an expired cursor doesn't flood
+Needs_Action (and the LLM triage behind it) with a backlog of old mail.
+
+New ids are fetched in batch HTTP requests of messages().get with
+format='metadata' — GMAIL_BATCH_SIZE (default 50, max 100) per batch, headers
+limited to From/Subject/Date and trimmed with a `fields` mask.
+create_action_file() then only writes the note. The stored cursor only
+advances once every id of the previous poll has its note, so ids that
+failed are retried next poll and re-delivered after a restart.
+
+Runs on AsyncBaseWatcher (WATCHER_CONCURRENCY). httplib2 connections are
+not thread-safe, so each worker thread executes requests on its own
+AuthorizedHttp, with a GMAIL_HTTP_TIMEOUT socket timeout so a stalled
+request can't hold a worker (or stop()) forever.
 """
 import logging
 import os
+import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 
+import google_auth_httplib2
+import httplib2
 from dotenv import load_dotenv
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 try:
-    from base_watcher import BaseWatcher
+    from base_watcher import AsyncBaseWatcher
 except ImportError:
-    from watchers.base_watcher import BaseWatcher
+    from watchers.base_watcher import AsyncBaseWatcher
+
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from seen_store import get_seen_store
+from vault_io import atomic_write_text
 
 load_dotenv()
 
@@ -38,15 +74,36 @@ logging.basicConfig(
 # Gmail API scope — read-only is enough for watching
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+GMAIL_MAX_RESULTS = int(os.getenv('GMAIL_MAX_RESULTS', '100'))      # page size of a full resync
+GMAIL_RESYNC_LIMIT = int(os.getenv('GMAIL_RESYNC_LIMIT', '500'))
+GMAIL_RESYNC_NOTES = int(os.getenv('GMAIL_RESYNC_NOTES', '20'))     # newest resync ids that get notes
+GMAIL_HTTP_TIMEOUT = float(os.getenv('GMAIL_HTTP_TIMEOUT', '60'))    # socket timeout per request (s)
+# Gmail allows 100 calls per batch but throttles large batches — 50 is its advice
+GMAIL_BATCH_SIZE = min(100, int(os.getenv('GMAIL_BATCH_SIZE', '50')))
 
-class GmailWatcher(BaseWatcher):
+METADATA_HEADERS = ['From', 'Subject', 'Date']
+METADATA_FIELDS = 'id,snippet,payload/headers'
+HISTORY_FIELDS = ('history(messagesAdded/message(id,labelIds),labelsAdded/message(id,labelIds)),'
+                  'historyId,nextPageToken')
+WATCHED_LABELS = {'UNREAD', 'IMPORTANT'}                  # = q='is:unread is:important'
+HISTORY_CURSOR = 'gmail_history_id'
+
+
+class GmailWatcher(AsyncBaseWatcher):
     def __init__(self, vault_path: str, credentials_path: str | None = None):
         super().__init__(vault_path, check_interval=120)
         self.credentials_path = Path(
             credentials_path or os.getenv('GMAIL_CREDENTIALS_PATH', './credentials.json')
         )
         self.token_path = Path(os.getenv('GMAIL_TOKEN_PATH', './token.json'))
-        self.processed_ids: set[str] = set()
+        self.store = get_seen_store(vault_path)
+        self.processed_ids = self.store.namespace('gmail')
+        self.history_id = self.store.get_cursor(HISTORY_CURSOR)
+        self._pending: list[str] = []          # ids returned by the last poll
+        self._sync = {'full_syncs': 0, 'delta_polls': 0, 'history_expired': 0, 'fetch_failed': 0,
+                      'resync_baselined': 0}
+        self.creds = None
+        self._local = threading.local()
         self.service = self._authenticate()
 
     def _authenticate(self):
@@ -78,39 +135,147 @@ class GmailWatcher(BaseWatcher):
             self.token_path.write_text(creds.to_json(), encoding='utf-8')
             self.logger.info('Token saved to %s', self.token_path)
 
+        self.creds = creds
         service = build('gmail', 'v1', credentials=creds)
         self.logger.info('Gmail API authenticated successfully.')
         return service
 
+    def _http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """This thread's authorized connection (the service's own one isn't thread-safe)."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(
+                self.creds, http=httplib2.Http(timeout=GMAIL_HTTP_TIMEOUT),
+            )
+        return http
+
     def check_for_updates(self) -> list:
-        """Return list of unread important messages not yet processed."""
-        results = self.service.users().messages().list(
-            userId='me',
-            q='is:unread is:important',
-            maxResults=20,
-        ).execute()
-        messages = results.get('messages', [])
-        new = [m for m in messages if m['id'] not in self.processed_ids]
-        self.logger.info('Found %d new unread important emails.', len(new))
-        return new
+        """Return metadata of unread important messages not yet processed."""
+        retry = [i for i in self._pending if i not in self.processed_ids]
+        if not retry and self.history_id:
+            self.store.set_cursor(HISTORY_CURSOR, self.history_id)
 
-    def create_action_file(self, message: dict) -> Path:
-        """Fetch full message and write .md note to /Needs_Action."""
-        msg = self.service.users().messages().get(
-            userId='me',
-            id=message['id'],
-            format='full',
-        ).execute()
+        ids, resync = None, False
+        if self.history_id:
+            try:
+                ids, history_id = self._history_delta(self.history_id)
+                self._sync['delta_polls'] += 1
+            except HttpError as e:
+                if e.resp.status != 404:
+                    raise
+                self._sync['history_expired'] += 1
+                self.logger.warning('historyId %s expired — full resync.', self.history_id)
+        if ids is None:
+            ids, history_id = self._full_sync()
+            self._sync['full_syncs'] += 1
+            resync = True
+
+        fresh = [i for i in ids if i not in self.processed_ids]
+        if resync and len(fresh) > GMAIL_RESYNC_NOTES:
+            # messages.list is newest first — older unread mail is baselined, not filed
+            baseline, fresh = fresh[GMAIL_RESYNC_NOTES:], fresh[:GMAIL_RESYNC_NOTES]
+            self.processed_ids.update(baseline)
+            self._sync['resync_baselined'] += len(baseline)
+            self.logger.info('Full resync: %d older messages marked seen without notes.', len(baseline))
+        new = list(dict.fromkeys(retry + fresh))
+        fetched, failed = self._fetch_metadata(new)
+        self.history_id = history_id
+        self._pending = [m['id'] for m in fetched] + failed
+        self.logger.info('Found %d new unread important emails (%d fetched).', len(new), len(fetched))
+        return fetched
 
+    def _history_delta(self, start_history_id: str) -> tuple[list[str], str]:
+        """Ids added or labelled unread+important since *start_history_id*, and the new historyId."""
+        ids: list[str] = []
+        history_id, page_token = start_history_id, None
+        while True:
+            resp = self.service.users().history().list(
+                userId='me',
+                startHistoryId=start_history_id,
+                historyTypes=['messageAdded', 'labelAdded'],
+                fields=HISTORY_FIELDS,
+                pageToken=page_token,
+            ).execute(http=self._http())
+            for record in resp.get('history', []):
+                for change in record.get('messagesAdded', []) + record.get('labelsAdded', []):
+                    message = change.get('message', {})
+                    if WATCHED_LABELS <= set(message.get('labelIds', [])):
+                        ids.append(message['id'])
+            history_id = resp.get('historyId', history_id)
+            page_token = resp.get('nextPageToken')
+            if not page_token:
+                return list(dict.fromkeys(ids)), history_id
+
+    def _full_sync(self) -> tuple[list[str], str]:
+        """Every unread important id (up to GMAIL_RESYNC_LIMIT) and the historyId to continue from."""
+        # Read the historyId first: anything arriving during the listing shows up in the next delta
+        history_id = self.service.users().getProfile(
+            userId='me', fields='historyId',
+        ).execute(http=self._http())['historyId']
+        ids: list[str] = []
+        page_token = None
+        while len(ids) < GMAIL_RESYNC_LIMIT:
+            resp = self.service.users().messages().list(
+                userId='me',
+                q='is:unread is:important',
+                maxResults=min(GMAIL_MAX_RESULTS, GMAIL_RESYNC_LIMIT - len(ids)),
+                fields='messages/id,nextPageToken',
+                pageToken=page_token,
+            ).execute(http=self._http())
+            ids.extend(m['id'] for m in resp.get('messages', []))
+            page_token = resp.get('nextPageToken')
+            if not page_token:
+                break
+        self.logger.info('Full resync: %d unread important messages, historyId %s.', len(ids), history_id)
+        return ids, history_id
+
+    def _fetch_metadata(self, ids: list[str]) -> tuple[list[dict], list[str]]:
+        """
+        messages().get(format='metadata') for *ids*, GMAIL_BATCH_SIZE per batch
+        request. Returns (messages, ids to retry next poll).
+        """
+        fetched: dict[str, dict] = {}
+        retry_later: list[str] = []
+
+        def _collect(request_id, response, exception):
+            if isinstance(exception, HttpError) and exception.resp.status == 404:
+                self.logger.info('Message %s no longer exists — skipped.', request_id)
+            elif exception is not None:
+                # Kept pending, so the next poll retries it
+                self._sync['fetch_failed'] += 1
+                retry_later.append(request_id)
+                self.logger.warning('Metadata fetch failed for %s: %s', request_id, exception)
+            else:
+                fetched[request_id] = response
+
+        users = self.service.users()
+        for start in range(0, len(ids), GMAIL_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for message_id in ids[start:start + GMAIL_BATCH_SIZE]:
+                batch.add(
+                    users.messages().get(
+                        userId='me',
+                        id=message_id,
+                        format='metadata',
+                        metadataHeaders=METADATA_HEADERS,
+                        fields=METADATA_FIELDS,
+                    ),
+                    request_id=message_id,
+                )
+            batch.execute(http=self._http())
+        return [fetched[i] for i in ids if i in fetched], retry_later
+
+    def create_action_file(self, message: dict) -> Path:
+        """Write .md note to /Needs_Action from the message's fetched metadata."""
         # Extract headers
         headers = {
             h['name']: h['value']
-            for h in msg.get('payload', {}).get('headers', [])
+            for h in message.get('payload', {}).get('headers', [])
         }
         subject  = headers.get('Subject', '(no subject)')
         sender   = headers.get('From', 'Unknown')
         date_str = headers.get('Date', datetime.now().isoformat())
-        snippet  = msg.get('snippet', '')
+        snippet  = message.get('snippet', '')
 
         content = f"""---
 type: email
@@ -137,10 +302,13 @@ message_id: {message['id']}
 - [ ] Archive after processing
 """
         filepath = self.needs_action / f'EMAIL_{message["id"]}.md'
-        filepath.write_text(content, encoding='utf-8')
+        atomic_write_text(filepath, content, encoding='utf-8')
         self.processed_ids.add(message['id'])
         return filepath
 
+    def stats(self) -> dict:
+        return {**super().stats(), **self._sync, 'history_id': self.history_id, 'pending': len(self._pending)}
+
 
 if __name__ == '__main__':
     vault = os.getenv('VAULT_PATH', './BronzeTier/Vault')
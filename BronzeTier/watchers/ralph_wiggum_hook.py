@@ -55,6 +55,13 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from done_archive import DoneArchive
+from vault_io import atomic_write_text
+
 load_dotenv()
 
 logging.basicConfig(
@@ -64,9 +71,8 @@ logging.basicConfig(
 )
 log = logging.getLogger('RalphWiggumHook')
 
-VAULT_PATH  = Path(os.getenv('VAULT_PATH', './BronzeTier')).resolve()
-STATE_FILE  = VAULT_PATH / '.ralph_state.json'
-DONE_FOLDER = VAULT_PATH / 'Done'
+VAULT_PATH = Path(os.getenv('VAULT_PATH', './BronzeTier')).resolve()
+STATE_FILE = VAULT_PATH / '.ralph_state.json'
 
 
 def load_state() -> dict:
@@ -108,9 +114,8 @@ def check_task_file_in_done(task_file: str | None) -> bool:
     """Check if the task file has been moved to /Done (file-movement strategy)."""
     if not task_file:
         return False
-    task_path = Path(task_file)
-    done_path = DONE_FOLDER / task_path.name
-    return done_path.exists()
+    # Flat /Done (not yet compacted) or a recent Done/YYYY/MM shard
+    return DoneArchive(VAULT_PATH).find(Path(task_file).name) is not None
 
 
 def main():
@@ -188,7 +193,8 @@ def _write_incomplete_note(prompt: str, iterations: int):
     ts = datetime.now().strftime('%Y%m%d_%H%M%S')
     filepath = VAULT_PATH / 'Needs_Action' / f'INCOMPLETE_TASK_{ts}.md'
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    filepath.write_text(
+    atomic_write_text(
+        filepath,
         f"""---
 type: incomplete_task
 created: {datetime.now().isoformat()}
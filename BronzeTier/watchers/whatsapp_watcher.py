@@ -13,7 +13,9 @@ Normal run (headless, background):
     python whatsapp_watcher.py
 """
 
+import hashlib
 import os
+import re
 import sys
 import time
 import logging
@@ -29,6 +31,13 @@ try:
 except ImportError:
     from watchers.base_watcher import BaseWatcher
 
+_BRONZE_DIR = Path(__file__).resolve().parent.parent
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from seen_store import get_seen_set
+from vault_io import atomic_write_text
+
 log = logging.getLogger("WhatsAppWatcher")
 
 KEYWORDS = [
@@ -38,6 +47,11 @@ KEYWORDS = [
 
 _DEFAULT_SESSION = Path(__file__).resolve().parent.parent.parent / "whatsapp_session"
 SESSION_PATH = Path(os.getenv("WHATSAPP_SESSION_PATH", str(_DEFAULT_SESSION))).resolve()
+# Keys are built from chat text, so the same words from the same contact must
+# become new again soon — not after the seen store's 90-day default.
+WHATSAPP_SEEN_RETENTION_DAYS = float(os.getenv("WHATSAPP_SEEN_RETENTION_DAYS", "2"))
+
+_CLOCK_RE = re.compile(r"\d{1,2}:\d{2}(\s?[AaPp][Mm])?")
 
 
 class WhatsAppWatcher(BaseWatcher):
@@ -48,7 +62,7 @@ class WhatsAppWatcher(BaseWatcher):
         self.headless = headless
         self.session_path = SESSION_PATH
         self.session_path.mkdir(parents=True, exist_ok=True)
-        self.processed_ids: set = set()
+        self.processed_ids = get_seen_set(vault_path, "whatsapp", WHATSAPP_SEEN_RETENTION_DAYS)
 
     # ── BaseWatcher interface ─────────────────────────────────────────────────
 
@@ -130,12 +144,23 @@ class WhatsAppWatcher(BaseWatcher):
                         if not any(kw in snippet.lower() for kw in KEYWORDS):
                             continue
 
-                        msg_id = f"{name}_{hash(snippet)}"
+                        # Last-message time shown on the row: "14:05" today, then
+                        # "Yesterday" / a date once the day rolls over
+                        time_el = chat.query_selector('[data-testid="cell-frame-primary-detail"]')
+                        shown = time_el.inner_text().strip() if time_el else ""
+
+                        # hash() is salted per process — persisted IDs need a stable digest.
+                        # The clock tells a repeated message apart from the one already
+                        # filed; the unclocked key catches it after the label rolls over.
+                        digest = hashlib.sha1(snippet.encode("utf-8")).hexdigest()[:16]
+                        base_id = f"{name}_{digest}"
+                        msg_id = f"{base_id}_{shown}" if _CLOCK_RE.fullmatch(shown) else base_id
                         if msg_id in self.processed_ids:
                             continue
 
                         messages.append({
                             "id": msg_id,
+                            "base_id": base_id,
                             "contact": name,
                             "snippet": snippet,
                             "timestamp": datetime.now().isoformat(),
@@ -177,8 +202,9 @@ Review Plan.md for suggested reply, then send manually.
 - [ ] Check Plan.md for suggested reply
 - [ ] Reply manually in WhatsApp
 """
-        filepath.write_text(content, encoding="utf-8")
+        atomic_write_text(filepath, content, encoding="utf-8")
         self.processed_ids.add(item["id"])
+        self.processed_ids.add(item["base_id"])
         self.logger.info("Created: %s", filepath.name)
         return filepath
 
@@ -0,0 +1,205 @@
+"""
+worker_pool.py – Bounded priority worker pool
+
+Replaces "one thread per Needs_Action file". A burst of 500 webhook messages
+now becomes 500 queue entries served by a fixed number of workers instead of
+500 threads all hitting Groq and Plan.md at once.
+
+  - Priority queue      : lower rank first (critical → high → normal → low), FIFO within a rank
+  - Max in-flight       : number of worker threads, or max_pending when the
+                          handler defers completion by returning a Future
+  - Backpressure        : submit() blocks (optionally with timeout) while the queue is full
+  - De-duplication      : an item key that is already queued or running is not queued twice
+  - Metrics             : queue depth, in-flight, wait-time avg/p95/max via stats()
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+
+log = logging.getLogger("WorkerPool")
+
+# Frontmatter `priority:` value → queue rank (lower runs first)
+PRIORITY_RANK = {
+    "critical": 0,
+    "urgent": 0,
+    "high": 1,
+    "medium": 2,
+    "normal": 2,
+    "low": 3,
+}
+DEFAULT_RANK = PRIORITY_RANK["normal"]
+
+
+def priority_rank(value: Optional[str]) -> int:
+    return PRIORITY_RANK.get((value or "").strip().lower(), DEFAULT_RANK)
+
+
+class PriorityWorkerPool:
+    """
+    Fixed-size pool of daemon worker threads fed by a bounded PriorityQueue.
+    Each queued item is passed to *handler(item)*.
+
+    If the handler returns a concurrent.futures.Future, the worker moves on
+    immediately and the item stays in flight (and de-duplicated) until the
+    Future resolves. *max_pending* caps such items; it defaults to the number
+    of workers, i.e. plain blocking handlers behave exactly as before.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        workers: int = 4,
+        max_queue: int = 500,
+        name: str = "pool",
+        wait_samples: int = 1000,
+        max_pending: Optional[int] = None,
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending or 0)
+        self.max_queue = max_queue
+        self.name = name
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=max_queue)
+        self._seq = itertools.count()
+        self._keys: set = set()
+        self._keys_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._shutdown = threading.Event()
+        self._started = False
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "duplicates": 0}
+        self._waits: deque = deque(maxlen=wait_samples)
+        self._max_wait = 0.0
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, daemon=True, name=f"{self.name}-{i}")
+            t.start()
+            self._threads.append(t)
+        log.info("%s: %d workers started (queue max %d, max pending %d)",
+                 self.name, self.workers, self.max_queue, self.max_pending)
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop taking work and wait up to *timeout* seconds for running items."""
+        self._shutdown.set()
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    # ── Submission ─────────────────────────────────────────────────────────────
+    def submit(
+        self,
+        item: Any,
+        priority: int = DEFAULT_RANK,
+        key: Optional[Hashable] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue *item*. Blocks while the queue is full (backpressure); with a
+        *timeout* the item is rejected once it expires. Returns False if the
+        item was rejected or is already queued/running.
+        """
+        if not self._started:
+            self.start()
+        key = item if key is None else key
+        with self._keys_lock:
+            if key in self._keys:
+                with self._stats_lock:
+                    self._counts["duplicates"] += 1
+                return False
+            self._keys.add(key)
+        try:
+            self._queue.put((priority, next(self._seq), time.monotonic(), key, item), timeout=timeout)
+        except queue.Full:
+            with self._keys_lock:
+                self._keys.discard(key)
+            with self._stats_lock:
+                self._counts["rejected"] += 1
+            log.warning("%s: queue full (%d) — rejected %s", self.name, self.max_queue, key)
+            return False
+        with self._stats_lock:
+            self._counts["submitted"] += 1
+        return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        with self._keys_lock:
+            return key in self._keys
+
+    # ── Workers ────────────────────────────────────────────────────────────────
+    def _worker(self):
+        while not self._shutdown.is_set():
+            # A slot per in-flight item, so deferred items are bounded too
+            if not self._slots.acquire(timeout=1.0):
+                continue
+            try:
+                priority, _, enqueued_at, key, item = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                self._slots.release()
+                continue
+            waited = time.monotonic() - enqueued_at
+            with self._stats_lock:
+                self._in_flight += 1
+                self._waits.append(waited)
+                self._max_wait = max(self._max_wait, waited)
+            result = None
+            try:
+                result = self.handler(item)
+            except Exception as exc:
+                log.error("%s: handler failed for %s: %s", self.name, key, exc)
+                self._finish(key, ok=False)
+            else:
+                if isinstance(result, Future):
+                    result.add_done_callback(lambda f, key=key: self._finish_deferred(key, f))
+                else:
+                    self._finish(key, ok=True)
+            finally:
+                self._queue.task_done()
+
+    def _finish_deferred(self, key: Hashable, future: Future):
+        exc = future.exception()
+        if exc is not None:
+            log.error("%s: handler failed for %s: %s", self.name, key, exc)
+        self._finish(key, ok=exc is None)
+
+    def _finish(self, key: Hashable, ok: bool):
+        with self._keys_lock:
+            self._keys.discard(key)
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._counts["completed" if ok else "failed"] += 1
+        self._slots.release()
+
+    # ── Metrics ────────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._stats_lock:
+            waits = sorted(self._waits)
+            counts = dict(self._counts)
+            in_flight = self._in_flight
+            max_wait = self._max_wait
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self.max_queue,
+            "in_flight": in_flight,
+            "max_in_flight": self.max_pending,
+            "workers": self.workers,
+            **counts,
+            "wait_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_p95_ms": round(p95 * 1000, 1),
+            "wait_max_ms": round(max_wait * 1000, 1),
+        }
@@ -3,6 +3,7 @@ Weekly CEO Briefing Generator – Gold Tier.
 
 Combines data from:
   - Odoo P&L report
+  - Bank ledger header (balance, month-to-date totals – BronzeTier/ledger.py)
   - Vault audit trail (Inbox/Needs_Action/Done counts)
   - MCP audit log (action success/failure rates)
   - Agent activity summary
@@ -16,14 +17,25 @@ import argparse
 import json
 import logging
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
-from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared vault helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from rate_limiter import LANE_BATCH
+from ledger import format_money, load_header, month_totals
+from llm_gateway import ask
+from vault_index import VaultIndex
+from vault_io import atomic_write_text
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [CEOBriefing] %(levelname)s %(message)s")
 log = logging.getLogger(__name__)
 
@@ -38,6 +50,9 @@ You have been given the following data:
 ## Accounting (Odoo P&L)
 {pl_data}
 
+## Bank Ledger
+{ledger_data}
+
 ## Agent Activity This Week
 {agent_summary}
 
@@ -49,7 +64,7 @@ You have been given the following data:
 
 Write a professional, structured CEO briefing in Markdown with these sections:
 1. ## Executive Summary (3-5 bullet points, the most important things this week)
-2. ## Financial Snapshot (key P&L numbers, trends)
+2. ## Financial Snapshot (key P&L numbers, bank balance, trends)
 3. ## Operations & Agent Performance (what the AI agents did, success rates)
 4. ## Action Items for CEO (decisions needed, approvals required)
 5. ## Opportunities & Risks
@@ -78,6 +93,27 @@ def _get_pl_data() -> str:
         return "_Odoo P&L unavailable – check Odoo MCP server._"
 
 
+def _get_ledger_summary(vault_path: str) -> str:
+    """Bank balance and month totals from the FinanceWatcher ledger header."""
+    header = load_header(Path(vault_path) / "Accounting")
+    if not header or not header.get("records"):
+        return "_No bank transactions imported yet._"
+    this_month = datetime.now().strftime("%Y-%m")
+    first = datetime.now().replace(day=1)
+    last_month = (first.replace(year=first.year - 1, month=12) if first.month == 1
+                  else first.replace(month=first.month - 1)).strftime("%Y-%m")
+    lines = [f"- Current balance: {format_money(header.get('balance'))}"
+             + (f" (as of {header['balance_date']})" if header.get("balance_date") else "")]
+    for label, month in (("Month to date", this_month), ("Last month", last_month)):
+        totals = month_totals(header, month)
+        lines.append(
+            f"- {label} ({month}): income {format_money(totals['income'])}, "
+            f"expenses {format_money(totals['expenses'])}, net {format_money(totals['net'])} "
+            f"({totals['count']} transactions)"
+        )
+    return "\n".join(lines)
+
+
 def _get_agent_summary() -> str:
     """Read the orchestrator audit log for weekly activity."""
     audit_path = Path(os.getenv("AUDIT_LOG_PATH", "./GoldTier/logs/audit.jsonl"))
@@ -115,14 +151,15 @@ def _get_agent_summary() -> str:
 
 
 def _get_inbox_summary(vault_path: str) -> str:
-    """Count notes in each vault folder."""
-    vault = Path(vault_path)
-    summary = []
-    for folder in ["Inbox", "Needs_Action", "Done"]:
-        fp = vault / folder
-        count = len(list(fp.glob("*.md"))) if fp.exists() else 0
-        summary.append(f"- {folder}: {count} notes")
-    return "\n".join(summary)
+    """Count notes in each vault folder (read from the shared vault index)."""
+    index = VaultIndex(vault_path)
+    index.ensure_reconciled()
+    counts = index.counts()
+    index.close()
+    return "\n".join(
+        f"- {folder}: {counts.get(folder, 0)} notes"
+        for folder in ["Inbox", "Needs_Action", "Done"]
+    )
 
 
 def _get_error_summary() -> str:
@@ -153,19 +190,14 @@ def generate_briefing(vault_path: str, model: str | None = None) -> str:
         date=now.strftime("%Y-%m-%d %A"),
         week=week_str,
         pl_data=_get_pl_data(),
+        ledger_data=_get_ledger_summary(vault_path),
         agent_summary=_get_agent_summary(),
         inbox_summary=_get_inbox_summary(vault_path),
         error_summary=_get_error_summary(),
     )
 
     log.info("Generating CEO briefing with %s...", model)
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-    message = client.chat.completions.create(
-        model=model,
-        max_tokens=3000,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    briefing_text = message.choices[0].message.content
+    briefing_text = ask(prompt, model=model, max_tokens=3000, lane=LANE_BATCH, component="ceo_briefing")
 
     header = f"---\ngenerated: {now.isoformat()}\nweek: {week_str}\ntype: ceo_briefing\n---\n\n"
     full_doc = header + briefing_text
@@ -173,7 +205,7 @@ def generate_briefing(vault_path: str, model: str | None = None) -> str:
     # Write to vault
     vault = Path(vault_path)
     briefing_file = vault / f"CEO_Briefing_{week_str}.md"
-    briefing_file.write_text(full_doc, encoding="utf-8")
+    atomic_write_text(briefing_file, full_doc, encoding="utf-8")
     log.info("CEO briefing written: %s", briefing_file)
     return full_doc
 
@@ -19,15 +19,24 @@ import argparse
 import json
 import logging
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from rate_limiter import LANE_BATCH
+from llm_gateway import get_gateway
+from vault_io import atomic_write_text
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [RalphWiggum] %(levelname)s %(message)s")
 log = logging.getLogger(__name__)
 
@@ -145,7 +154,7 @@ def execute_tool(tool_name: str, tool_input: dict) -> Any:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         safe = "".join(c if c.isalnum() or c in " -_" else "_" for c in tool_input["title"])[:50]
         p = inbox / f"{ts}_{safe}.md"
-        p.write_text(f"# {tool_input['title']}\n\n{tool_input['body']}\n", encoding="utf-8")
+        atomic_write_text(p, f"# {tool_input['title']}\n\n{tool_input['body']}\n", encoding="utf-8")
         return {"written": str(p)}
     elif tool_name == "task_complete":
         return {"done": True, "summary": tool_input["summary"]}
@@ -174,7 +183,7 @@ def ralph_wiggum_loop(
         dict with keys: completed (bool), iterations (int), summary (str), history (list)
     """
     model = model or os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+    reasoner = get_gateway()
 
     # Convert Anthropic-style tool schemas to OpenAI/Groq format
     groq_tools = [
@@ -215,7 +224,9 @@ Task: {task}"""
         iterations += 1
         log.info("=== Iteration %d/%d ===", iterations, max_iterations)
 
-        response = client.chat.completions.create(
+        response = reasoner.complete(
+            lane=LANE_BATCH,
+            component="ralph_wiggum",
             model=model,
             max_tokens=2048,
             tools=groq_tools,
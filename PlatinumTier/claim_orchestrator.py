@@ -10,6 +10,7 @@ This is the distributed locking mechanism for the Platinum Tier.
 import logging
 import os
 import shutil
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +20,15 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared vault helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from done_archive import get_done_archive
+from vault_frontmatter import read_frontmatter
+from vault_io import atomic_write_text
+
 log = logging.getLogger("ClaimOrchestrator")
 
 
@@ -69,8 +79,7 @@ class ClaimOrchestrator:
 
     def _complete(self, claimed_path: Path):
         """Move completed task to /Done and write an update note."""
-        dest = self.done / claimed_path.name
-        shutil.move(str(claimed_path), dest)
+        get_done_archive(self.vault).archive(claimed_path, outcome="completed")
         self._write_update(claimed_path.name, "completed")
         log.info("Completed: %s → Done/", claimed_path.name)
 
@@ -85,7 +94,8 @@ class ClaimOrchestrator:
         """Write a status update note to /Updates."""
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         update_file = self.updates / f"{ts}_{self.agent_name}_{task_name}"
-        update_file.write_text(
+        atomic_write_text(
+            update_file,
             f"---\nagent: {self.agent_name}\ntask: {task_name}\nstatus: {status}\ntimestamp: {datetime.now().isoformat()}\n---\n\n"
             f"**Agent:** `{self.agent_name}`  \n**Task:** `{task_name}`  \n**Status:** {status}  \n**Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
             encoding="utf-8",
@@ -93,14 +103,7 @@ class ClaimOrchestrator:
 
     def _get_task_type(self, filepath: Path) -> str:
         """Read YAML frontmatter 'type' field from a markdown file."""
-        try:
-            content = filepath.read_text(encoding="utf-8")
-            for line in content.splitlines():
-                if line.startswith("type:"):
-                    return line.split(":", 1)[1].strip()
-        except Exception:
-            pass
-        return "unknown"
+        return read_frontmatter(filepath).type or "unknown"
 
     def process_one(self) -> bool:
         """Try to claim and process one task. Returns True if a task was processed."""
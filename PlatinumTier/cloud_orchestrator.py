@@ -20,13 +20,21 @@ from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
-from groq import Groq
 
 from claim_orchestrator import ClaimOrchestrator
 from vault_sync import VaultSync
 
 load_dotenv()
 
+# Shared vault helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from llm_gateway import ask
+from profiling import start_profiler
+from vault_io import atomic_write_text
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [CloudOrchestrator] %(levelname)s %(message)s",
@@ -41,19 +49,12 @@ VAULT_PATH = Path(os.getenv("VAULT_PATH", "./Vault")).resolve()
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 AGENT_NAME = "cloud"
 
-# ── Groq client ──────────────────────────────────────────────────────────────
-
-_groq = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# ── Groq (via the shared LLM gateway + result cache) ─────────────────────────
 
-
-def _ask_groq(prompt: str, max_tokens: int = 2048) -> str:
-    """Send a prompt to Groq and return the text response."""
-    resp = _groq.chat.completions.create(
-        model=GROQ_MODEL,
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return resp.choices[0].message.content
+def _ask_groq(prompt: str, template: str, note: str, max_tokens: int = 2048) -> str:
+    """Send a prompt to Groq and return the text response (cached by template + note)."""
+    return ask(prompt, model=GROQ_MODEL, max_tokens=max_tokens, component="cloud_agent",
+               cache_vault=VAULT_PATH, template=template, note=note)
 
 
 # ── Task Handlers ─────────────────────────────────────────────────────────────
@@ -64,7 +65,8 @@ def handle_email(task_file: Path):
     draft = _ask_groq(
         f"You are a professional executive assistant. Read this email note and draft a polite, concise reply.\n\n"
         f"EMAIL NOTE:\n{content}\n\n"
-        f"Write ONLY the reply body. No subject line, no extra commentary."
+        f"Write ONLY the reply body. No subject line, no extra commentary.",
+        "email_reply", content,
     )
     _write_pending_approval(
         task_name=task_file.stem,
@@ -80,7 +82,8 @@ def handle_linkedin(task_file: Path):
     content = task_file.read_text(encoding="utf-8")
     draft = _ask_groq(
         f"You are a LinkedIn content strategist. Based on this note, write an engaging LinkedIn post (max 300 words).\n\n"
-        f"NOTE:\n{content}\n\nWrite ONLY the post text."
+        f"NOTE:\n{content}\n\nWrite ONLY the post text.",
+        "linkedin_post", content,
     )
     _write_pending_approval(
         task_name=task_file.stem,
@@ -96,7 +99,8 @@ def handle_social(task_file: Path):
     content = task_file.read_text(encoding="utf-8")
     draft = _ask_groq(
         f"You are a social media manager. Based on this note, write a short engaging Facebook post (max 150 words).\n\n"
-        f"NOTE:\n{content}\n\nWrite ONLY the post text."
+        f"NOTE:\n{content}\n\nWrite ONLY the post text.",
+        "facebook_post", content,
     )
     _write_pending_approval(
         task_name=task_file.stem,
@@ -110,17 +114,19 @@ def handle_social(task_file: Path):
 def handle_plan(task_file: Path):
     """Generate a Plan.md from inbox notes → write to /Plans."""
     content = task_file.read_text(encoding="utf-8")
+    today = datetime.now().strftime('%Y-%m-%d %A')
     plan = _ask_groq(
         f"You are an autonomous executive assistant. Analyse this note and produce a structured Plan.md with:\n"
         f"## 🔴 Urgent\n## 🟡 This Week\n## 🟢 Backlog\n## 💡 Opportunities\n## 📧 Emails to Send\n## 📱 Posts to Draft\n\n"
-        f"Each item as a checkbox `- [ ] Action`. Today: {datetime.now().strftime('%Y-%m-%d %A')}\n\n"
-        f"NOTE:\n{content}\n\nProduce ONLY valid Markdown."
+        f"Each item as a checkbox `- [ ] Action`. Today: {today}\n\n"
+        f"NOTE:\n{content}\n\nProduce ONLY valid Markdown.",
+        f"plan:{today}", content,                # the prompt carries the date — so does the key
     )
     plans_dir = VAULT_PATH / "Plans"
     plans_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     plan_file = plans_dir / f"{ts}_Plan_{task_file.stem}.md"
-    plan_file.write_text(plan, encoding="utf-8")
+    atomic_write_text(plan_file, plan, encoding="utf-8")
     log.info("Plan written: %s", plan_file.name)
 
 
@@ -159,12 +165,14 @@ def handle_default(task_file: Path):
     """Fallback handler — summarise unknown tasks and route to Plans."""
     content = task_file.read_text(encoding="utf-8")
     summary = _ask_groq(
-        f"Summarise this task note in 3 bullet points and suggest what to do next:\n\n{content}"
+        f"Summarise this task note in 3 bullet points and suggest what to do next:\n\n{content}",
+        "summary", content,
     )
     plans_dir = VAULT_PATH / "Plans"
     plans_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    (plans_dir / f"{ts}_summary_{task_file.stem}.md").write_text(
+    atomic_write_text(
+        plans_dir / f"{ts}_summary_{task_file.stem}.md",
         f"# Summary: {task_file.name}\n\n{summary}\n", encoding="utf-8"
     )
 
@@ -205,7 +213,7 @@ Move this file to `/Approved` folder.
 ## To Reject
 Move this file to `/Rejected` folder.
 """
-    (pending_dir / filename).write_text(content, encoding="utf-8")
+    atomic_write_text(pending_dir / filename, content, encoding="utf-8")
     log.info("Pending approval written: %s", filename)
 
 
@@ -213,6 +221,7 @@ Move this file to `/Rejected` folder.
 
 def main():
     log.info("=== Cloud Orchestrator starting (agent=%s) ===", AGENT_NAME)
+    start_profiler("cloud_orchestrator")
 
     # Start vault sync in background thread
     vault_sync = VaultSync(vault_path=str(VAULT_PATH), agent_name=AGENT_NAME)
@@ -22,6 +22,14 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared vault helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from vault_index import VaultIndex
+from vault_io import atomic_write_text
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [HealthMonitor] %(levelname)s %(message)s",
@@ -43,6 +51,8 @@ MCP_ENDPOINTS: Dict[str, str] = {
     "social_mcp":   os.getenv("SOCIAL_MCP_URL",   "http://localhost:8005") + "/health",
 }
 
+_vault_index: VaultIndex | None = None
+
 # Track consecutive failures for alerting
 _failure_counts: Dict[str, int] = {}
 ALERT_THRESHOLD = 3
@@ -86,14 +96,17 @@ def check_vault_sync() -> dict:
 
 
 def check_vault_folders() -> dict:
-    """Check expected vault folders exist and count items."""
+    """Check expected vault folders exist and count items (counts from the vault index)."""
+    global _vault_index
+    if _vault_index is None:
+        _vault_index = VaultIndex(VAULT_PATH)
+    _vault_index.ensure_reconciled()     # re-scans only if a folder changed
+    counts = _vault_index.counts()
     folders = ["Inbox", "Needs_Action", "Pending_Approval", "Plans", "Done", "Updates"]
     result = {}
     for folder in folders:
-        path = VAULT_PATH / folder
-        exists = path.exists()
-        count  = len(list(path.glob("*.md"))) if exists else 0
-        result[folder] = {"exists": exists, "item_count": count}
+        exists = (VAULT_PATH / folder).exists()
+        result[folder] = {"exists": exists, "item_count": counts.get(folder, 0) if exists else 0}
     return result
 
 
@@ -189,7 +202,7 @@ def write_health_report(report: dict):
 |--------|--------|-------|
 {folder_rows}
 """
-    filepath.write_text(content, encoding="utf-8")
+    atomic_write_text(filepath, content, encoding="utf-8")
 
     # Also write to audit log
     AUDIT_LOG.parent.mkdir(parents=True, exist_ok=True)
@@ -23,13 +23,24 @@ from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
-from groq import Groq
 
 from claim_orchestrator import ClaimOrchestrator
 from vault_sync import VaultSync
 
 load_dotenv()
 
+# Shared vault helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from llm_gateway import ask
+from done_archive import get_done_archive
+from profiling import start_profiler
+from vault_frontmatter import read_frontmatter
+from vault_index import VaultIndex
+from vault_io import atomic_write_text
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [LocalAgent] %(levelname)s %(message)s",
@@ -44,16 +55,11 @@ VAULT_PATH  = Path(os.getenv("VAULT_PATH", "./Vault")).resolve()
 GROQ_MODEL  = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
 AGENT_NAME  = "local"
 
-_groq = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-
-def _ask_groq(prompt: str, max_tokens: int = 1024) -> str:
-    resp = _groq.chat.completions.create(
-        model=GROQ_MODEL,
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return resp.choices[0].message.content
+def _ask_groq(prompt: str, template: str, note: str, max_tokens: int = 1024) -> str:
+    """Send a prompt to Groq and return the text response (cached by template + note)."""
+    return ask(prompt, model=GROQ_MODEL, max_tokens=max_tokens, component="local_agent",
+               cache_vault=VAULT_PATH, template=template, note=note)
 
 
 # ── Approval Watcher ──────────────────────────────────────────────────────────
@@ -75,13 +81,8 @@ class ApprovalWatcher:
 
     def _execute_approved(self, filepath: Path):
         """Parse approval file and execute the action."""
+        action = read_frontmatter(filepath).action or "unknown"
         content = filepath.read_text(encoding="utf-8")
-        # Extract action from frontmatter
-        action = "unknown"
-        for line in content.splitlines():
-            if line.startswith("action:"):
-                action = line.split(":", 1)[1].strip()
-                break
 
         log.info("Executing approved action: %s (%s)", action, filepath.name)
 
@@ -99,9 +100,8 @@ class ApprovalWatcher:
             else:
                 log.warning("Unknown action type: %s", action)
 
-            # Move to Done
-            dest = self.done / filepath.name
-            filepath.rename(dest)
+            # Move to this month's Done shard
+            get_done_archive(self.done.parent).archive(filepath, outcome="approved")
             log.info("Action executed and archived: %s → Done/", filepath.name)
 
         except Exception as exc:
@@ -224,20 +224,27 @@ class ApprovalWatcher:
                 except Exception as exc:
                     log.error("ApprovalWatcher error on %s: %s", filepath.name, exc)
             for filepath in sorted(self.rejected.glob("*.md")):
-                dest = self.done / f"REJECTED_{filepath.name}"
-                filepath.rename(dest)
+                get_done_archive(self.done.parent).archive(filepath, f"REJECTED_{filepath.name}")
                 log.info("Rejected action archived: %s", filepath.name)
             time.sleep(self.poll_interval)
 
 
 # ── Dashboard Updater ─────────────────────────────────────────────────────────
 
+_vault_index: VaultIndex | None = None
+
+
 def update_dashboard():
     """Update Dashboard.md with current counts (Local is single writer)."""
+    global _vault_index
+    if _vault_index is None:
+        _vault_index = VaultIndex(VAULT_PATH)
+    _vault_index.ensure_reconciled()     # re-scans only if a folder changed
+    counts = _vault_index.counts()
     dashboard = VAULT_PATH / "Dashboard.md"
-    needs_action   = len(list((VAULT_PATH / "Needs_Action").glob("*.md")))
-    pending        = len(list((VAULT_PATH / "Pending_Approval").glob("*.md")))
-    inbox          = len(list((VAULT_PATH / "Inbox").glob("*.md")))
+    needs_action   = counts["Needs_Action"]
+    pending        = counts["Pending_Approval"]
+    inbox          = counts["Inbox"]
     now            = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     content = f"""# 🏆 AI Employee Dashboard
@@ -265,7 +272,7 @@ def update_dashboard():
 - [[Done/]]
 - [[Company_Handbook]]
 """
-    dashboard.write_text(content, encoding="utf-8")
+    atomic_write_text(dashboard, content, encoding="utf-8")
 
 
 def dashboard_loop(interval: int = 60):
@@ -284,13 +291,15 @@ def handle_whatsapp(task_file: Path):
     content = task_file.read_text(encoding="utf-8")
     reply = _ask_groq(
         f"You are a polite business assistant. Draft a WhatsApp reply to this message.\n\n"
-        f"MESSAGE:\n{content}\n\nWrite ONLY the reply text. Keep it under 100 words."
+        f"MESSAGE:\n{content}\n\nWrite ONLY the reply text. Keep it under 100 words.",
+        "whatsapp_reply", content,
     )
     pending_dir = VAULT_PATH / "Pending_Approval"
     pending_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"APPROVAL_{ts}_whatsapp_reply_{task_file.stem}.md"
-    (pending_dir / filename).write_text(
+    atomic_write_text(
+        pending_dir / filename,
         f"""---\ntype: approval_request\naction: whatsapp_reply\ntask: {task_file.stem}\ncreated: {datetime.now().isoformat()}\nstatus: pending\nagent: local\n---\n\n"""
         f"# ✋ WhatsApp Reply Approval\n\n**Draft:**\n\n> {reply}\n\n"
         f"## Details\n```json\n{{\"reply_text\": {json.dumps(reply)}, \"to_phone\": \"FILL_IN\"}}\n```\n\n"
@@ -307,7 +316,8 @@ def handle_payment(task_file: Path):
     pending_dir.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"APPROVAL_{ts}_payment_{task_file.stem}.md"
-    (pending_dir / filename).write_text(
+    atomic_write_text(
+        pending_dir / filename,
         f"""---\ntype: approval_request\naction: payment\ntask: {task_file.stem}\ncreated: {datetime.now().isoformat()}\nstatus: pending\nagent: local\n---\n\n"""
         f"# ✋ Payment Approval Required\n\n{content}\n\n"
         f"## Details\n```json\n{{\"amount\": \"SEE_ABOVE\", \"recipient\": \"SEE_ABOVE\"}}\n```\n\n"
@@ -321,12 +331,19 @@ def handle_payment(task_file: Path):
 
 def main():
     log.info("=== Local Agent starting (agent=%s) ===", AGENT_NAME)
+    start_profiler("local_agent")
 
     # Ensure all vault folders exist
     for folder in ["Inbox", "Needs_Action", "In_Progress/local", "In_Progress/cloud",
                    "Plans", "Pending_Approval", "Approved", "Rejected", "Updates", "Done"]:
         (VAULT_PATH / folder).mkdir(parents=True, exist_ok=True)
 
+    # Vault index: one reconcile now, then kept current by watchdog events
+    global _vault_index
+    _vault_index = VaultIndex(VAULT_PATH)
+    _vault_index.reconcile()
+    _vault_index.start()
+
     # Start vault sync in background
     vault_sync = VaultSync(vault_path=str(VAULT_PATH), agent_name=AGENT_NAME)
     sync_thread = threading.Thread(target=vault_sync.run_loop, daemon=True)
@@ -57,9 +57,10 @@ class VaultSync:
     def push(self, message: str | None = None) -> bool:
         """Stage all changes, commit, and push. Returns True on success."""
         try:
-            self._git("add", "-A")
-            # Check if there's anything to commit
-            status = self._git("status", "--porcelain")
+            # .cache/ holds per-machine state (vault index, caches) — never sync it
+            self._git("add", "-A", "--", ".", ":(exclude).cache")
+            # Check if there's anything staged to commit
+            status = self._git("diff", "--cached", "--name-only")
             if not status.stdout.strip():
                 log.debug("Nothing to commit.")
                 return True
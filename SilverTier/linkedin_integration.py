@@ -37,6 +37,16 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / "SilverTier" / ".env")
 load_dotenv(Path(__file__).parent.parent / "BronzeTier" / ".env")
 
+# Shared helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from done_archive import get_done_archive
+from rate_limiter import LANE_BATCH
+from llm_gateway import ask
+from vault_io import atomic_write_text
+
 log = logging.getLogger("LinkedInIntegration")
 logging.basicConfig(
     level=logging.INFO,
@@ -192,9 +202,6 @@ def draft_post(topic: str, content: str) -> Path:
     Draft a LinkedIn post and save to Vault/Pending_Approval for human review.
     Uses Groq to generate the post content.
     """
-    from groq import Groq
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
     prompt = f"""Write a professional LinkedIn post about the following topic.
 Keep it engaging, under 1300 characters, use 2-3 relevant emojis, end with a question or call-to-action.
 
@@ -203,12 +210,13 @@ Additional context: {content}
 
 Output ONLY the post text, nothing else."""
 
-    response = client.chat.completions.create(
+    post_text = ask(
+        prompt,
         model=os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
         max_tokens=500,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    post_text = response.choices[0].message.content.strip()
+        lane=LANE_BATCH,
+        component="linkedin",
+    ).strip()
 
     # Save to Pending_Approval for HITL
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -216,7 +224,7 @@ Output ONLY the post text, nothing else."""
     pending_dir.mkdir(parents=True, exist_ok=True)
 
     filepath = pending_dir / f"LINKEDIN_POST_{timestamp}.md"
-    filepath.write_text(f"""---
+    atomic_write_text(filepath, f"""---
 type: approval_request
 action: linkedin_post
 topic: {topic}
@@ -253,8 +261,7 @@ Move this file to /Rejected folder.
 def process_approved_posts():
     """Watch Vault/Approved/ for LINKEDIN_POST_*.md files and publish them."""
     approved_dir = VAULT_PATH / "Approved"
-    done_dir = VAULT_PATH / "Done"
-    done_dir.mkdir(parents=True, exist_ok=True)
+    done_archive = get_done_archive(VAULT_PATH)
 
     posts = list(approved_dir.glob("LINKEDIN_POST_*.md"))
     if not posts:
@@ -288,8 +295,7 @@ def process_approved_posts():
             # Move to Done with updated status
             updated = content.replace("status: pending", "status: published")
             updated += f"\n\n## Published\n- Post ID: {post_id}\n- Published: {datetime.now().isoformat()}\n"
-            done_path = done_dir / f"PUBLISHED_{post_file.name}"
-            done_path.write_text(updated, encoding="utf-8")
+            done_archive.write(f"PUBLISHED_{post_file.name}", updated)
             post_file.unlink()
 
             log.info("✅ Published! Post ID: %s → moved to Done/", post_id)
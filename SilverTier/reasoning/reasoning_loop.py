@@ -5,7 +5,9 @@ How it works:
   1. Reads all notes from Inbox and Needs_Action folders.
   2. Sends them to Claude with a planning prompt.
   3. Claude produces a structured Plan.md with prioritised tasks.
-  4. Plan.md is written to the SilverTier folder and also to the vault.
+  4. Plan.md is written to the SilverTier folder and to <vault>/Plans/Reasoning_Plan.md.
+     (The vault's own Plan.md is the Orchestrator's rolling triage log — see
+     BronzeTier/plan_writer.py — and is never overwritten here.)
 
 Run once:  python reasoning/reasoning_loop.py
 Run loop:  python reasoning/reasoning_loop.py --loop
@@ -13,15 +15,24 @@ Run loop:  python reasoning/reasoning_loop.py --loop
 import argparse
 import logging
 import os
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-from groq import Groq
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from rate_limiter import LANE_BATCH
+from llm_gateway import ask
+from vault_io import atomic_write_text
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [ReasoningLoop] %(levelname)s %(message)s")
 log = logging.getLogger(__name__)
 
@@ -83,13 +94,7 @@ def run_reasoning_loop(vault_path: str, plan_output: str, model: str, max_tokens
     )
 
     log.info("Sending %d chars of notes to Groq (%s)...", len(notes), model)
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-    message = client.chat.completions.create(
-        model=model,
-        max_tokens=max_tokens,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    plan_text = message.choices[0].message.content
+    plan_text = ask(prompt, model=model, max_tokens=max_tokens, lane=LANE_BATCH, component="reasoning_loop")
 
     # Write Plan.md to output path
     plan_path = Path(plan_output).expanduser()
@@ -98,10 +103,11 @@ def run_reasoning_loop(vault_path: str, plan_output: str, model: str, max_tokens
     plan_path.write_text(header + plan_text, encoding="utf-8")
     log.info("Plan.md written to %s", plan_path)
 
-    # Also write a copy into the vault
-    vault_plan = vault / "Plan.md"
-    vault_plan.write_text(header + plan_text, encoding="utf-8")
-    log.info("Plan.md mirrored to vault: %s", vault_plan)
+    # Also write a copy into the vault's Plans/ (Plan.md belongs to the Orchestrator's PlanWriter)
+    vault_plan = vault / "Plans" / "Reasoning_Plan.md"
+    vault_plan.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(vault_plan, header + plan_text)
+    log.info("Plan mirrored to vault: %s", vault_plan)
 
     return plan_text
 
@@ -9,6 +9,7 @@ See: https://learn.microsoft.com/en-us/linkedin/shared/authentication/
 """
 import logging
 import os
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +19,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from seen_store import get_seen_set
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [LinkedInWatcher] %(levelname)s %(message)s",
@@ -42,7 +50,7 @@ class LinkedInWatcher:
         self.vault_path = Path(vault_path).expanduser().resolve()
         self.access_token = access_token or os.getenv("LINKEDIN_ACCESS_TOKEN", "")
         self.poll_interval = poll_interval or int(os.getenv("WATCHER_POLL_INTERVAL", "300"))
-        self._seen_ids: set[str] = set()
+        self._seen_ids = get_seen_set(self.vault_path, "linkedin")   # survives restarts
 
     @property
     def _headers(self) -> dict:
@@ -13,6 +13,7 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +22,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shared helpers live in BronzeTier/
+_BRONZE_DIR = Path(__file__).resolve().parent.parent.parent / "BronzeTier"
+if str(_BRONZE_DIR) not in sys.path:
+    sys.path.insert(0, str(_BRONZE_DIR))
+
+from seen_store import get_seen_set
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [WhatsAppWatcher] %(levelname)s %(message)s",
@@ -53,7 +61,7 @@ class WhatsAppExportWatcher:
             export_folder or os.getenv("WHATSAPP_EXPORT_FOLDER", "./whatsapp_exports")
         ).resolve()
         self.poll_interval = poll_interval or int(os.getenv("WATCHER_POLL_INTERVAL", "60"))
-        self._processed: set[str] = set()
+        self._processed = get_seen_set(self.vault_path, "whatsapp_export")
 
     def _parse_export(self, filepath: Path) -> list[dict]:
         """Parse a WhatsApp .txt export into a list of message dicts."""
@@ -110,11 +118,13 @@ tags: [inbox, whatsapp]
         self.export_folder.mkdir(parents=True, exist_ok=True)
         while True:
             for f in self.export_folder.glob("*.txt"):
-                if str(f) not in self._processed:
+                # Keyed by mtime too: re-exporting a chat over the old file imports it again
+                key = f"{f}:{f.stat().st_mtime_ns}"
+                if key not in self._processed:
                     messages = self._parse_export(f)
                     if messages:
                         self._write_note(f, messages)
-                    self._processed.add(str(f))
+                    self._processed.add(key)
             time.sleep(self.poll_interval)
 
 
@@ -11,6 +11,8 @@ _BRONZE_DIR = Path(__file__).resolve().parent / "BronzeTier"
 if str(_BRONZE_DIR) not in sys.path:
     sys.path.insert(0, str(_BRONZE_DIR))
 
+from vault_io import atomic_write_text
+
 app = Flask(__name__)
 VERIFY_TOKEN = os.getenv("WHATSAPP_VERIFY_TOKEN", "myhackathonverifytoken")
 
@@ -19,33 +21,39 @@ VAULT_PATH = Path(os.getenv("VAULT_PATH", "BronzeTier/Vault"))
 VAULT_NEEDS_ACTION = VAULT_PATH / "Needs_Action"
 VAULT_NEEDS_ACTION.mkdir(parents=True, exist_ok=True)
 
-# Lazy orchestrator instance (shared across requests)
+# Orchestrator instance shared across requests. Building it (index, PlanWriter,
+# metrics) is slow, so it's loaded once at startup on a background thread —
+# never inside a request, where WhatsApp would time out and re-send.
 _orchestrator = None
-_orchestrator_lock = threading.Lock()
 
-def get_orchestrator():
+
+def _load_orchestrator():
     global _orchestrator
-    if _orchestrator is None:
-        with _orchestrator_lock:
-            if _orchestrator is None:
-                try:
-                    from Orchestrator import Orchestrator
-                    _orchestrator = Orchestrator()
-                    print("[Webhook] Orchestrator loaded ✅")
-                except Exception as e:
-                    print(f"[Webhook] Could not load Orchestrator: {e}")
+    try:
+        from Orchestrator import Orchestrator
+        _orchestrator = Orchestrator()
+        print("[Webhook] Orchestrator loaded ✅")
+    except Exception as e:
+        print(f"[Webhook] Could not load Orchestrator: {e}")
+
+
+def get_orchestrator():
+    """The orchestrator, or None while it's still loading (or failed to load)."""
     return _orchestrator
 
 
+threading.Thread(target=_load_orchestrator, daemon=True, name="OrchestratorLoader").start()
+
+
 def _trigger_orchestrator(filepath: Path):
-    """Run orchestrator reasoning on a file in a background thread."""
+    """Queue a file on the orchestrator's worker pool without blocking the request."""
     try:
         orch = get_orchestrator()
-        if orch:
-            orch.process_needs_action_file(filepath)
-            print(f"[Webhook] Orchestrator processed: {filepath.name}")
+        # timeout=0: a full queue rejects at once instead of holding the request
+        if orch and (orch.submit(filepath, timeout=0) or orch.pool.is_pending(filepath)):
+            print(f"[Webhook] Queued for orchestrator: {filepath.name}")
         else:
-            print(f"[Webhook] Orchestrator unavailable — creating approval file directly")
+            print(f"[Webhook] Orchestrator unavailable or busy — creating approval file directly")
             _create_approval_fallback(filepath)
     except Exception as e:
         print(f"[Webhook] Orchestrator error: {e} — creating approval file directly")
@@ -101,7 +109,7 @@ source_file: {filepath.name}
 - **Reject**: Move this file to `Rejected/` → No action taken
 - **Custom reply**: Edit `reply_text` above before moving to `Approved/`
 """
-        approval_file.write_text(approval_content, encoding="utf-8")
+        atomic_write_text(approval_file, approval_content, encoding="utf-8")
         print(f"[Webhook] Approval file created: {approval_file.name}")
     except Exception as e:
         print(f"[Webhook] Fallback approval creation failed: {e}")
@@ -201,18 +209,13 @@ message_id: {msg_id}
 - [ ] Archive after processing
 """
             filepath = VAULT_NEEDS_ACTION / f"WHATSAPP_{msg_id}.md"
-            filepath.write_text(content, encoding="utf-8")
+            atomic_write_text(filepath, content, encoding="utf-8")
             print(f"[WhatsApp] Saved message from {from_number}: {body[:80]}")
 
             # AUTO-TRIGGER orchestrator reasoning for HIGH priority messages
             if urgency == "high":
                 print(f"[WhatsApp] 🔴 HIGH priority — triggering orchestrator reasoning...")
-                threading.Thread(
-                    target=_trigger_orchestrator,
-                    args=(filepath,),
-                    daemon=True,
-                    name=f"orch-{msg_id[:8]}"
-                ).start()
+                _trigger_orchestrator(filepath)
 
     except Exception as e:
         print(f"[WhatsApp] Error parsing message: {e}")